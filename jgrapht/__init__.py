@@ -14,18 +14,96 @@ from .__version__ import __author__, __author_email__, __license__
 from .__version__ import __copyright__
 from .__version__ import __bibtex__
 
-# Create main thread and setup cleanup
-from . import backend
+import importlib
+import sys
+
+# The backend isolate is created on first use. Setup its parameters from
+# the environment and setup cleanup.
+from ._internals._config import (
+    _configure_isolate,
+    _configure_isolate_from_environment,
+)
 import atexit
 
-backend.jgrapht_isolate_create()
-del backend
+_configure_isolate_from_environment()
+
+
+def configure(max_heap=None, min_heap=None, young_gen=None, reserved_address_space=None):
+    """Configure the backend.
+
+    The backend runs inside an isolate with its own heap, which is created on the first
+    call into the backend. This function sets the parameters of that isolate and must
+    be called before any graph is created, otherwise a :py:class:`RuntimeError` is raised.
+
+    Sizes are given either in bytes or as strings with a suffix, such as ``"512m"``
+    or ``"4g"``. Parameters which are not given keep their current value. Default values
+    can also be provided using the environment variables `JGRAPHT_MAX_HEAP`,
+    `JGRAPHT_MIN_HEAP`, `JGRAPHT_YOUNG_GEN` and `JGRAPHT_RESERVED_ADDRESS_SPACE`::
+
+        import jgrapht
+
+        jgrapht.configure(max_heap="16g", young_gen="2g")
+        g = jgrapht.create_sparse_graph(sources=sources, targets=targets)
+
+    Invalid values of the environment variables are ignored with a warning, so that
+    importing the library never fails because of them.
+
+    The heap sizes are passed to the isolate as runtime options, which requires a
+    backend built with `JGRAPHT_ISOLATE_ARGS=1` against a GraalVM providing the
+    argc/argv isolate parameters. Other builds only support the reserved address
+    space and raise a :py:class:`RuntimeError` when a heap size is given.
+
+    :param max_heap: maximum heap size of the isolate
+    :param min_heap: minimum (initial) heap size of the isolate
+    :param young_gen: size of the young generation of the isolate
+    :param reserved_address_space: size of the address space to reserve for the isolate
+    :raises RuntimeError: if the backend has already been started or does not
+      support the heap options
+    """
+    _configure_isolate(
+        max_heap=max_heap,
+        min_heap=min_heap,
+        young_gen=young_gen,
+        reserved_address_space=reserved_address_space,
+    )
+
+
+from ._internals._profiling import (
+    profile,
+    add_profile_hook,
+    remove_profile_hook,
+)
+
+
+def handle_scope():
+    """Create a scope which owns the backend objects created inside it.
+
+    Every wrapper of a backend object (graphs, iterators, paths, sets, etc.) which is
+    created inside the scope, by the same thread, is released when the scope exits,
+    using a single call into the backend. Native objects, such as heuristics, masks, ALT
+    indices and contraction hierarchies, are released as well. This makes memory usage
+    deterministic, independently of the timing of the Python garbage collector::
+
+        with jgrapht.handle_scope():
+            for v in g.vertices:
+                path = sp.dijkstra(g, v, target)
+                total += path.weight
+
+    Objects created inside the scope must not be used after it exits. Scopes can be
+    nested, in which case objects belong to the innermost one. Individual objects can
+    also be released at any time by calling their `close()` method.
+
+    :returns: a context manager
+    """
+    from ._internals._wrappers import _handle_scope
+
+    return _handle_scope()
 
 
 def _module_cleanup_function():
-    from . import backend
+    backend = sys.modules.get(__name__ + ".backend")
 
-    if backend.jgrapht_isolate_is_attached():
+    if backend is not None and backend.jgrapht_isolate_is_attached():
         backend.jgrapht_isolate_destroy()
 
 
@@ -37,20 +115,6 @@ import logging
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
-from ._internals._graphs import (
-    _create_int_graph,
-    _create_int_dag,
-    _create_sparse_int_graph,
-    _copy_to_sparse_int_graph,
-)
-from ._internals._anyhashableg import (
-    _is_anyhashable_graph,
-    _create_anyhashable_graph,
-    _create_anyhashable_dag,
-    _create_sparse_anyhashable_graph,
-    _copy_to_sparse_anyhashable_graph,
-)
-
 #
 # The graph creation API
 #
@@ -95,6 +159,11 @@ def create_graph(
     :rtype: :class:`~jgrapht.types.Graph`
     """
     if any_hashable:
+        from ._internals._anyhashableg import (
+            _create_anyhashable_graph,
+            _create_anyhashable_dag,
+        )
+
         if dag:
             if not directed:
                 raise ValueError("A dag is always directed")
@@ -116,6 +185,8 @@ def create_graph(
                 edge_supplier=edge_supplier,
             )
     else:
+        from ._internals._graphs import _create_int_graph, _create_int_dag
+
         if dag:
             if not directed:
                 raise ValueError("A dag is always directed")
@@ -134,13 +205,16 @@ def create_graph(
 
 
 def create_sparse_graph(
-    edgelist,
+    edgelist=None,
     num_of_vertices=None,
     directed=True,
     weighted=True,
     any_hashable=False,
     vertex_supplier=None,
     edge_supplier=None,
+    sources=None,
+    targets=None,
+    weights=None,
 ):
     """Create a sparse graph.
 
@@ -155,6 +229,14 @@ def create_sparse_graph(
     The structure (topology) of a sparse graph is unmodifiable, but weights and properties can be
     modified.
 
+    Instead of an edgelist, graphs with integer vertices can also be created from separate
+    arrays of `sources`, `targets` and (optionally) `weights`. Any object supporting the buffer
+    protocol can be used, such as an :py:class:`array.array` or a NumPy array. Arrays whose
+    elements are C ints (e.g. dtype `numpy.intc`) for the vertices and C doubles for the weights
+    are handed to the backend without being copied::
+
+        g = create_sparse_graph(sources=np_sources, targets=np_targets, weights=np_weights)
+
     :param edgelist: list of tuple (u,v) or (u,v,weight) for weighted graphs. If `any_hashable` is 
       false, the vertices must be integers.
     :param num_of_vertices: number of vertices in the graph. Vertices always start from 0 
@@ -171,10 +253,17 @@ def create_sparse_graph(
     :param edge_supplier: used only in the case that the graph allows any hashable as
       vertices/edges. Called everytime the graph needs to create a new edge. If not given,
       then object instances are used.
+    :param sources: array with the source vertex of each edge. Used instead of the edgelist.
+    :param targets: array with the target vertex of each edge. Used instead of the edgelist.
+    :param weights: array with the weight of each edge. If not given, all edges have weight 1.0.
     :returns: a graph
     :rtype: :class:`~jgrapht.types.Graph`
     """
     if any_hashable:
+        if sources is not None or targets is not None or weights is not None:
+            raise ValueError("Arrays are only supported for graphs with integer vertices")
+        from ._internals._anyhashableg import _create_sparse_anyhashable_graph
+
         return _create_sparse_anyhashable_graph(
             edgelist=edgelist,
             directed=directed,
@@ -183,11 +272,16 @@ def create_sparse_graph(
             edge_supplier=edge_supplier,
         )
     else:
+        from ._internals._graphs import _create_sparse_int_graph
+
         return _create_sparse_int_graph(
             edgelist=edgelist,
             num_of_vertices=num_of_vertices,
             directed=directed,
             weighted=weighted,
+            sources=sources,
+            targets=targets,
+            weights=weights,
         )
 
 
@@ -202,20 +296,56 @@ def copy_to_sparse_graph(graph):
     :returns: a sparse graph
     :rtype: :class:`jgrapht.types.Graph`
     """
+    from ._internals._anyhashableg import (
+        _is_anyhashable_graph,
+        _copy_to_sparse_anyhashable_graph,
+    )
+    from ._internals._graphs import _copy_to_sparse_int_graph
+
     if _is_anyhashable_graph(graph):
         return _copy_to_sparse_anyhashable_graph(graph)
     else: 
         return _copy_to_sparse_int_graph(graph)
 
 
-from . import (
-    types,
-    views,
-    properties,
-    metrics,
-    traversal,
-    generators,
-    algorithms,
-    io,
-    utils,
+#
+# Submodules are imported on first access, in order to keep the import of the
+# package cheap. The backend itself is loaded on first use.
+#
+
+_SUBMODULES = (
+    "types",
+    "views",
+    "properties",
+    "metrics",
+    "traversal",
+    "generators",
+    "algorithms",
+    "io",
+    "utils",
+    "diagnostics",
 )
+
+if sys.version_info < (3, 7):
+    # no support for module level __getattr__
+    from . import (
+        types,
+        views,
+        properties,
+        metrics,
+        traversal,
+        generators,
+        algorithms,
+        io,
+        utils,
+        diagnostics,
+    )
+else:
+
+    def __getattr__(name):
+        if name in _SUBMODULES:
+            return importlib.import_module("." + name, __name__)
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | set(_SUBMODULES))
@@ -1,9 +1,11 @@
 from collections import defaultdict
 from collections.abc import (
     Set,
+    Mapping,
     MutableMapping,
 )
 import copy
+import math
 
 from .. import backend
 from ..types import (
@@ -19,7 +21,9 @@ from ._graphs import (
     _create_int_graph as _create_int_graph,
     _create_int_dag as _create_int_dag,
     _create_sparse_int_graph as _create_sparse_int_graph,
+    _JGraphTSparseGraph,
 )
+from ._arrays import _new_int_array, _new_double_array
 from ._views import (
     _ListenableView,
     _UnweightedGraphView,
@@ -152,6 +156,31 @@ class _AnyHashableGraph(Graph, AttributesGraph, ListenableGraph):
             listener(vertex, GraphEvent.VERTEX_ADDED)
         return vertex
 
+    def add_vertices_from(self, vertices):
+        vertices = list(vertices)
+
+        # find which vertices are new, taking care of duplicates
+        new_vertices = []
+        seen = set()
+        for v in vertices:
+            if v is None:
+                new_vertices.append(None)
+            elif v not in self._vertex_hash_to_id and v not in seen:
+                seen.add(v)
+                new_vertices.append(v)
+
+        # create all vertices in the backend at once
+        vids = self._graph.add_new_vertices(len(new_vertices))
+        created = [self._add_new_vertex(vid, v) for vid, v in zip(vids, new_vertices)]
+
+        if self._user_listeners:
+            for vertex in created:
+                for listener in self._user_listeners:
+                    listener(vertex, GraphEvent.VERTEX_ADDED)
+
+        supplied = iter([c for c, v in zip(created, new_vertices) if v is None])
+        return [next(supplied) if v is None else v for v in vertices]
+
     def remove_vertex(self, v):
         if v is None:
             raise ValueError("Vertex cannot be None")
@@ -180,6 +209,75 @@ class _AnyHashableGraph(Graph, AttributesGraph, ListenableGraph):
 
         return edge
 
+    def add_edges_from(self, edges):
+        added = []
+        sources = _new_int_array(0)
+        targets = _new_int_array(0)
+        weights = _new_double_array(0)
+        has_weights = False
+
+        # Translate to integer identifiers, skipping edges already in the graph.
+        # As when adding the edges one by one, the edges before an invalid one
+        # are still added.
+        pending = []
+        seen = set()
+        error = None
+        try:
+            for u, v, *rest in edges:
+                weight = rest[0] if len(rest) > 0 else None
+                edge = rest[1] if len(rest) > 1 else None
+                if edge is not None:
+                    if edge in self._edge_hash_to_id or edge in seen:
+                        added.append(edge)
+                        continue
+                    seen.add(edge)
+                sources.append(self._get_vertex_id(u))
+                targets.append(self._get_vertex_id(v))
+                if weight is not None:
+                    weights.append(weight)
+                    has_weights = True
+                else:
+                    weights.append(math.nan)
+                pending.append((len(added), edge, weight is not None))
+                added.append(None)
+        except Exception as e:
+            error = e
+            del sources[len(pending) :], targets[len(pending) :], weights[len(pending) :]
+
+        # create all edges in the backend at once. On failure, the edges which
+        # made it into the backend are still recorded and reported.
+        eids = _new_int_array(len(sources), -1)
+        try:
+            backend.jgrapht_graph_add_edges(
+                self._graph.handle,
+                sources,
+                targets,
+                weights if has_weights else _new_double_array(0),
+                eids,
+            )
+        except Exception as e:
+            error = e
+
+        created = []
+        for eid, (pos, edge, weight_given) in zip(eids, pending):
+            if eid == -1:
+                break
+            added[pos] = self._add_new_edge(eid, edge)
+            created.append((added[pos], weight_given))
+
+        if self._user_listeners:
+            for edge, weight_given in created:
+                for listener in self._user_listeners:
+                    listener(edge, GraphEvent.EDGE_ADDED)
+                if weight_given:
+                    for listener in self._user_listeners:
+                        listener(edge, GraphEvent.EDGE_WEIGHT_UPDATED)
+
+        if error is not None:
+            raise error
+
+        return added
+
     def remove_edge(self, e):
         if e is None:
             raise ValueError("Edge cannot be None")
@@ -206,6 +304,28 @@ class _AnyHashableGraph(Graph, AttributesGraph, ListenableGraph):
     def outdegree_of(self, v):
         return self._listenable_graph.outdegree_of(self._get_vertex_id(v))
 
+    def degrees(self, kind="all", vertices=None):
+        """Compute the degrees of all vertices using a single backend call.
+
+        :param kind: one of 'all' for the degree, 'in' for the indegree or 'out' for
+          the outdegree
+        :param vertices: optional vertex order. If given, the result is an array with
+          the degree of each vertex in that order. Otherwise a dictionary from vertices
+          to degrees is returned.
+        :returns: a dictionary or an :py:class:`array.array`
+        """
+        degrees = self._graph.degrees(kind)
+        if vertices is None:
+            return {v: degrees[vid] for vid, v in self._vertex_id_to_hash.items()}
+        vertex_hash_to_id = self._vertex_hash_to_id
+        res = _new_int_array(0)
+        for v in vertices:
+            vid = vertex_hash_to_id.get(v)
+            if vid is None:
+                raise ValueError("Vertex {} not in graph".format(v))
+            res.append(degrees[vid])
+        return res
+
     def edge_source(self, e):
         vid = self._listenable_graph.edge_source(self._get_edge_id(e))
         return self._vertex_id_to_hash[vid]
@@ -220,6 +340,32 @@ class _AnyHashableGraph(Graph, AttributesGraph, ListenableGraph):
     def set_edge_weight(self, e, weight):
         self._listenable_graph.set_edge_weight(self._get_edge_id(e), weight)
 
+    def get_edge_weights(self, edges=None):
+        """Read the weights of many edges using a single backend call.
+
+        :param edges: the edges. If None, all edges of the graph are used in the
+          order given by iterating over :py:attr:`edges`.
+        :returns: the weight of each edge
+        :rtype: :py:class:`array.array`
+        """
+        if edges is None:
+            eids = None
+        else:
+            eids = self._get_edge_ids(edges)
+        return self._listenable_graph.get_edge_weights(eids)
+
+    def set_edge_weights(self, edges, weights):
+        """Set the weights of many edges using a single backend call.
+
+        Listeners are notified once with a
+        :py:attr:`~jgrapht.types.GraphEvent.EDGE_WEIGHTS_UPDATED` event, whose element
+        is the list of edges.
+
+        :param edges: the edges
+        :param weights: the new weight of each edge, as any sequence or buffer of numbers
+        """
+        self._listenable_graph.set_edge_weights(self._get_edge_ids(edges), weights)
+
     @property
     def number_of_vertices(self):
         return len(self.vertices)
@@ -292,6 +438,26 @@ class _AnyHashableGraph(Graph, AttributesGraph, ListenableGraph):
             raise ValueError("Edge {} not in graph".format(e))
         return eid
 
+    def _get_vertex_ids(self, vertices):
+        vertex_hash_to_id = self._vertex_hash_to_id
+        vids = _new_int_array(0)
+        for v in vertices:
+            vid = vertex_hash_to_id.get(v)
+            if vid is None:
+                raise ValueError("Vertex {} not in graph".format(v))
+            vids.append(vid)
+        return vids
+
+    def _get_edge_ids(self, edges):
+        edge_hash_to_id = self._edge_hash_to_id
+        eids = _new_int_array(0)
+        for e in edges:
+            eid = edge_hash_to_id.get(e)
+            if eid is None:
+                raise ValueError("Edge {} not in graph".format(e))
+            eids.append(eid)
+        return eids
+
     def _create_edge_it(self, edge_id_it):
         """Transform an integer edge iteration into an edge iterator."""
         for eid in edge_id_it:
@@ -352,6 +518,12 @@ class _AnyHashableGraph(Graph, AttributesGraph, ListenableGraph):
             e = self._edge_id_to_hash[element]
             for listener in self._user_listeners:
                 listener(e, event_type)
+        elif event_type == GraphEvent.EDGE_WEIGHTS_UPDATED:
+            if self._user_listeners:
+                edge_id_to_hash = self._edge_id_to_hash
+                edges = [edge_id_to_hash[eid] for eid in element]
+                for listener in self._user_listeners:
+                    listener(edges, event_type)
 
     class _AnyHashableGraphVertexSet(Set):
         def __init__(self, graph):
@@ -595,7 +767,8 @@ class _MaskedSubgraphAnyHashableGraph(_AnyHashableGraph):
         raise ValueError("this graph is unmodifiable")
 
     def contains_vertex(self, v):
-        return v in self.vertices and not self._vertex_mask_cb(v)
+        vid = self._vertex_hash_to_id.get(v)
+        return vid is not None and not self._graph._is_vertex_masked(vid)
 
     def add_edge(self, u, v, weight=None, edge=None):
         raise ValueError("this graph is unmodifiable")
@@ -604,7 +777,38 @@ class _MaskedSubgraphAnyHashableGraph(_AnyHashableGraph):
         raise ValueError("this graph is unmodifiable")
 
     def contains_edge(self, e):
-        return e in self.edges and not self._edge_mask_cb(e)
+        eid = self._edge_hash_to_id.get(e)
+        return eid is not None and not self._graph._is_edge_masked(eid)
+
+    def set_vertex_mask(self, mask):
+        """Replace the vertex mask.
+
+        :param mask: the vertices to mask
+        """
+        self._graph.set_vertex_mask(frozenset(self._get_vertex_ids(mask)))
+
+    def set_edge_mask(self, mask):
+        """Replace the edge mask.
+
+        :param mask: the edges to mask
+        """
+        self._graph.set_edge_mask(frozenset(self._get_edge_ids(mask)))
+
+    def mask_vertices(self, vertices, masked=True):
+        """Mask (or unmask) vertices, without changing the rest of the vertex mask.
+
+        :param vertices: the vertices
+        :param masked: whether to mask or unmask the vertices
+        """
+        self._graph.mask_vertices(self._get_vertex_ids(vertices), masked)
+
+    def mask_edges(self, edges, masked=True):
+        """Mask (or unmask) edges, without changing the rest of the edge mask.
+
+        :param edges: the edges
+        :param masked: whether to mask or unmask the edges
+        """
+        self._graph.mask_edges(self._get_edge_ids(edges), masked)
 
     def __repr__(self):
         return "_MaskedSubgraphAnyHashableGraph(%r)" % self._graph.handle
@@ -716,9 +920,18 @@ def _as_edgereversed_anyhashable_graph(anyhashable_graph):
 
 
 def _as_weighted_anyhashable_graph(
-    anyhashable_graph, edge_weight_cb, cache_weights, write_weights_through
+    anyhashable_graph, edge_weight_cb, cache_weights, write_weights_through, weights=None
 ):
     """Create a weighted view of an any-hashable graph."""
+    edges = None
+    if weights is not None:
+        if not isinstance(weights, Mapping):
+            raise TypeError("Weights of any-hashable graphs must be given as a mapping")
+        edges = anyhashable_graph._get_edge_ids(weights.keys())
+        values = _new_double_array(0)
+        values.extend(weights.values())
+        weights = values
+
     if edge_weight_cb is not None:
 
         def actual_edge_weight_cb(e):
@@ -730,7 +943,7 @@ def _as_weighted_anyhashable_graph(
 
     graph = anyhashable_graph._graph
     weighted_graph = _WeightedView(
-        graph, actual_edge_weight_cb, cache_weights, write_weights_through
+        graph, actual_edge_weight_cb, cache_weights, write_weights_through, edges, weights
     )
 
     weighted_anyhashable_graph = _AnyHashableGraph(
@@ -740,13 +953,18 @@ def _as_weighted_anyhashable_graph(
 
 
 def _as_masked_subgraph_anyhashable_graph(
-    anyhashable_graph, vertex_mask_cb, edge_mask_cb=None
+    anyhashable_graph, vertex_mask_cb, edge_mask_cb=None, vertex_mask=None, edge_mask=None
 ):
     """ Create a masked subgraph view of an any-hashable graph."""
 
-    def actual_vertex_mask_cb(v):
-        v = _vertex_g_to_anyhashableg(anyhashable_graph, v)
-        return vertex_mask_cb(v)
+    if vertex_mask_cb is not None:
+
+        def actual_vertex_mask_cb(v):
+            v = _vertex_g_to_anyhashableg(anyhashable_graph, v)
+            return vertex_mask_cb(v)
+
+    else:
+        actual_vertex_mask_cb = None
 
     if edge_mask_cb is not None:
 
@@ -757,9 +975,14 @@ def _as_masked_subgraph_anyhashable_graph(
     else:
         actual_edge_mask_cb = None
 
+    if vertex_mask is not None:
+        vertex_mask = frozenset(anyhashable_graph._get_vertex_ids(vertex_mask))
+    if edge_mask is not None:
+        edge_mask = frozenset(anyhashable_graph._get_edge_ids(edge_mask))
+
     graph = anyhashable_graph._graph
     masked_subgraph = _MaskedSubgraphView(
-        graph, actual_vertex_mask_cb, actual_edge_mask_cb
+        graph, actual_vertex_mask_cb, actual_edge_mask_cb, vertex_mask, edge_mask
     )
 
     masked_subgraph_anyhashable_graph = _MaskedSubgraphAnyHashableGraph(
@@ -896,17 +1119,28 @@ def _create_sparse_anyhashable_graph(
     # Transform edge list from hashable to ints
     next_int = IntegerSupplier()
     vertex_hash_to_id = defaultdict(lambda: next_int())
-    int_edgelist = list()
+    sources = _new_int_array(0)
+    targets = _new_int_array(0)
+    weights = None
     if weighted:
+        weights = _new_double_array(0)
         for v, u, w in edgelist:
-            int_edgelist.append((vertex_hash_to_id[v], vertex_hash_to_id[u], w))
+            sources.append(vertex_hash_to_id[v])
+            targets.append(vertex_hash_to_id[u])
+            weights.append(w)
     else:
         for v, u, *w in edgelist:
-            int_edgelist.append((vertex_hash_to_id[v], vertex_hash_to_id[u]))
+            sources.append(vertex_hash_to_id[v])
+            targets.append(vertex_hash_to_id[u])
 
     # Create graph
     sparse_int_graph = _create_sparse_int_graph(
-        int_edgelist, num_of_vertices=len(vertex_hash_to_id), directed=directed, weighted=weighted
+        num_of_vertices=len(vertex_hash_to_id),
+        directed=directed,
+        weighted=weighted,
+        sources=sources,
+        targets=targets,
+        weights=weights,
     )
     g = _AnyHashableGraph(
         sparse_int_graph, vertex_supplier=vertex_supplier, edge_supplier=edge_supplier
@@ -918,7 +1152,7 @@ def _create_sparse_anyhashable_graph(
         g._vertex_id_to_hash[vid] = vhash
 
     # Record mapping of existing edges
-    for eid in range(0, len(int_edgelist)):
+    for eid in range(0, len(sources)):
         ehash = g._edge_supplier()
         g._edge_hash_to_id[ehash] = eid
         g._edge_id_to_hash[eid] = ehash
@@ -939,40 +1173,39 @@ def _copy_to_sparse_anyhashable_graph(graph):
     if len(graph.vertices) == 0:
         raise ValueError("Graph with no vertices")
 
-    # transform edge list from hashable to ints
-    next_int = IntegerSupplier()
-    vertex_hash_to_id = defaultdict(lambda: next_int())
-    int_edgelist = list()
-    edgelist = [graph.edge_tuple(e) for e in graph.edges]
-    if graph.type.weighted:
-        for v, u, w in edgelist:
-            int_edgelist.append((vertex_hash_to_id[v], vertex_hash_to_id[u], w))
-    else:
-        for v, u, *w in edgelist:
-            int_edgelist.append((vertex_hash_to_id[v], vertex_hash_to_id[u]))
+    # The structure is copied entirely in the backend. Vertices are renumbered
+    # in iteration order and the backend reports the original id of each edge.
+    vertices = iter(graph._graph.vertices).to_array()
+    edges = _new_int_array(len(graph.edges))
+    handle = backend.jgrapht_graph_copy_to_sparse(graph.handle, vertices, edges)
 
-    # create graph
-    sparse_int_graph = _create_sparse_int_graph(
-        int_edgelist, num_of_vertices=len(vertex_hash_to_id), directed=graph.type.directed, weighted=graph.type.weighted
-    )
     sparse = _AnyHashableGraph(
-        sparse_int_graph, vertex_supplier=graph._vertex_supplier, edge_supplier=graph._edge_supplier
+        _JGraphTSparseGraph(handle),
+        vertex_supplier=graph._vertex_supplier,
+        edge_supplier=graph._edge_supplier,
     )
 
-    # record mapping of existing vertices and copy attributes
-    for vhash, vid in vertex_hash_to_id.items():
+    # record mapping of vertices and edges and copy attributes
+    vertex_id_to_hash = graph._vertex_id_to_hash
+    vertex_hash_to_attrs = graph._vertex_hash_to_attrs
+    for vid, old_vid in enumerate(vertices):
+        vhash = vertex_id_to_hash[old_vid]
         sparse._vertex_hash_to_id[vhash] = vid
         sparse._vertex_id_to_hash[vid] = vhash
-        for k, v in graph.vertex_attrs[vhash].items():
-            sparse.vertex_attrs[vhash][k] = v
-
-    # record mapping of existing edges and copy attributes
-    for ehash, eid in zip(graph.edges, range(0, len(graph.edges))):
+        attrs = vertex_hash_to_attrs.get(vhash)
+        if attrs:
+            sparse._vertex_hash_to_attrs[vhash] = dict(attrs)
+
+    edge_id_to_hash = graph._edge_id_to_hash
+    edge_hash_to_attrs = graph._edge_hash_to_attrs
+    for eid, old_eid in enumerate(edges):
+        ehash = edge_id_to_hash[old_eid]
         sparse._edge_hash_to_id[ehash] = eid
         sparse._edge_id_to_hash[eid] = ehash
-        for k, v in graph.edge_attrs[ehash].items():
-            sparse.edge_attrs[ehash][k] = v
-    
+        attrs = edge_hash_to_attrs.get(ehash)
+        if attrs:
+            sparse._edge_hash_to_attrs[ehash] = dict(attrs)
+
     for k, v in graph.graph_attrs.items():
         sparse.graph_attrs[k] = v
 
@@ -11,6 +11,7 @@ from ._wrappers import _HandleWrapper, _JGraphTObjectIterator
 
 from ._anyhashableg import _vertex_anyhashableg_to_g
 from ._anyhashableg_wrappers import _AnyHashableGraphEdgeIterator
+from ._paths import _singlesource_distances, _singlesource_predecessors
 
 
 class _AnyHashableGraphGraphPath(_HandleWrapper, GraphPath):
@@ -67,7 +68,7 @@ class _AnyHashableGraphGraphPath(_HandleWrapper, GraphPath):
         self._weight = weight
         self._start_vertex = self._graph._vertex_id_to_hash[start_vertex]
         self._end_vertex = self._graph._vertex_id_to_hash[end_vertex]
-        self._edges = list(_AnyHashableGraphEdgeIterator(eit, self._graph))
+        self._edges = _AnyHashableGraphEdgeIterator(eit, self._graph).tolist()
 
     def __repr__(self):
         return "_AnyHashableGraphGraphPath(%r)" % self._handle
@@ -98,6 +99,7 @@ class _AnyHashableGraphSingleSourcePaths(_HandleWrapper, SingleSourcePaths):
         super().__init__(handle=handle, **kwargs)
         self._graph = graph
         self._source_vertex = source_vertex
+        self._dist = None
 
     @property
     def source_vertex(self):
@@ -116,6 +118,54 @@ class _AnyHashableGraphSingleSourcePaths(_HandleWrapper, SingleSourcePaths):
         )
         return _AnyHashableGraphGraphPath(gp, self._graph) if gp is not None else None
 
+    def distance_to(self, target_vertex):
+        """Get the distance to a target vertex, without building a path object.
+
+        This takes time linear in the number of edges of the path, as the backend
+        still walks the shortest path tree.
+
+        :param target_vertex: The target vertex.
+        :returns: the distance or infinity if the target is unreachable.
+        """
+        target_vertex = _vertex_anyhashableg_to_g(self._graph, target_vertex)
+        return backend.jgrapht_sp_singlesource_get_distance_to_vertex(
+            self._handle, target_vertex
+        )
+
+    def distances(self):
+        """The distances of all vertices, as a dictionary from vertices to distances.
+
+        Unreachable vertices have distance infinity. The distances are computed once
+        per tree, in time linear in the total number of edges of the paths to all
+        vertices, that is O(n * depth) and quadratic in the worst case.
+        """
+        dist = self._distances()
+        return {v: dist[vid] for vid, v in self._graph._vertex_id_to_hash.items()}
+
+    def predecessors(self):
+        """The predecessors of the vertices in the shortest path tree, as a dictionary
+        from vertices to their previous vertex.
+
+        The source and unreachable vertices are not included. This requires the
+        distances and then reads the paths to the farthest vertices, which in the
+        worst case also takes quadratic time.
+        """
+        source = _vertex_anyhashableg_to_g(self._graph, self._source_vertex)
+        pred = _singlesource_predecessors(
+            self._handle, self._graph, source, self._distances()
+        )
+        vertex_id_to_hash = self._graph._vertex_id_to_hash
+        return {
+            vertex_id_to_hash[vid]: vertex_id_to_hash[uid]
+            for vid, uid in enumerate(pred)
+            if uid >= 0
+        }
+
+    def _distances(self):
+        if self._dist is None:
+            self._dist = _singlesource_distances(self._handle, self._graph)
+        return self._dist
+
     def __repr__(self):
         return "_AnyHashableGraphSingleSourcePaths(%r)" % self._handle
 
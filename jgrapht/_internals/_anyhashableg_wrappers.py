@@ -12,6 +12,13 @@ class _AnyHashableGraphVertexIterator(_JGraphTIntegerIterator):
         v = super().__next__()
         return self._graph._vertex_id_to_hash[v]
 
+    def to_array(self):
+        raise TypeError("Any-hashable vertices cannot be stored in an array")
+
+    def tolist(self):
+        id_to_hash = self._graph._vertex_id_to_hash
+        return [id_to_hash[x] for x in super().to_array()]
+
     def __repr__(self):
         return "_AnyHashableGraphVertexIterator(%r)" % self._handle
 
@@ -27,5 +34,12 @@ class _AnyHashableGraphEdgeIterator(_JGraphTIntegerIterator):
         e = super().__next__()
         return self._graph._edge_id_to_hash[e]
 
+    def to_array(self):
+        raise TypeError("Any-hashable edges cannot be stored in an array")
+
+    def tolist(self):
+        id_to_hash = self._graph._edge_id_to_hash
+        return [id_to_hash[x] for x in super().to_array()]
+
     def __repr__(self):
         return "_AnyHashableGraphEdgeIterator(%r)" % self._handle
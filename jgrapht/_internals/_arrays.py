@@ -0,0 +1,72 @@
+from array import array
+
+# Typecodes which match the C types used by the backend (int and double).
+_INT_TYPECODE = "i"
+_DOUBLE_TYPECODE = "d"
+_BYTE_TYPECODE = "B"
+
+
+def _new_int_array(size, fill=0):
+    """Create a contiguous array of C ints, suitable for passing to the backend."""
+    return array(_INT_TYPECODE, [fill]) * size
+
+
+def _new_double_array(size, fill=0.0):
+    """Create a contiguous array of C doubles, suitable for passing to the backend."""
+    return array(_DOUBLE_TYPECODE, [fill]) * size
+
+
+def _as_int_buffer(values):
+    """Return a contiguous buffer of C ints with the given values.
+
+    Objects which already expose such a buffer (e.g. an :py:class:`array.array`
+    or a NumPy array with a matching dtype) are returned as is, without copying.
+    NumPy arrays of other integer types are converted and anything else is
+    treated as an iterable of integers.
+    """
+    return _as_buffer(values, _INT_TYPECODE, "il")
+
+
+def _as_double_buffer(values):
+    """Return a contiguous buffer of C doubles with the given values.
+
+    Objects which already expose such a buffer are returned as is, without
+    copying. NumPy arrays of other types are converted and anything else is
+    treated as an iterable of numbers.
+    """
+    return _as_buffer(values, _DOUBLE_TYPECODE, "d")
+
+
+def _as_byte_buffer(values):
+    """Return a contiguous buffer of bytes with the given values, e.g. flags.
+
+    Objects which already expose such a buffer (e.g. a NumPy array of booleans)
+    are returned as is, without copying. Anything else is treated as an iterable
+    of integers or booleans.
+    """
+    return _as_buffer(values, _BYTE_TYPECODE, "?bB")
+
+
+def _as_buffer(values, typecode, formats):
+    itemsize = array(typecode).itemsize
+    try:
+        view = memoryview(values)
+    except TypeError:
+        view = None
+
+    if view is not None:
+        with view:
+            fmt = view.format.lstrip("@=<>!")
+            if (
+                view.c_contiguous
+                and view.ndim == 1
+                and view.itemsize == itemsize
+                and fmt in formats
+            ):
+                return values
+
+    if hasattr(values, "astype"):
+        # NumPy arrays (and compatible) with a different dtype or layout
+        return values.astype(typecode, order="C").reshape(-1)
+
+    return array(typecode, values)
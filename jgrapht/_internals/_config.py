@@ -0,0 +1,98 @@
+import os
+import warnings
+
+# Environment variables which provide defaults for the isolate parameters.
+_ENVIRONMENT_VARIABLES = {
+    "max_heap": "JGRAPHT_MAX_HEAP",
+    "min_heap": "JGRAPHT_MIN_HEAP",
+    "young_gen": "JGRAPHT_YOUNG_GEN",
+    "reserved_address_space": "JGRAPHT_RESERVED_ADDRESS_SPACE",
+}
+
+_SIZE_SUFFIXES = {
+    "k": 1024,
+    "m": 1024 ** 2,
+    "g": 1024 ** 3,
+    "t": 1024 ** 4,
+}
+
+# Current isolate parameters, in bytes. Zero means the backend default.
+_isolate_params = {name: 0 for name in _ENVIRONMENT_VARIABLES}
+
+
+def _parse_size(value, name):
+    """Parse a size given either as a number of bytes or as a string with an
+    optional suffix k, m, g or t (e.g. "512m" or "4g").
+    """
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text.endswith("b"):
+            text = text[:-1]
+        multiplier = 1
+        if text and text[-1] in _SIZE_SUFFIXES:
+            multiplier = _SIZE_SUFFIXES[text[-1]]
+            text = text[:-1]
+        try:
+            size = int(text) * multiplier
+        except ValueError:
+            raise ValueError("Invalid size for {}: {!r}".format(name, value))
+    elif isinstance(value, int) and not isinstance(value, bool):
+        size = value
+    else:
+        raise TypeError("Size for {} must be an int or a string".format(name))
+    if size < 0:
+        raise ValueError("Size for {} must be non-negative".format(name))
+    return size
+
+
+def _configure_isolate(**kwargs):
+    params = dict(_isolate_params)
+    for name, value in kwargs.items():
+        if value is not None:
+            params[name] = _parse_size(value, name)
+
+    # imported here, so that loading the backend is deferred until needed
+    from .. import backend
+
+    heap_options = [
+        name for name in ("max_heap", "min_heap", "young_gen") if params[name] > 0
+    ]
+    if heap_options and not backend.jgrapht_isolate_supports_heap_options():
+        raise RuntimeError(
+            "This build of the backend does not support setting {}".format(
+                ", ".join(heap_options)
+            )
+        )
+
+    applied = backend.jgrapht_isolate_configure(
+        params["max_heap"],
+        params["min_heap"],
+        params["young_gen"],
+        params["reserved_address_space"],
+    )
+    if not applied:
+        raise RuntimeError(
+            "The backend has already been started, configure must be called before its first use"
+        )
+    _isolate_params.update(params)
+
+
+def _configure_isolate_from_environment():
+    """Apply the environment variables. Since this happens at import, invalid values
+    only result in a warning and are ignored."""
+    kwargs = {}
+    for name, variable in _ENVIRONMENT_VARIABLES.items():
+        value = os.environ.get(variable)
+        if not value:
+            continue
+        try:
+            kwargs[name] = _parse_size(value, variable)
+        except ValueError as e:
+            warnings.warn("Ignoring {}: {}".format(variable, e), RuntimeWarning)
+    if kwargs:
+        try:
+            _configure_isolate(**kwargs)
+        except RuntimeError as e:
+            warnings.warn("Ignoring backend configuration: {}".format(e), RuntimeWarning)
@@ -0,0 +1,140 @@
+import struct
+import sys
+
+from .. import backend
+from ..types import ContractionHierarchy
+from ._arrays import _new_int_array, _new_double_array
+from ._anyhashableg import (
+    _vertex_anyhashableg_to_g,
+    _edge_g_to_anyhashableg,
+)
+from ._paths import _JGraphTNativeGraphPath
+from ._spgraphs import _JGraphTShortestPathGraph
+from ._wrappers import _NativeResource
+
+
+# magic, number of vertex rows, number of arcs, number of edges, directed
+_CH_HEADER = struct.Struct("<8siiii")
+_CH_MAGIC = b"JGTCH002"
+
+_CH_INITIAL_PATH_CAPACITY = 64
+
+
+class _JGraphTContractionHierarchy(_NativeResource, ContractionHierarchy):
+    """A contraction hierarchy computed and queried by native code."""
+
+    _handle = None
+
+    def __init__(self, graph, handle):
+        self._handle = handle
+        self._own()
+        self._graph = graph
+
+    @property
+    def handle(self):
+        return self._handle
+
+    @property
+    def graph(self):
+        return self._graph
+
+    @property
+    def memory_usage(self):
+        return backend.jgrapht_ch_get_memory(self._handle)
+
+    def get_distance(self, source_vertex, target_vertex):
+        return backend.jgrapht_ch_get_distance(
+            self._handle,
+            _vertex_anyhashableg_to_g(self._graph, source_vertex),
+            _vertex_anyhashableg_to_g(self._graph, target_vertex),
+        )
+
+    def get_path(self, source_vertex, target_vertex):
+        source = _vertex_anyhashableg_to_g(self._graph, source_vertex)
+        target = _vertex_anyhashableg_to_g(self._graph, target_vertex)
+
+        edges = _new_int_array(_CH_INITIAL_PATH_CAPACITY)
+        weight, length = backend.jgrapht_ch_get_path(self._handle, source, target, edges)
+        if length < 0:
+            return None
+        if length > len(edges):
+            edges = _new_int_array(length)
+            weight, length = backend.jgrapht_ch_get_path(
+                self._handle, source, target, edges
+            )
+
+        return _JGraphTNativeGraphPath(
+            self._graph,
+            weight,
+            source_vertex,
+            target_vertex,
+            [_edge_g_to_anyhashableg(self._graph, e) for e in edges[:length]],
+        )
+
+    def save(self, filename):
+        n, num_arcs = backend.jgrapht_ch_get_info(self._handle)
+        arrays = [_new_int_array(n)]
+        arrays.extend(_new_int_array(num_arcs) for _ in range(6))
+        arrays.append(_new_double_array(num_arcs))
+        backend.jgrapht_ch_get_arrays(self._handle, *arrays)
+
+        with open(filename, "wb") as f:
+            f.write(
+                _CH_HEADER.pack(
+                    _CH_MAGIC,
+                    n,
+                    num_arcs,
+                    self._graph.number_of_edges,
+                    self._graph.type.directed,
+                )
+            )
+            for a in arrays:
+                if sys.byteorder == "big":
+                    a.byteswap()
+                a.tofile(f)
+
+    def _destroy(self):
+        handle, self._handle = self._handle, None
+        backend.jgrapht_ch_destroy(handle)
+
+    def __repr__(self):
+        return "_JGraphTContractionHierarchy(%r)" % self._handle
+
+
+def _compute_contraction_hierarchy(graph):
+    spgraph = _JGraphTShortestPathGraph(graph)
+    try:
+        handle = backend.jgrapht_ch_create(spgraph.handle)
+    finally:
+        spgraph.close()
+    return _JGraphTContractionHierarchy(graph, handle)
+
+
+def _load_contraction_hierarchy(graph, filename):
+    with open(filename, "rb") as f:
+        header = f.read(_CH_HEADER.size)
+        if len(header) != _CH_HEADER.size:
+            raise ValueError("Not a contraction hierarchy file")
+        magic, n, num_arcs, m, directed = _CH_HEADER.unpack(header)
+        if magic != _CH_MAGIC or n < 0 or num_arcs < 0:
+            raise ValueError("Not a contraction hierarchy file")
+        if bool(directed) != graph.type.directed or m != graph.number_of_edges:
+            raise ValueError("Contraction hierarchy does not match the graph")
+        if n != backend.jgrapht_graph_vertices_max(graph.handle) + 1:
+            raise ValueError("Contraction hierarchy does not match the graph")
+
+        arrays = [_new_int_array(0) for _ in range(7)]
+        arrays.append(_new_double_array(0))
+        try:
+            arrays[0].fromfile(f, n)
+            for a in arrays[1:]:
+                a.fromfile(f, num_arcs)
+        except EOFError:
+            raise ValueError("Truncated contraction hierarchy file")
+
+    if sys.byteorder == "big":
+        for a in arrays:
+            a.byteswap()
+
+    handle = backend.jgrapht_ch_create_from_arrays(graph.handle, *arrays)
+    return _JGraphTContractionHierarchy(graph, handle)
@@ -0,0 +1,311 @@
+import heapq
+import itertools
+import math
+import weakref
+
+from .. import backend
+from ..types import GraphEvent, ListenableGraph, SingleSourcePaths
+from ._arrays import _new_int_array, _new_double_array
+from ._anyhashableg import _is_anyhashable_graph
+from ._paths import _JGraphTNativeGraphPath
+
+
+class _JGraphTDynamicSingleSourcePaths(SingleSourcePaths):
+    """Single-source shortest paths which are repaired incrementally when the
+    graph changes.
+
+    The shortest path tree is kept in Python together with a copy of the edges,
+    and is updated by a listener on the graph. A repair only visits the vertices
+    whose distance changes and their incident edges.
+    """
+
+    _listener = None
+
+    def __init__(self, graph, source_vertex):
+        if not isinstance(graph, ListenableGraph) and not _is_anyhashable_graph(graph):
+            raise ValueError("Graph must be listenable, see views.as_listenable")
+        if not graph.contains_vertex(source_vertex):
+            raise ValueError("Vertex {} not in graph".format(source_vertex))
+
+        self._graph = graph
+        self._source_vertex = source_vertex
+        self._directed = graph.type.directed
+        self._anyhashable = _is_anyhashable_graph(graph)
+        self._negative_weights = False
+        self._counter = itertools.count()
+
+        # edge -> (source, target, weight)
+        self._edges = {}
+        # vertex -> edges which leave or enter it, the same sets if undirected
+        self._out = {}
+        self._in = {}
+        self._dist = {}
+        # vertex -> edge from its parent in the tree, and the reverse relation
+        self._pred = {}
+        self._children = {}
+
+        for v in graph.vertices:
+            self._add_vertex(v)
+        edges = list(graph.edges)
+        weights = graph.get_edge_weights(edges)
+        for e, w in zip(edges, weights):
+            if w < 0:
+                raise ValueError("Negative edge weights are not supported")
+            self._add_edge(e, graph.edge_source(e), graph.edge_target(e), w)
+
+        self._dist[source_vertex] = 0.0
+        self._propagate([(0.0, next(self._counter), source_vertex)])
+
+        # The graph keeps the listener alive, while the listener only keeps a
+        # weak reference to the paths, which can thus be garbage collected.
+        paths_ref = weakref.ref(self)
+
+        def listener(element, event_type):
+            paths = paths_ref()
+            if paths is not None:
+                paths._on_graph_event(element, event_type)
+
+        self._listener = graph.add_listener(listener)
+
+    @property
+    def graph(self):
+        return self._graph
+
+    @property
+    def source_vertex(self):
+        """The source vertex"""
+        return self._source_vertex
+
+    def get_path(self, target_vertex):
+        """Get a path to a target vertex.
+
+        :param target_vertex: The target vertex.
+        :returns: a path from the source to the target vertex.
+        """
+        weight = self.distance_to(target_vertex)
+        if math.isinf(weight):
+            return None
+
+        edges = []
+        v = target_vertex
+        while v != self._source_vertex:
+            e = self._pred[v]
+            edges.append(e)
+            v = self._tail(e, v)
+        edges.reverse()
+
+        return _JGraphTNativeGraphPath(
+            self._graph, weight, self._source_vertex, target_vertex, edges
+        )
+
+    def distance_to(self, target_vertex):
+        """Get the distance to a target vertex, without building a path.
+
+        :param target_vertex: The target vertex.
+        :returns: the distance or infinity if the target is unreachable.
+        """
+        self._check()
+        try:
+            return self._dist[target_vertex]
+        except KeyError:
+            raise ValueError("Vertex {} not in graph".format(target_vertex))
+
+    def distances(self):
+        """The distances of all vertices from the source.
+
+        For graphs with integer vertices this is an array of C doubles indexed by
+        vertex, with NaN for identifiers which do not correspond to a vertex. For
+        any-hashable graphs it is a dictionary from vertices to distances.
+        """
+        self._check()
+        if self._anyhashable:
+            return dict(self._dist)
+        dist = _new_double_array(self._size(), math.nan)
+        for v, d in self._dist.items():
+            dist[v] = d
+        return dist
+
+    def predecessors(self):
+        """The predecessors of all vertices in the shortest path tree.
+
+        For graphs with integer vertices this is an array of C ints indexed by
+        vertex, with -1 for vertices without a predecessor. For any-hashable graphs
+        it is a dictionary from vertices to their previous vertex, which does not
+        include the source and unreachable vertices.
+        """
+        self._check()
+        if self._anyhashable:
+            return {v: self._tail(e, v) for v, e in self._pred.items()}
+        pred = _new_int_array(self._size(), -1)
+        for v, e in self._pred.items():
+            pred[v] = self._tail(e, v)
+        return pred
+
+    def close(self):
+        """Stop following the changes of the graph."""
+        if self._listener is not None:
+            self._graph.remove_listener(self._listener)
+            self._listener = None
+
+    def _check(self):
+        if self._negative_weights:
+            raise ValueError("Negative edge weights are not supported")
+
+    def _size(self):
+        return max(self._dist, default=-1) + 1
+
+    def _head(self, e, v):
+        """The other endpoint of an edge leaving v."""
+        s, t, _ = self._edges[e]
+        return t if self._directed or s == v else s
+
+    def _tail(self, e, v):
+        """The other endpoint of an edge entering v."""
+        s, t, _ = self._edges[e]
+        return s if self._directed or t == v else t
+
+    def _add_vertex(self, v):
+        if v in self._dist:
+            return
+        self._dist[v] = math.inf
+        self._out[v] = set()
+        self._in[v] = self._out[v] if not self._directed else set()
+        self._children[v] = set()
+
+    def _add_edge(self, e, s, t, weight):
+        self._add_vertex(s)
+        self._add_vertex(t)
+        self._edges[e] = (s, t, weight)
+        self._out[s].add(e)
+        self._in[t].add(e)
+
+    def _set_pred(self, v, e):
+        old = self._pred.get(v)
+        if old is not None:
+            self._children[self._tail(old, v)].discard(v)
+        self._pred[v] = e
+        self._children[self._tail(e, v)].add(v)
+
+    def _propagate(self, heap):
+        """Run Dijkstra's algorithm from the vertices in the heap, which already
+        have their new distance."""
+        heapq.heapify(heap)
+        dist = self._dist
+        edges = self._edges
+        while heap:
+            d, _, v = heapq.heappop(heap)
+            if d > dist[v]:
+                continue
+            for e in self._out[v]:
+                u = self._head(e, v)
+                du = d + edges[e][2]
+                if du < dist[u]:
+                    dist[u] = du
+                    self._set_pred(u, e)
+                    heapq.heappush(heap, (du, next(self._counter), u))
+
+    def _decrease(self, e):
+        """Repair after the weight of an edge decreased or the edge was added."""
+        s, t, weight = self._edges[e]
+        heap = []
+        for v, u in [(s, t), (t, s)] if not self._directed else [(s, t)]:
+            du = self._dist[v] + weight
+            if du < self._dist[u]:
+                self._dist[u] = du
+                self._set_pred(u, e)
+                heap.append((du, next(self._counter), u))
+        self._propagate(heap)
+
+    def _increase(self, e):
+        """Repair after the weight of an edge increased or the edge was removed.
+
+        Only the subtrees below the edge are affected. Their vertices are detached,
+        reconnected through their best incoming edge from the rest of the tree and
+        then the distances are propagated among them.
+        """
+        s, t, _ = self._edges[e]
+        affected = set()
+        stack = [v for v in (s, t) if self._pred.get(v) == e]
+        while stack:
+            v = stack.pop()
+            if v not in affected:
+                affected.add(v)
+                stack.extend(self._children[v])
+        if not affected:
+            return
+
+        for v in affected:
+            self._children[self._tail(self._pred.pop(v), v)].discard(v)
+            self._dist[v] = math.inf
+
+        dist = self._dist
+        edges = self._edges
+        heap = []
+        for v in affected:
+            best, best_edge = math.inf, None
+            for f in self._in[v]:
+                d = dist[self._tail(f, v)] + edges[f][2]
+                if d < best:
+                    best, best_edge = d, f
+            if best_edge is not None:
+                dist[v] = best
+                self._set_pred(v, best_edge)
+                heap.append((best, next(self._counter), v))
+        self._propagate(heap)
+
+    def _update_weight(self, e, weight):
+        s, t, old = self._edges[e]
+        self._edges[e] = (s, t, weight)
+        if weight < 0:
+            self._negative_weights = True
+        elif weight < old:
+            self._decrease(e)
+        elif weight > old:
+            self._increase(e)
+
+    def _on_graph_event(self, element, event_type):
+        if self._negative_weights:
+            # the tree can no longer be repaired
+            return
+        if event_type == GraphEvent.VERTEX_ADDED:
+            self._add_vertex(element)
+        elif event_type == GraphEvent.VERTEX_REMOVED:
+            # its edges have already been removed
+            self._dist.pop(element, None)
+            self._out.pop(element, None)
+            self._in.pop(element, None)
+            self._children.pop(element, None)
+        elif event_type == GraphEvent.EDGE_ADDED:
+            weight = self._graph.get_edge_weight(element)
+            self._add_edge(
+                element,
+                self._graph.edge_source(element),
+                self._graph.edge_target(element),
+                weight,
+            )
+            if weight < 0:
+                self._negative_weights = True
+            else:
+                self._decrease(element)
+        elif event_type == GraphEvent.EDGE_REMOVED:
+            if element not in self._edges:
+                return
+            s, t, _ = self._edges[element]
+            self._out[s].discard(element)
+            self._in[t].discard(element)
+            self._increase(element)
+            del self._edges[element]
+        elif event_type == GraphEvent.EDGE_WEIGHT_UPDATED:
+            self._update_weight(element, self._graph.get_edge_weight(element))
+        elif event_type == GraphEvent.EDGE_WEIGHTS_UPDATED:
+            edges = list(element)
+            for e, w in zip(edges, self._graph.get_edge_weights(edges)):
+                if not self._negative_weights:
+                    self._update_weight(e, w)
+
+    def __del__(self):
+        if self._listener is not None and backend.jgrapht_isolate_is_attached():
+            self._graph.remove_listener(self._listener)
+
+    def __repr__(self):
+        return "_JGraphTDynamicSingleSourcePaths(%r)" % self._source_vertex
@@ -5,9 +5,17 @@ from ..types import (
     DirectedAcyclicGraph,
 )
 
+from collections import namedtuple
 from collections.abc import Set
+import math
 
 from ._wrappers import _HandleWrapper
+from ._arrays import (
+    _new_int_array,
+    _new_double_array,
+    _as_int_buffer,
+    _as_double_buffer,
+)
 from ._collections import (
     _JGraphTIntegerIterator,
     _JGraphTIntegerSet,
@@ -15,6 +23,10 @@ from ._collections import (
 )
 
 
+# Degree kinds, as understood by the backend
+_DEGREE_KINDS = {"all": 0, "in": 1, "out": 2}
+
+
 class _JGraphTGraph(_HandleWrapper, Graph):
     """The actual graph implementation. This implementation always uses integers
     for the vertices and the edges of the graph. All operations are delegated to
@@ -56,6 +68,29 @@ class _JGraphTGraph(_HandleWrapper, Graph):
             vertex = backend.jgrapht_graph_add_vertex(self._handle)
         return vertex
 
+    def add_vertices_from(self, vertices):
+        try:
+            memoryview(vertices).release()
+        except TypeError:
+            vertices = list(vertices)
+            if any(v is None for v in vertices):
+                # None asks for a new vertex, add them one by one
+                return super().add_vertices_from(vertices)
+        vertices = _as_int_buffer(vertices)
+        backend.jgrapht_graph_add_given_vertices(self._handle, vertices)
+        return list(vertices)
+
+    def add_new_vertices(self, count):
+        """Add new vertices to the graph in bulk.
+
+        :param count: number of vertices to create
+        :returns: the new vertex identifiers
+        :rtype: :py:class:`array.array`
+        """
+        res = _new_int_array(count)
+        backend.jgrapht_graph_add_vertices(self._handle, res)
+        return res
+
     def remove_vertex(self, v):
         backend.jgrapht_graph_remove_vertex(self._handle, v)
 
@@ -73,6 +108,57 @@ class _JGraphTGraph(_HandleWrapper, Graph):
             self.set_edge_weight(edge, weight)
         return edge
 
+    def add_edges_from(self, edges):
+        edges = list(edges)
+        if any(len(rest) > 1 and rest[1] is not None for _, _, *rest in edges):
+            # explicit edge identifiers, add one by one
+            return super().add_edges_from(edges)
+
+        # edges without a weight are marked with NaN and keep the default
+        sources = _new_int_array(0)
+        targets = _new_int_array(0)
+        weights = _new_double_array(0)
+        has_weights = False
+        for u, v, *rest in edges:
+            sources.append(u)
+            targets.append(v)
+            if rest and rest[0] is not None:
+                weights.append(rest[0])
+                has_weights = True
+            else:
+                weights.append(math.nan)
+
+        return list(
+            self.add_edges_from_arrays(
+                sources, targets, weights if has_weights else None
+            )
+        )
+
+    def add_edges_from_arrays(self, sources, targets, weights=None):
+        """Add edges to the graph in bulk.
+
+        All edges are inserted using a single backend call. Any object supporting
+        the buffer protocol, such as an :py:class:`array.array` or a NumPy array,
+        can be used. Arrays of C ints (C doubles for the weights) are not copied.
+
+        :param sources: the source vertex of each edge
+        :param targets: the target vertex of each edge
+        :param weights: optional weight of each edge, where NaN keeps the default weight
+        :returns: the new edge identifiers
+        :rtype: :py:class:`array.array`
+        """
+        sources = _as_int_buffer(sources)
+        targets = _as_int_buffer(targets)
+        if weights is not None:
+            weights = _as_double_buffer(weights)
+        else:
+            weights = _new_double_array(0)
+        res = _new_int_array(len(sources))
+        backend.jgrapht_graph_add_edges(
+            self._handle, sources, targets, weights, res
+        )
+        return res
+
     def remove_edge(self, e):
         return backend.jgrapht_graph_remove_edge(self._handle, e)
 
@@ -91,6 +177,22 @@ class _JGraphTGraph(_HandleWrapper, Graph):
     def outdegree_of(self, v):
         return backend.jgrapht_graph_outdegree_of(self._handle, v)
 
+    def degrees(self, kind="all"):
+        """Compute the degrees of all vertices using a single backend call.
+
+        :param kind: one of 'all' for the degree, 'in' for the indegree or 'out' for
+          the outdegree
+        :returns: an array indexed by vertex identifier. Its length is one more than
+          the largest vertex, and identifiers which are not vertices have a zero entry.
+        :rtype: :py:class:`array.array`
+        """
+        if kind not in _DEGREE_KINDS:
+            raise ValueError("Unknown degree kind {}".format(kind))
+        max_vertex = backend.jgrapht_graph_vertices_max(self._handle)
+        res = _new_int_array(max_vertex + 1)
+        backend.jgrapht_graph_degrees(self._handle, _DEGREE_KINDS[kind], res)
+        return res
+
     def edge_source(self, e):
         return backend.jgrapht_graph_edge_source(self._handle, e)
 
@@ -103,6 +205,32 @@ class _JGraphTGraph(_HandleWrapper, Graph):
     def set_edge_weight(self, e, weight):
         backend.jgrapht_graph_set_edge_weight(self._handle, e, weight)
 
+    def get_edge_weights(self, edges=None):
+        """Read the weights of many edges using a single backend call.
+
+        :param edges: the edges, as any sequence or buffer of integers. If None, all
+          edges of the graph are used in the order given by iterating over :py:attr:`edges`.
+        :returns: the weight of each edge
+        :rtype: :py:class:`array.array`
+        """
+        if edges is None:
+            edges = iter(self.edges).to_array()
+        else:
+            edges = _as_int_buffer(edges)
+        res = _new_double_array(len(edges))
+        backend.jgrapht_graph_get_edge_weights(self._handle, edges, res)
+        return res
+
+    def set_edge_weights(self, edges, weights):
+        """Set the weights of many edges using a single backend call.
+
+        :param edges: the edges, as any sequence or buffer of integers
+        :param weights: the new weight of each edge, as any sequence or buffer of numbers
+        """
+        backend.jgrapht_graph_set_edge_weights(
+            self._handle, _as_int_buffer(edges), _as_double_buffer(weights)
+        )
+
     @property
     def number_of_vertices(self):
         return len(self.vertices)
@@ -187,6 +315,48 @@ class _JGraphTGraph(_HandleWrapper, Graph):
         return "_JGraphTGraph(%r)" % self._handle
 
 
+_CSR = namedtuple("CSR", ["offsets", "indices", "edges", "weights"])
+
+
+class _JGraphTSparseGraph(_JGraphTGraph):
+    """A sparse graph. Sparse graphs use a CSR representation and have vertices
+    0, ..., n-1. Their structure cannot be modified after construction.
+    """
+
+    def __init__(self, handle, **kwargs):
+        super().__init__(handle=handle, **kwargs)
+
+    def as_csr(self):
+        """Export the structure of the graph in compressed sparse row format.
+
+        The outgoing edges of vertex `v` are found at positions `offsets[v]` up to
+        `offsets[v+1]` (exclusive) of the other three arrays. For each such position,
+        `indices` contains the opposite vertex, `edges` the edge identifier and `weights`
+        the edge weight. In undirected graphs every edge appears in the rows of both
+        its endpoints.
+
+        The arrays are :py:class:`array.array` instances filled by the backend in bulk.
+        They support the buffer protocol and thus can be wrapped without copying, e.g.
+        using :py:func:`numpy.frombuffer` or :py:func:`numpy.asarray`.
+
+        :returns: a named tuple (offsets, indices, edges, weights)
+        """
+        n = backend.jgrapht_graph_vertices_count(self._handle)
+        offsets = _new_int_array(n + 1)
+        backend.jgrapht_graph_csr_offsets(self._handle, offsets)
+
+        m = offsets[n]
+        indices = _new_int_array(m)
+        edges = _new_int_array(m)
+        weights = _new_double_array(m)
+        backend.jgrapht_graph_csr_fill(self._handle, offsets, indices, edges, weights)
+
+        return _CSR(offsets, indices, edges, weights)
+
+    def __repr__(self):
+        return "_JGraphTSparseGraph(%r)" % self._handle
+
+
 class _JGraphTDirectedAcyclicGraph(_JGraphTGraph, DirectedAcyclicGraph):
     """The directed acyclic graph wrapper."""
 
@@ -227,7 +397,15 @@ def _create_int_graph(
     return _JGraphTGraph(handle)
 
 
-def _create_sparse_int_graph(edgelist, num_of_vertices=None, directed=True, weighted=True):
+def _create_sparse_int_graph(
+    edgelist=None,
+    num_of_vertices=None,
+    directed=True,
+    weighted=True,
+    sources=None,
+    targets=None,
+    weights=None,
+):
     """Create a sparse graph with integer vertices/edges. 
 
     A sparse graph uses a CSR (compressed-sparse-rows) representation. The result is 
@@ -243,57 +421,83 @@ def _create_sparse_int_graph(edgelist, num_of_vertices=None, directed=True, weig
     
     Sparse graphs can always support self-loops and multiple-edges.
 
+    The edges can be given either as an edgelist or as separate arrays of sources,
+    targets and weights. Any object supporting the buffer protocol, such as an
+    :py:class:`array.array` or a NumPy array, can be used for the arrays. Arrays with
+    a matching element type (C int for vertices and C double for weights) are passed
+    to the backend without copying.
+
     :param edgelist: list of tuple (u,v) or (u,v,weight) for weighted graphs
     :param num_of_vertices: number of vertices in the graph. Vertices always start from 0 
-      and increase continuously. If not explicitly given the edgelist will be traversed in
+      and increase continuously. If not explicitly given the edges will be traversed in
       order to find out the number of vertices
     :param directed: whether the graph will be directed or undirected
     :param weighted: whether the graph will be weighted or not
+    :param sources: array with the source of each edge, used instead of the edgelist
+    :param targets: array with the target of each edge, used instead of the edgelist
+    :param weights: optional array with the weight of each edge. If not given, all edges
+      have weight 1.0
     :returns: a graph
     :rtype: :class:`~jgrapht.types.Graph`
     """
-    track_num_vertices = num_of_vertices is None
-
-    if weighted and isinstance(edgelist, _JGraphTEdgeTripleList):
-        # Special case for internal edge list, created using the edgelist
-        # importers. This avoids copying.
-        e_list_owner = False
-        e_list = edgelist.handle
-
-        if track_num_vertices: 
-            num_of_vertices = 0
-            for u, v, *w in edgelist:
-                num_of_vertices = max(u, v, num_of_vertices)
-            num_of_vertices += 1
+    if edgelist is not None:
+        if sources is not None or targets is not None or weights is not None:
+            raise ValueError("Provide either an edgelist or arrays, not both")
+
+        if weighted and isinstance(edgelist, _JGraphTEdgeTripleList):
+            # Special case for internal edge list, created using the edgelist
+            # importers. This avoids copying.
+            if num_of_vertices is None:
+                num_of_vertices = 0
+                edge_sources, edge_targets, _ = iter(edgelist).to_array()
+                if len(edge_sources) > 0:
+                    num_of_vertices = max(max(edge_sources), max(edge_targets)) + 1
+
+            handle = backend.jgrapht_graph_sparse_create(
+                directed, weighted, num_of_vertices, edgelist.handle
+            )
+            return _JGraphTSparseGraph(handle)
+
+        sources, targets, weights = _edgelist_to_arrays(edgelist, weighted)
+    elif sources is None or targets is None:
+        raise ValueError("Either an edgelist or sources and targets must be provided")
+
+    sources = _as_int_buffer(sources)
+    targets = _as_int_buffer(targets)
+    if weighted and weights is not None:
+        weights = _as_double_buffer(weights)
+        if len(weights) != len(sources):
+            raise ValueError("Weights must have the same length as sources and targets")
     else:
-        e_list_owner = True
-        e_list = backend.jgrapht_list_create()
-
-        if track_num_vertices: 
-            num_of_vertices = 0
-
-        if weighted:
-            for u, v, w in edgelist:
-                backend.jgrapht_list_edge_triple_add(e_list, u, v, w)
-                if track_num_vertices:
-                     num_of_vertices = max(u, v, num_of_vertices)
-        else:
-            for u, v, *w in edgelist:
-                backend.jgrapht_list_edge_pair_add(e_list, u, v)
-                if track_num_vertices:
-                    num_of_vertices = max(u, v, num_of_vertices)
-
-        if track_num_vertices: 
-            num_of_vertices += 1
-
-    handle = backend.jgrapht_graph_sparse_create(
-        directed, weighted, num_of_vertices, e_list
+        weights = _new_double_array(0)
+
+    handle = backend.jgrapht_graph_sparse_create_from_arrays(
+        directed,
+        weighted,
+        -1 if num_of_vertices is None else num_of_vertices,
+        sources,
+        targets,
+        weights,
     )
-
-    if e_list_owner:
-        backend.jgrapht_handles_destroy(e_list)
-
-    return _JGraphTGraph(handle)
+    return _JGraphTSparseGraph(handle)
+
+
+def _edgelist_to_arrays(edgelist, weighted):
+    """Split an edgelist into arrays of sources, targets and weights."""
+    sources = _new_int_array(0)
+    targets = _new_int_array(0)
+    if weighted:
+        weights = _new_double_array(0)
+        for u, v, w in edgelist:
+            sources.append(u)
+            targets.append(v)
+            weights.append(w)
+    else:
+        weights = None
+        for u, v, *w in edgelist:
+            sources.append(u)
+            targets.append(v)
+    return sources, targets, weights
 
 
 def _copy_to_sparse_int_graph(graph):
@@ -315,12 +519,12 @@ def _copy_to_sparse_int_graph(graph):
     if len(graph.vertices) == 0:
         raise ValueError("Graph with no vertices")
 
-    max_vertex = max(graph.vertices)
-    edgelist = [graph.edge_tuple(e) for e in graph.edges]
-
-    return _create_sparse_int_graph(
-        edgelist, max_vertex + 1, graph.type.directed, graph.type.weighted
+    # the copy happens entirely in the backend
+    edges = _new_int_array(len(graph.edges))
+    handle = backend.jgrapht_graph_copy_to_sparse(
+        graph.handle, _new_int_array(0), edges
     )
+    return _JGraphTSparseGraph(handle)
 
 
 def _create_int_dag(
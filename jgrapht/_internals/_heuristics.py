@@ -0,0 +1,236 @@
+import struct
+import sys
+import time
+from collections.abc import Mapping
+
+from .. import backend
+from ..types import ALTIndex
+from ._arrays import (
+    _new_int_array,
+    _new_double_array,
+    _as_int_buffer,
+    _as_double_buffer,
+)
+from ._anyhashableg import (
+    _is_anyhashable_graph,
+    _vertex_anyhashableg_to_g,
+    _vertex_g_to_anyhashableg,
+)
+from ._spgraphs import _JGraphTShortestPathGraph
+from ._wrappers import _NativeResource
+
+
+_METRICS = {
+    "euclidean": 0,
+    "manhattan": 1,
+    "haversine": 2,
+}
+
+_LANDMARK_SELECTIONS = {
+    "random": 0,
+    "farthest": 1,
+}
+
+# magic, number of landmarks, size of the distance rows, directed
+_ALT_HEADER = struct.Struct("<8siii")
+_ALT_MAGIC = b"JGTALT01"
+
+
+class _JGraphTNativeHeuristic(_NativeResource):
+    """An A* heuristic evaluated by the backend without calling into Python.
+
+    Each heuristic occupies one of a fixed number of slots of the backend, until
+    it is closed or garbage collected.
+    """
+
+    _slot = None
+
+    @property
+    def memory_usage(self):
+        return backend.jgrapht_heuristic_get_memory(self._slot)
+
+    @property
+    def closed(self):
+        return self._slot is None
+
+    def _destroy(self):
+        slot, self._slot = self._slot, None
+        backend.jgrapht_heuristic_destroy(slot)
+
+
+class _JGraphTCoordinateHeuristic(_JGraphTNativeHeuristic):
+    """An A* heuristic over per-vertex coordinates."""
+
+    def __init__(self, graph, coordinates, metric="euclidean", scale=1.0):
+        try:
+            metric_id = _METRICS[metric]
+        except KeyError:
+            raise ValueError(
+                "Unknown metric {!r}, must be one of {}".format(
+                    metric, ", ".join(_METRICS)
+                )
+            )
+
+        self._metric = metric
+        xs, ys = _coordinates_to_arrays(graph, coordinates)
+        self._slot = backend.jgrapht_heuristic_create(metric_id, float(scale), xs, ys)
+        self._own()
+        self.fptr = backend.jgrapht_heuristic_get_callback(self._slot)
+
+    @property
+    def metric(self):
+        return self._metric
+
+    def __repr__(self):
+        return "_JGraphTCoordinateHeuristic(metric={!r})".format(self._metric)
+
+
+class _JGraphTALTIndex(_JGraphTNativeHeuristic, ALTIndex):
+    """An ALT index, which keeps the distances from and to a set of landmarks."""
+
+    def __init__(self, graph, slot):
+        self._slot = slot
+        self._own()
+        self._graph = graph
+        self.fptr = backend.jgrapht_heuristic_get_callback(slot)
+
+    @property
+    def graph(self):
+        return self._graph
+
+    @property
+    def landmarks(self):
+        landmarks, _, _ = self._tables()
+        return [_vertex_g_to_anyhashableg(self._graph, v) for v in landmarks]
+
+    def get_path(self, source_vertex, target_vertex, use_bidirectional=True):
+        from ..algorithms.shortestpaths import a_star
+
+        return a_star(
+            self._graph,
+            source_vertex,
+            target_vertex,
+            heuristic_cb=self,
+            use_bidirectional=use_bidirectional,
+        )
+
+    def save(self, filename):
+        k, size, directed = backend.jgrapht_heuristic_landmarks_get_info(self._slot)
+        with open(filename, "wb") as f:
+            f.write(_ALT_HEADER.pack(_ALT_MAGIC, k, size, directed))
+            for a in self._tables():
+                if sys.byteorder == "big":
+                    a.byteswap()
+                a.tofile(f)
+
+    def _tables(self):
+        k, size, directed = backend.jgrapht_heuristic_landmarks_get_info(self._slot)
+        landmarks = _new_int_array(k)
+        from_landmarks = _new_double_array(k * size)
+        to_landmarks = _new_double_array(k * size if directed else 0)
+        backend.jgrapht_heuristic_landmarks_get(
+            self._slot, landmarks, from_landmarks, to_landmarks
+        )
+        return landmarks, from_landmarks, to_landmarks
+
+    def __repr__(self):
+        return "_JGraphTALTIndex(%r)" % self._slot
+
+
+def _compute_alt_index(graph, landmarks=None, num_landmarks=16, selection="farthest", seed=None):
+    try:
+        selection_id = _LANDMARK_SELECTIONS[selection]
+    except KeyError:
+        raise ValueError(
+            "Unknown landmark selection {!r}, must be one of {}".format(
+                selection, ", ".join(_LANDMARK_SELECTIONS)
+            )
+        )
+    if seed is None:
+        seed = int(time.time())
+
+    if landmarks is not None:
+        landmarks = _as_int_buffer(
+            [_vertex_anyhashableg_to_g(graph, v) for v in landmarks]
+        )
+        if len(landmarks) == 0:
+            raise ValueError("At least one landmark is required")
+    else:
+        landmarks = _new_int_array(0)
+
+    spgraph = _JGraphTShortestPathGraph(graph)
+    try:
+        slot = backend.jgrapht_heuristic_landmarks_compute(
+            spgraph.handle, landmarks, num_landmarks, selection_id, seed
+        )
+    finally:
+        spgraph.close()
+    return _JGraphTALTIndex(graph, slot)
+
+
+def _load_alt_index(graph, filename):
+    with open(filename, "rb") as f:
+        header = f.read(_ALT_HEADER.size)
+        if len(header) != _ALT_HEADER.size:
+            raise ValueError("Not an ALT index file")
+        magic, k, size, directed = _ALT_HEADER.unpack(header)
+        if magic != _ALT_MAGIC or k <= 0 or size < 0:
+            raise ValueError("Not an ALT index file")
+        if bool(directed) != graph.type.directed:
+            raise ValueError("ALT index does not match the graph")
+        if size != backend.jgrapht_graph_vertices_max(graph.handle) + 1:
+            raise ValueError("ALT index does not match the graph")
+
+        landmarks = _new_int_array(0)
+        from_landmarks = _new_double_array(0)
+        to_landmarks = _new_double_array(0)
+        try:
+            landmarks.fromfile(f, k)
+            from_landmarks.fromfile(f, k * size)
+            if directed:
+                to_landmarks.fromfile(f, k * size)
+        except EOFError:
+            raise ValueError("Truncated ALT index file")
+
+    if sys.byteorder == "big":
+        for a in (landmarks, from_landmarks, to_landmarks):
+            a.byteswap()
+
+    slot = backend.jgrapht_heuristic_landmarks_create(
+        landmarks, from_landmarks, to_landmarks
+    )
+    return _JGraphTALTIndex(graph, slot)
+
+
+def _coordinates_to_arrays(graph, coordinates):
+    """Convert coordinates to two arrays (x and y) indexed by the vertex identifiers.
+
+    Coordinates are either a mapping from vertices to (x, y) pairs, a two-dimensional
+    array with one row per vertex or a pair of arrays (xs, ys). Only mappings are
+    supported for any-hashable graphs. Vertices without coordinates are assigned NaN,
+    which the backend evaluates as a zero estimate.
+    """
+    if _is_anyhashable_graph(graph):
+        if not isinstance(coordinates, Mapping):
+            raise TypeError(
+                "Coordinates of any-hashable graphs must be given as a mapping"
+            )
+        coordinates = {graph._get_vertex_id(v): c for v, c in coordinates.items()}
+
+    if isinstance(coordinates, Mapping):
+        size = max(coordinates, default=-1) + 1
+        xs = _new_double_array(size, float("nan"))
+        ys = _new_double_array(size, float("nan"))
+        for v, (x, y) in coordinates.items():
+            if v < 0:
+                raise ValueError("Vertex {} is not a valid identifier".format(v))
+            xs[v] = x
+            ys[v] = y
+        return xs, ys
+
+    if getattr(coordinates, "ndim", None) == 2:
+        # NumPy arrays (and compatible) with one row per vertex
+        return _as_double_buffer(coordinates[:, 0]), _as_double_buffer(coordinates[:, 1])
+
+    xs, ys = coordinates
+    return _as_double_buffer(xs), _as_double_buffer(ys)
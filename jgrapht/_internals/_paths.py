@@ -5,6 +5,7 @@ from ..types import (
     MultiObjectiveSingleSourcePaths,
     AllPairsPaths,
 )
+from ._arrays import _new_int_array, _new_double_array
 from ._wrappers import (
     _HandleWrapper,
     _JGraphTIntegerIterator,
@@ -66,12 +67,56 @@ class _JGraphTGraphPath(_HandleWrapper, GraphPath):
         self._weight = weight
         self._start_vertex = start_vertex
         self._end_vertex = end_vertex
-        self._edges = list(_JGraphTIntegerIterator(eit))
+        self._edges = _JGraphTIntegerIterator(eit).tolist()
 
     def __repr__(self):
         return "_JGraphTGraphPath(%r)" % self._handle
 
 
+class _JGraphTNativeGraphPath(GraphPath):
+    """A graph path computed by native code outside the capi.
+
+    Such paths have no backend handle and keep their edges in a list.
+    """
+
+    def __init__(self, graph, weight, start_vertex, end_vertex, edges):
+        self._graph = graph
+        self._weight = weight
+        self._start_vertex = start_vertex
+        self._end_vertex = end_vertex
+        self._edges = edges
+
+    @property
+    def weight(self):
+        """The weight of the path."""
+        return self._weight
+
+    @property
+    def start_vertex(self):
+        """The starting vertex of the path."""
+        return self._start_vertex
+
+    @property
+    def end_vertex(self):
+        """The ending vertex of the path."""
+        return self._end_vertex
+
+    @property
+    def edges(self):
+        """A list of edges of the path."""
+        return self._edges
+
+    @property
+    def graph(self):
+        return self._graph
+
+    def __iter__(self):
+        return self._edges.__iter__()
+
+    def __repr__(self):
+        return "_JGraphTNativeGraphPath(%r, %r)" % (self._start_vertex, self._end_vertex)
+
+
 class _JGraphTGraphPathIterator(_JGraphTObjectIterator):
     """A graph path iterator"""
 
@@ -97,6 +142,7 @@ class _JGraphTSingleSourcePaths(_HandleWrapper, SingleSourcePaths):
         super().__init__(handle=handle, **kwargs)
         self._graph = graph
         self._source_vertex = source_vertex
+        self._dist = None
 
     @property
     def source_vertex(self):
@@ -114,10 +160,65 @@ class _JGraphTSingleSourcePaths(_HandleWrapper, SingleSourcePaths):
         )
         return _JGraphTGraphPath(gp, self._graph) if gp is not None else None
 
+    def distance_to(self, target_vertex):
+        """Get the distance to a target vertex, without building a path object.
+
+        This takes time linear in the number of edges of the path, as the backend
+        still walks the shortest path tree.
+
+        :param target_vertex: The target vertex.
+        :returns: the distance or infinity if the target is unreachable.
+        """
+        return backend.jgrapht_sp_singlesource_get_distance_to_vertex(
+            self._handle, target_vertex
+        )
+
+    def distances(self):
+        """The distances of all vertices, as an array of C doubles indexed by vertex.
+
+        Unreachable vertices have distance infinity, while identifiers which do not
+        correspond to a vertex of the graph have distance NaN. The distances are
+        computed once per tree, in time linear in the total number of edges of the
+        paths to all vertices, that is O(n * depth) and quadratic in the worst case.
+        """
+        return self._distances()[:]
+
+    def predecessors(self):
+        """The predecessors of all vertices in the shortest path tree, as an array of
+        C ints indexed by vertex.
+
+        The source, unreachable vertices and identifiers which do not correspond to a
+        vertex of the graph have predecessor -1. This requires the distances and then
+        reads the paths to the farthest vertices, which in the worst case also takes
+        quadratic time.
+        """
+        return _singlesource_predecessors(
+            self._handle, self._graph, self._source_vertex, self._distances()
+        )
+
+    def _distances(self):
+        if self._dist is None:
+            self._dist = _singlesource_distances(self._handle, self._graph)
+        return self._dist
+
     def __repr__(self):
         return "_JGraphTSingleSourcePaths(%r)" % self._handle
 
 
+def _singlesource_distances(handle, graph):
+    dist = _new_double_array(backend.jgrapht_graph_vertices_max(graph.handle) + 1)
+    backend.jgrapht_sp_singlesource_get_distances(handle, graph.handle, dist)
+    return dist
+
+
+def _singlesource_predecessors(handle, graph, source, dist):
+    pred = _new_int_array(len(dist))
+    backend.jgrapht_sp_singlesource_get_predecessors(
+        handle, graph.handle, source, dist, pred
+    )
+    return pred
+
+
 class _JGraphTAllPairsPaths(_HandleWrapper, AllPairsPaths):
     """Wrapper class around the AllPairsPaths"""
 
@@ -16,7 +16,7 @@ class _JGraphTPlanarEmbedding(_HandleWrapper, PlanarEmbedding):
         res = backend.jgrapht_planarity_embedding_edges_around_vertex(
             self._handle, vertex
         )
-        return list(_JGraphTIntegerIterator(res))
+        return _JGraphTIntegerIterator(res).tolist()
 
     def __repr__(self):
         return "_JGraphTPlanarEmbedding(%r)" % self._handle
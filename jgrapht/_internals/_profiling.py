@@ -0,0 +1,167 @@
+from contextlib import contextmanager
+import functools
+import threading
+import time
+
+# Listeners of backend calls. Each one is a callable which accepts the name
+# of the backend function and the elapsed wall time in seconds. The backend
+# module is instrumented only while at least one listener is registered.
+_listeners = []
+_listeners_lock = threading.Lock()
+_originals = {}
+
+
+def _instrumented(name, f):
+    @functools.wraps(f)
+    def wrapper(*args):
+        start = time.perf_counter()
+        try:
+            return f(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            for listener in _listeners:
+                listener(name, elapsed)
+
+    return wrapper
+
+
+def _install():
+    from .. import backend
+
+    for name, f in list(vars(backend).items()):
+        if name.startswith("jgrapht_") and callable(f):
+            _originals[name] = f
+            setattr(backend, name, _instrumented(name, f))
+
+
+def _uninstall():
+    from .. import backend
+
+    for name, f in _originals.items():
+        setattr(backend, name, f)
+    _originals.clear()
+
+
+def add_profile_hook(hook):
+    """Register a hook which is called after every call into the backend.
+
+    The hook is called with the name of the backend function and the elapsed
+    wall time in seconds. It can be used in order to feed timings into a metrics
+    system. While no hooks are registered and no profile is active, calls into the
+    backend are not instrumented and have no overhead.
+
+    :param hook: a callable accepting the function name and the elapsed time
+    """
+    global _listeners
+    with _listeners_lock:
+        if not _listeners:
+            _install()
+        # copy on write, so that calls in progress iterate a stable list
+        _listeners = _listeners + [hook]
+
+
+def remove_profile_hook(hook):
+    """Unregister a hook previously registered with :py:meth:`add_profile_hook`.
+
+    :param hook: the hook to remove
+    :raises ValueError: if the hook is not registered
+    """
+    global _listeners
+    with _listeners_lock:
+        listeners = list(_listeners)
+        listeners.remove(hook)
+        _listeners = listeners
+        if not _listeners:
+            _uninstall()
+
+
+class Profile:
+    """Statistics about the calls into the backend, collected by :py:meth:`jgrapht.profile`."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def __call__(self, name, elapsed):
+        with self._lock:
+            entry = self._stats.get(name)
+            if entry is None:
+                self._stats[name] = [1, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+
+    @property
+    def calls(self):
+        """Total number of calls into the backend."""
+        with self._lock:
+            return sum(calls for calls, _ in self._stats.values())
+
+    @property
+    def total_time(self):
+        """Total wall time spent inside the backend, in seconds."""
+        with self._lock:
+            return sum(elapsed for _, elapsed in self._stats.values())
+
+    def stats(self):
+        """Statistics per backend function, sorted by cumulative time.
+
+        :returns: a list of tuples (name, calls, cumulative time in seconds)
+        """
+        with self._lock:
+            result = [(name, calls, elapsed) for name, (calls, elapsed) in self._stats.items()]
+        result.sort(key=lambda x: (-x[2], x[0]))
+        return result
+
+    def report(self, limit=None):
+        """Create a textual report, sorted by cumulative time.
+
+        :param limit: if given, only the most costly functions are included
+        :returns: the report as a string
+        """
+        stats = self.stats()
+        if limit is not None:
+            stats = stats[:limit]
+        width = max([len("function")] + [len(name) for name, _, _ in stats])
+        lines = [
+            "{:<{w}} {:>10} {:>12} {:>14}".format(
+                "function", "calls", "total (s)", "per call (us)", w=width
+            )
+        ]
+        for name, calls, elapsed in stats:
+            lines.append(
+                "{:<{w}} {:>10} {:>12.6f} {:>14.3f}".format(
+                    name, calls, elapsed, 1e6 * elapsed / calls, w=width
+                )
+            )
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return "Profile(calls={}, total_time={:.6f})".format(self.calls, self.total_time)
+
+
+@contextmanager
+def profile(hook=None):
+    """Profile the calls into the backend.
+
+    Counts the calls and the cumulative wall time of each backend function called
+    inside the context, from any thread::
+
+        with jgrapht.profile() as p:
+            sp.dijkstra(g, 0)
+
+        print(p.report())
+
+    :param hook: an optional callable which is additionally called with the name
+      of the backend function and the elapsed time of each call
+    :returns: a :py:class:`Profile` with the collected statistics
+    """
+    p = Profile()
+    hooks = [p] if hook is None else [p, hook]
+    for h in hooks:
+        add_profile_hook(h)
+    try:
+        yield p
+    finally:
+        for h in hooks:
+            remove_profile_hook(h)
@@ -0,0 +1,203 @@
+import weakref
+from collections import OrderedDict
+
+from .. import backend
+from ..types import GraphEvent, ListenableGraph, ShortestPathCache
+from ._anyhashableg import _is_anyhashable_graph
+
+
+# events after which no cached path can be trusted
+_STRUCTURAL_EVENTS = frozenset(
+    [GraphEvent.VERTEX_REMOVED, GraphEvent.EDGE_ADDED, GraphEvent.EDGE_REMOVED]
+)
+
+# events which only invalidate paths depending on the edge weights
+_WEIGHT_EVENTS = frozenset(
+    [GraphEvent.EDGE_WEIGHT_UPDATED, GraphEvent.EDGE_WEIGHTS_UPDATED]
+)
+
+
+class _JGraphTShortestPathCache(ShortestPathCache):
+    """A least-recently-used cache of point-to-point shortest paths.
+
+    The cache is bounded by the number of paths and optionally by the total number
+    of edges of the paths. It listens to the graph and invalidates itself on changes.
+    """
+
+    _listener = None
+    _coordinate_heuristic = None
+
+    def __init__(self, graph, max_entries, max_total_length):
+        if not isinstance(graph, ListenableGraph) and not _is_anyhashable_graph(graph):
+            raise ValueError("Graph must be listenable, see views.as_listenable")
+        if max_entries < 1:
+            raise ValueError("Maximum number of entries must be positive")
+        if max_total_length is not None and max_total_length < 0:
+            raise ValueError("Maximum total length cannot be negative")
+
+        self._graph = graph
+        self._max_entries = max_entries
+        self._max_total_length = max_total_length
+        # key -> (path, length) in least-recently-used order
+        self._entries = OrderedDict()
+        self._total_length = 0
+        self._hits = 0
+        self._misses = 0
+
+        # The graph keeps the listener alive, while the listener only keeps a
+        # weak reference to the cache, which can thus be garbage collected.
+        cache_ref = weakref.ref(self)
+
+        def listener(element, event_type):
+            cache = cache_ref()
+            if cache is not None:
+                cache._on_graph_event(event_type)
+
+        self._listener = graph.add_listener(listener)
+
+    @property
+    def graph(self):
+        return self._graph
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def total_length(self):
+        """The total number of edges of the cached paths."""
+        return self._total_length
+
+    def dijkstra(self, source_vertex, target_vertex, use_bidirectional=True):
+        from ..algorithms.shortestpaths import dijkstra
+
+        # both searches find a shortest path, but not necessarily the same one
+        key = ("dijkstra", source_vertex, target_vertex, use_bidirectional)
+        return self._get(
+            key,
+            lambda: dijkstra(
+                self._graph,
+                source_vertex,
+                target_vertex,
+                use_bidirectional=use_bidirectional,
+            ),
+        )
+
+    def a_star(
+        self,
+        source_vertex,
+        target_vertex,
+        heuristic_cb=None,
+        use_bidirectional=False,
+        coordinates=None,
+        metric="euclidean",
+    ):
+        from ..algorithms.shortestpaths import a_star
+
+        if coordinates is not None:
+            if heuristic_cb is not None:
+                raise ValueError("Cannot use both a heuristic callback and coordinates")
+            heuristic_cb = self._get_coordinate_heuristic(coordinates, metric)
+        elif heuristic_cb is None:
+            raise ValueError(
+                "Either a heuristic callback or coordinates must be provided"
+            )
+
+        # heuristics are compared by identity, so the key keeps them alive
+        key = ("a_star", source_vertex, target_vertex, heuristic_cb, use_bidirectional)
+        return self._get(
+            key,
+            lambda: a_star(
+                self._graph,
+                source_vertex,
+                target_vertex,
+                heuristic_cb=heuristic_cb,
+                use_bidirectional=use_bidirectional,
+            ),
+        )
+
+    def bfs(self, source_vertex, target_vertex):
+        from ..algorithms.shortestpaths import bfs
+
+        key = ("bfs", source_vertex, target_vertex)
+        return self._get(
+            key, lambda: bfs(self._graph, source_vertex).get_path(target_vertex)
+        )
+
+    def clear(self):
+        self._entries.clear()
+        self._total_length = 0
+
+    def close(self):
+        if self._listener is not None:
+            self._graph.remove_listener(self._listener)
+            self._listener = None
+        self.clear()
+        self._release_coordinate_heuristic()
+
+    def _get_coordinate_heuristic(self, coordinates, metric):
+        # Only the heuristic of the last coordinates is kept, since a native
+        # heuristic occupies one of the few slots of the backend.
+        from ._heuristics import _JGraphTCoordinateHeuristic
+
+        current = self._coordinate_heuristic
+        if current is not None and current[0] is coordinates and current[1] == metric:
+            return current[2]
+        self._release_coordinate_heuristic()
+        heuristic = _JGraphTCoordinateHeuristic(self._graph, coordinates, metric=metric)
+        self._coordinate_heuristic = (coordinates, metric, heuristic)
+        return heuristic
+
+    def _release_coordinate_heuristic(self):
+        if self._coordinate_heuristic is not None:
+            _, _, heuristic = self._coordinate_heuristic
+            self._coordinate_heuristic = None
+            heuristic.close()
+
+    def _get(self, key, compute):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+        self._misses += 1
+        path = compute()
+        length = len(path.edges) if path is not None else 0
+        if self._max_total_length is not None and length > self._max_total_length:
+            return path
+
+        self._entries[key] = (path, length)
+        self._total_length += length
+        while len(self._entries) > self._max_entries or (
+            self._max_total_length is not None
+            and self._total_length > self._max_total_length
+        ):
+            _, (_, evicted_length) = self._entries.popitem(last=False)
+            self._total_length -= evicted_length
+        return path
+
+    def _on_graph_event(self, event_type):
+        if event_type in _STRUCTURAL_EVENTS:
+            self.clear()
+            # identifiers of removed vertices may be reused by new vertices
+            self._release_coordinate_heuristic()
+        elif event_type in _WEIGHT_EVENTS:
+            # the number of edges of a path does not depend on the weights
+            for key in [k for k in self._entries if k[0] != "bfs"]:
+                _, length = self._entries.pop(key)
+                self._total_length -= length
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __del__(self):
+        if self._listener is not None and backend.jgrapht_isolate_is_attached():
+            self._graph.remove_listener(self._listener)
+
+    def __repr__(self):
+        return "_JGraphTShortestPathCache(%r)" % self._graph
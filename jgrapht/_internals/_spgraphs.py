@@ -0,0 +1,310 @@
+import mmap
+import os
+import struct
+from array import array
+
+from .. import backend
+from ._arrays import _new_int_array, _new_double_array, _as_int_buffer
+from ._anyhashableg import _is_anyhashable_graph, _vertex_anyhashableg_to_g
+from ._wrappers import _NativeResource
+
+
+_ALGORITHMS = {
+    "dijkstra": 0,
+    "bfs": 1,
+    "delta": 2,
+}
+
+_DTYPES = {
+    "float64": "d",
+    "float32": "f",
+}
+
+# Header of matrix files: magic, number of vertices, dtype and padding, which keeps
+# the matrix aligned.
+_MATRIX_HEADER = struct.Struct("<8sQ8s8x")
+_MATRIX_MAGIC = b"JGTDMAT1"
+
+_REDUCERS = {
+    "sum": 1,
+    "min": 2,
+    "count": 3,
+}
+
+
+class _JGraphTShortestPathGraph(_NativeResource):
+    """A read-only snapshot of a graph in compressed sparse row format, on which
+    shortest paths are computed by native code without calling into the capi.
+
+    The snapshot does not follow later modifications of the graph.
+    """
+
+    _handle = None
+
+    def __init__(self, graph):
+        self._handle = backend.jgrapht_spgraph_create(graph.handle)
+        self._own()
+        self._n, self._m, directed = backend.jgrapht_spgraph_get_info(self._handle)
+        self._directed = bool(directed)
+        self._graph = graph
+
+    @property
+    def handle(self):
+        return self._handle
+
+    @property
+    def graph(self):
+        return self._graph
+
+    @property
+    def size(self):
+        """The number of rows, which is the maximum vertex plus one."""
+        return self._n
+
+    @property
+    def directed(self):
+        return self._directed
+
+    def _destroy(self):
+        handle, self._handle = self._handle, None
+        backend.jgrapht_spgraph_destroy(handle)
+
+    def __repr__(self):
+        return "_JGraphTShortestPathGraph(%r)" % self._handle
+
+
+def _algorithm_id(algorithm):
+    try:
+        return _ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(
+            "Unknown algorithm {!r}, must be one of {}".format(
+                algorithm, ", ".join(_ALGORITHMS)
+            )
+        )
+
+
+def _as_matrix(a, rows, cols):
+    """View a flat array as a row-major matrix, without copying."""
+    return memoryview(a).cast("B").cast(a.typecode, (rows, cols))
+
+
+def _distance_matrix(graph, sources, targets, algorithm, predecessors, parallelism):
+    algorithm_id = _algorithm_id(algorithm)
+
+    if sources is None:
+        sources = graph.vertices
+    if targets is None:
+        targets = graph.vertices
+    sources = list(sources)
+    targets = list(targets)
+    if len(sources) == 0 or len(targets) == 0:
+        raise ValueError("At least one source and one target are required")
+
+    source_ids = _as_int_buffer([_vertex_anyhashableg_to_g(graph, v) for v in sources])
+    target_ids = _as_int_buffer([_vertex_anyhashableg_to_g(graph, v) for v in targets])
+
+    spgraph = _JGraphTShortestPathGraph(graph)
+    dist = _new_double_array(len(sources) * len(targets))
+    pred = _new_int_array(len(sources) * spgraph.size if predecessors else 0)
+    backend.jgrapht_spgraph_distance_matrix(
+        spgraph.handle, source_ids, target_ids, algorithm_id, parallelism, dist, pred
+    )
+
+    dist = _as_matrix(dist, len(sources), len(targets))
+    if not predecessors:
+        return dist
+
+    if _is_anyhashable_graph(graph):
+        vertex_id_to_hash = graph._vertex_id_to_hash
+        n = spgraph.size
+        trees = []
+        for i in range(len(sources)):
+            row = pred[i * n : (i + 1) * n]
+            trees.append(
+                {
+                    vertex_id_to_hash[v]: vertex_id_to_hash[u]
+                    for v, u in enumerate(row)
+                    if u >= 0
+                }
+            )
+        return dist, trees
+
+    return dist, _as_matrix(pred, len(sources), spgraph.size)
+
+
+def _multi_source(
+    graph, sources, algorithm, reduce, targets, radius, delta, parallelism, batch_size
+):
+    algorithm_id = _algorithm_id(algorithm)
+    if reduce is not None and reduce not in _REDUCERS:
+        raise ValueError(
+            "Unknown reducer {!r}, must be one of {}".format(
+                reduce, ", ".join(_REDUCERS)
+            )
+        )
+    if radius is None:
+        radius = float("inf")
+    if delta is None:
+        delta = 0.0
+
+    if sources is None:
+        sources = graph.vertices
+    sources = list(sources)
+    source_ids = _as_int_buffer([_vertex_anyhashableg_to_g(graph, v) for v in sources])
+    if targets is not None:
+        target_ids = _as_int_buffer(
+            [_vertex_anyhashableg_to_g(graph, v) for v in targets]
+        )
+    else:
+        target_ids = _new_int_array(0)
+
+    spgraph = _JGraphTShortestPathGraph(graph)
+
+    if reduce is not None:
+        values = _new_double_array(len(sources))
+        backend.jgrapht_spgraph_multi_source(
+            spgraph.handle,
+            source_ids,
+            target_ids,
+            algorithm_id,
+            delta,
+            radius,
+            _REDUCERS[reduce],
+            parallelism,
+            values,
+        )
+        return values
+
+    if batch_size is None:
+        batch_size = 4 * parallelism
+    if batch_size < 1:
+        raise ValueError("Batch size must be positive")
+
+    # fail early, rather than on the first iteration
+    backend.jgrapht_spgraph_check(spgraph.handle, source_ids, algorithm_id)
+    return _multi_source_rows(
+        graph,
+        spgraph,
+        sources,
+        source_ids,
+        algorithm_id,
+        delta,
+        radius,
+        parallelism,
+        batch_size,
+    )
+
+
+def _multi_source_rows(
+    graph,
+    spgraph,
+    sources,
+    source_ids,
+    algorithm_id,
+    delta,
+    radius,
+    parallelism,
+    batch_size,
+):
+    n = spgraph.size
+    anyhashable = _is_anyhashable_graph(graph)
+    no_targets = _new_int_array(0)
+
+    for start in range(0, len(sources), batch_size):
+        batch = source_ids[start : start + batch_size]
+        rows = _new_double_array(len(batch) * n)
+        backend.jgrapht_spgraph_multi_source(
+            spgraph.handle,
+            batch,
+            no_targets,
+            algorithm_id,
+            delta,
+            radius,
+            0,
+            parallelism,
+            rows,
+        )
+        for i in range(len(batch)):
+            row = rows[i * n : (i + 1) * n]
+            if anyhashable:
+                row = {v: row[vid] for vid, v in graph._vertex_id_to_hash.items()}
+            yield sources[start + i], row
+
+
+def _allpairs_distances(graph, out, dtype, rows, algorithm, block_size, parallelism):
+    algorithm_id = _algorithm_id(algorithm)
+    try:
+        typecode = _DTYPES[dtype]
+    except KeyError:
+        raise ValueError(
+            "Unknown dtype {!r}, must be one of {}".format(dtype, ", ".join(_DTYPES))
+        )
+
+    vertices = list(graph.vertices)
+    n = len(vertices)
+    start, stop = rows if rows is not None else (0, n)
+    if not 0 <= start <= stop <= n:
+        raise ValueError("Invalid row range")
+    if block_size is None:
+        block_size = 4 * parallelism
+    if block_size < 1:
+        raise ValueError("Block size must be positive")
+
+    vertex_ids = _as_int_buffer([_vertex_anyhashableg_to_g(graph, v) for v in vertices])
+    spgraph = _JGraphTShortestPathGraph(graph)
+    size = n * n * array(typecode).itemsize
+
+    def fill(view):
+        with view.cast("B") as raw, raw.cast(typecode) as matrix:
+            for begin in range(start, stop, block_size):
+                end = min(begin + block_size, stop)
+                block = matrix[begin * n : end * n]
+                if typecode == "f":
+                    backend.jgrapht_spgraph_distance_matrix_float(
+                        spgraph.handle,
+                        vertex_ids[begin:end],
+                        vertex_ids,
+                        algorithm_id,
+                        parallelism,
+                        block,
+                    )
+                else:
+                    backend.jgrapht_spgraph_distance_matrix(
+                        spgraph.handle,
+                        vertex_ids[begin:end],
+                        vertex_ids,
+                        algorithm_id,
+                        parallelism,
+                        block,
+                        _new_int_array(0),
+                    )
+                block.release()
+
+    if not isinstance(out, (str, bytes, os.PathLike)):
+        with memoryview(out) as view:
+            if view.nbytes != size:
+                raise ValueError("Output buffer does not match the matrix")
+            fill(view)
+        return vertices
+
+    header = _MATRIX_HEADER.pack(_MATRIX_MAGIC, n, dtype.encode("ascii"))
+    total = len(header) + size
+
+    # never truncate, other processes may be filling other rows of the same file
+    fd = os.open(out, os.O_RDWR | os.O_CREAT, 0o666)
+    with open(fd, "r+b") as f:
+        current = f.seek(0, os.SEEK_END)
+        if current == 0:
+            f.write(header)
+            f.truncate(total)
+        else:
+            f.seek(0)
+            if current != total or f.read(len(header)) != header:
+                raise ValueError("File does not match the matrix")
+        with mmap.mmap(f.fileno(), total) as mapped:
+            with memoryview(mapped) as view, view[len(header) :] as matrix:
+                fill(matrix)
+            mapped.flush()
+
+    return vertices
@@ -2,6 +2,18 @@ from .. import backend
 from ..types import GraphType, GraphEvent, ListenableGraph
 from ._graphs import _JGraphTGraph
 from ._callbacks import _create_wrapped_callback
+from ._wrappers import _NativeResource
+from ._arrays import (
+    _INT_TYPECODE,
+    _as_int_buffer,
+    _as_double_buffer,
+    _as_byte_buffer,
+    _new_int_array,
+    _new_double_array,
+)
+
+from array import array
+from collections.abc import Mapping, Set
 
 import ctypes
 import copy
@@ -107,8 +119,56 @@ class _EdgeReversedGraphView(_JGraphTGraph):
         return "_EdgeReversedGraphView(%r)" % self._handle
 
 
+_VERTEX_MASK = 0
+_EDGE_MASK = 1
+
+
+class _JGraphTMask(_NativeResource):
+    """Vertex and edge bitmasks, evaluated by the backend without calling into Python.
+
+    Each mask occupies one of a fixed number of slots of the backend. The masks may be
+    updated while algorithms run on the view in other threads, which then observe
+    either the old or the new value of each flag.
+    """
+
+    _slot = None
+
+    def __init__(self):
+        self._slot = backend.jgrapht_mask_create()
+        self._own()
+        self.vertex_mask_fptr, self.edge_mask_fptr = backend.jgrapht_mask_get_callbacks(
+            self._slot
+        )
+
+    def assign(self, kind, mask):
+        """Replace a mask. The mask is either a set of identifiers to mask, or an
+        array of flags indexed by the identifiers.
+        """
+        if isinstance(mask, Set):
+            backend.jgrapht_mask_clear(self._slot, kind)
+            self.update(kind, mask, True)
+        else:
+            backend.jgrapht_mask_assign(self._slot, kind, _as_byte_buffer(mask))
+
+    def update(self, kind, ids, masked):
+        backend.jgrapht_mask_set(self._slot, kind, _as_int_buffer(ids), masked)
+
+    def test(self, kind, id):
+        return bool(backend.jgrapht_mask_test(self._slot, kind, id))
+
+    def _destroy(self):
+        slot, self._slot = self._slot, None
+        backend.jgrapht_mask_destroy(slot)
+
+
 class _MaskedSubgraphView(_JGraphTGraph):
-    def __init__(self, graph, vertex_mask_cb, edge_mask_cb):
+    def __init__(
+        self, graph, vertex_mask_cb, edge_mask_cb, vertex_mask=None, edge_mask=None
+    ):
+        if vertex_mask_cb is not None and vertex_mask is not None:
+            raise ValueError("Cannot use both a vertex mask callback and a vertex mask")
+        if edge_mask_cb is not None and edge_mask is not None:
+            raise ValueError("Cannot use both an edge mask callback and an edge mask")
 
         # Create callbacks and keep a reference
         self._vertex_mask_cb_fptr, self._vertex_mask_cb = _create_wrapped_callback(
@@ -117,6 +177,21 @@ class _MaskedSubgraphView(_JGraphTGraph):
         self._edge_mask_cb_fptr, self._edge_mask_cb = _create_wrapped_callback(
             edge_mask_cb, ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_int)
         )
+
+        # Masks given as data are kept as bitmasks, which can be updated in place.
+        # Sides without a callback or data are not masked at all.
+        self._mask = None
+        if vertex_mask is not None or edge_mask is not None:
+            self._mask = _JGraphTMask()
+            if vertex_mask_cb is None:
+                self._vertex_mask_cb_fptr = self._mask.vertex_mask_fptr
+                if vertex_mask is not None:
+                    self._mask.assign(_VERTEX_MASK, vertex_mask)
+            if edge_mask_cb is None:
+                self._edge_mask_cb_fptr = self._mask.edge_mask_fptr
+                if edge_mask is not None:
+                    self._mask.assign(_EDGE_MASK, edge_mask)
+
         res = backend.jgrapht_graph_as_masked_subgraph(
             graph.handle, self._vertex_mask_cb_fptr, self._edge_mask_cb_fptr
         )
@@ -138,12 +213,80 @@ class _MaskedSubgraphView(_JGraphTGraph):
         """
         return self._type
 
+    def set_vertex_mask(self, mask):
+        """Replace the vertex mask.
+
+        :param mask: either a set of vertices to mask, or an array of flags indexed by 
+          the vertices where true means masked
+        """
+        self._get_mask(self._vertex_mask_cb).assign(_VERTEX_MASK, mask)
+
+    def set_edge_mask(self, mask):
+        """Replace the edge mask.
+
+        :param mask: either a set of edges to mask, or an array of flags indexed by 
+          the edges where true means masked
+        """
+        self._get_mask(self._edge_mask_cb).assign(_EDGE_MASK, mask)
+
+    def mask_vertices(self, vertices, masked=True):
+        """Mask (or unmask) vertices, without changing the rest of the vertex mask.
+
+        :param vertices: the vertices
+        :param masked: whether to mask or unmask the vertices
+        """
+        self._get_mask(self._vertex_mask_cb).update(_VERTEX_MASK, vertices, masked)
+
+    def mask_edges(self, edges, masked=True):
+        """Mask (or unmask) edges, without changing the rest of the edge mask.
+
+        :param edges: the edges
+        :param masked: whether to mask or unmask the edges
+        """
+        self._get_mask(self._edge_mask_cb).update(_EDGE_MASK, edges, masked)
+
+    def _is_vertex_masked(self, v):
+        if self._vertex_mask_cb is not None:
+            return bool(self._vertex_mask_cb(v))
+        if self._mask is None:
+            return False
+        return self._mask.test(_VERTEX_MASK, v)
+
+    def _is_edge_masked(self, e):
+        if self._edge_mask_cb is not None:
+            return bool(self._edge_mask_cb(e))
+        if self._mask is None:
+            return False
+        return self._mask.test(_EDGE_MASK, e)
+
+    def close(self):
+        super().close()
+        if self._mask is not None:
+            self._mask.close()
+
+    def _get_mask(self, cb):
+        if cb is not None:
+            raise ValueError("Mask is given by a callback and cannot be updated")
+        if self._mask is None:
+            raise ValueError(
+                "Masks can only be updated if given as data when creating the view"
+            )
+        return self._mask
+
     def __repr__(self):
         return "_MaskedSubgraphView(%r)" % self._handle
 
 
 class _WeightedView(_JGraphTGraph):
-    def __init__(self, graph, edge_weight_cb, cache_weights, write_weights_through):
+    def __init__(
+        self,
+        graph,
+        edge_weight_cb,
+        cache_weights,
+        write_weights_through,
+        edges=None,
+        weights=None,
+    ):
 
         # Create callbacks and keep a reference
         self._edge_weight_cb_fptr, self._edge_weight_cb = _create_wrapped_callback(
@@ -158,6 +301,11 @@ class _WeightedView(_JGraphTGraph):
 
         super().__init__(res)
 
+        if edges is not None:
+            # Fill the weight cache of the view using a single backend call, so
+            # that the backend never needs to call back into Python for them.
+            self.set_edge_weights(edges, weights)
+
         self._type = graph.type.as_weighted()
 
         # Keep a reference to avoid gargage collection. This is important since the
@@ -177,6 +325,26 @@ class _WeightedView(_JGraphTGraph):
         return "_WeightedView(%r)" % self._handle
 
 
+def _edge_weights_to_arrays(graph, weights):
+    """Convert explicit edge weights, either a mapping from edges to weights or an
+    array indexed by the edge identifiers, into arrays of edges and weights.
+    """
+    edges = _new_int_array(0)
+    values = _new_double_array(0)
+    if isinstance(weights, Mapping):
+        edges.extend(weights.keys())
+        values.extend(weights.values())
+        return edges, values
+
+    weights = _as_double_buffer(weights)
+    edges = iter(graph.edges).to_array()
+    try:
+        values.extend(map(weights.__getitem__, edges))
+        return edges, values
+    except IndexError:
+        raise ValueError("Weights array must contain an entry for each edge identifier")
+
+
 class _GraphUnion(_JGraphTGraph):
     def __init__(self, graph1, graph2, edge_weight_combiner_cb=None):
 
@@ -235,15 +403,25 @@ class _ListenableView(_JGraphTGraph, ListenableGraph):
 
         # register and make sure to keep the actual callback around to
         # avoid garbage collection
-        self._listeners[listener_id] = (listener_handle, cb)
+        self._listeners[listener_id] = (listener_handle, cb, listener_cb)
 
         return listener_id
 
     def remove_listener(self, listener_id):
-        listener_handle, cb = self._listeners.pop(listener_id)
+        listener_handle, cb, listener_cb = self._listeners.pop(listener_id)
 
         backend.jgrapht_listenable_remove_graph_listener(self.handle, listener_handle)
         backend.jgrapht_handles_destroy(listener_handle)
 
+    def set_edge_weights(self, edges, weights):
+        # Update the wrapped graph directly, so that the backend does not call
+        # back for every single edge, and notify the listeners once. Listeners
+        # get their own copy of the identifiers, as the caller may reuse them.
+        edges = _as_int_buffer(edges)
+        self._graph.set_edge_weights(edges, weights)
+        updated = array(_INT_TYPECODE, edges)
+        for _, _, listener_cb in list(self._listeners.values()):
+            listener_cb(updated, GraphEvent.EDGE_WEIGHTS_UPDATED)
+
     def __repr__(self):
         return "_ListenableView(%r)" % self._handle
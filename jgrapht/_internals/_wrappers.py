@@ -1,6 +1,175 @@
 from .. import backend
-from collections import namedtuple
+from abc import ABC, abstractmethod
+from collections import deque, namedtuple
 from collections.abc import Iterator
+from contextlib import contextmanager
+import os
+import threading
+import traceback
+import weakref
+
+from ._arrays import _new_int_array, _new_double_array
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Per thread stack of open handle scopes, and the number of open scopes in all
+# threads, which avoids looking up the stack when no scope is open.
+_scopes = threading.local()
+_open_scopes = 0
+_open_scopes_lock = threading.Lock()
+
+# Accounting of live handles by wrapper type and, when tracing is enabled,
+# of the allocation site of each live wrapper (keyed by id). Wrappers are
+# untracked by finalizers, which may run while the lock is held by the same
+# thread and must never block. Thus they only record the wrapper type in a
+# deque, which is drained under the lock.
+#
+# Accounting is only enabled once the diagnostics are used, so that it costs
+# nothing otherwise. Only wrappers created afterwards are accounted.
+_accounting = False
+_live_handles = {}
+_live_handles_lock = threading.Lock()
+_released = deque()
+_allocation_sites = {}
+_allocation_tracing_depth = 0
+
+
+def _drain_released():
+    # must be called with the lock held
+    while _released:
+        name = _released.popleft()
+        count = _live_handles.get(name, 0) - 1
+        if count > 0:
+            _live_handles[name] = count
+        else:
+            _live_handles.pop(name, None)
+
+
+def _enable_accounting():
+    global _accounting
+    _accounting = True
+
+
+def _track(wrapper):
+    name = type(wrapper).__name__
+    wrapper._tracked = True
+    with _live_handles_lock:
+        _drain_released()
+        _live_handles[name] = _live_handles.get(name, 0) + 1
+    if _allocation_tracing_depth:
+        # skip the frames inside the library
+        stack = traceback.extract_stack()
+        while len(stack) > 1 and stack[-1].filename.startswith(_PACKAGE_DIR):
+            stack.pop()
+        _allocation_sites[id(wrapper)] = (
+            name,
+            tuple(stack[-_allocation_tracing_depth:]),
+        )
+
+
+def _untrack(wrapper):
+    if not wrapper._tracked:
+        return
+    wrapper._tracked = False
+    _released.append(type(wrapper).__name__)
+    if _allocation_sites:
+        _allocation_sites.pop(id(wrapper), None)
+
+
+def _get_live_handles():
+    with _live_handles_lock:
+        _drain_released()
+        return dict(_live_handles)
+
+
+def _set_allocation_tracing(depth):
+    global _allocation_tracing_depth
+    if depth:
+        _enable_accounting()
+    _allocation_tracing_depth = depth
+    if not depth:
+        _allocation_sites.clear()
+
+
+def _get_allocation_sites():
+    sites = {}
+    for name, stack in list(_allocation_sites.values()):
+        key = (name, tuple((f.filename, f.lineno, f.name) for f in stack))
+        if key in sites:
+            sites[key][0] += 1
+        else:
+            sites[key] = [1, name, list(stack)]
+    result = [tuple(site) for site in sites.values()]
+    result.sort(key=lambda x: -x[0])
+    return result
+
+
+class _HandleScope:
+    """A scope which owns all handles created inside it, by the same thread.
+
+    On exit all handles which are still alive are destroyed using a single
+    call into the backend. Handles whose wrappers are garbage collected while
+    the scope is open are also collected and released together on exit.
+    """
+
+    def __init__(self):
+        self._open = True
+        self._wrappers = []
+        self._pending = []
+
+    def _register(self, wrapper):
+        self._wrappers.append(weakref.ref(wrapper))
+        wrapper._scope = self
+
+    def _close(self):
+        self._open = False
+        handles = self._pending
+        resources = []
+        for ref in self._wrappers:
+            wrapper = ref()
+            if wrapper is None:
+                continue
+            if isinstance(wrapper, _NativeResource):
+                resources.append(wrapper)
+            elif wrapper._handle is not None:
+                handles.append(wrapper._handle)
+                wrapper._handle = None
+                wrapper._scope = None
+                _untrack(wrapper)
+        self._wrappers = []
+        self._pending = []
+        if handles and backend.jgrapht_isolate_is_attached():
+            backend.jgrapht_handles_destroy_all(handles)
+        # after the handles, which may still refer to them
+        for resource in resources:
+            resource.close()
+
+
+def _current_scope():
+    if not _open_scopes:
+        return None
+    stack = getattr(_scopes, "stack", None)
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def _handle_scope():
+    global _open_scopes
+    stack = getattr(_scopes, "stack", None)
+    if stack is None:
+        stack = _scopes.stack = []
+    scope = _HandleScope()
+    with _open_scopes_lock:
+        _open_scopes += 1
+    stack.append(scope)
+    try:
+        yield scope
+    finally:
+        stack.remove(scope)
+        with _open_scopes_lock:
+            _open_scopes -= 1
+        scope._close()
 
 
 class _HandleWrapper:
@@ -8,22 +177,88 @@ class _HandleWrapper:
        on deletion.
     """
 
+    _handle = None
+    _scope = None
+    _tracked = False
+
     def __init__(self, handle, **kwargs):
         self._handle = handle
+        if _accounting:
+            _track(self)
+        scope = _current_scope()
+        if scope is not None:
+            scope._register(self)
         super().__init__()
 
     @property
     def handle(self):
         return self._handle
 
+    def close(self):
+        """Release the backend object. The wrapper cannot be used afterwards."""
+        handle = self._handle
+        if handle is not None:
+            self._handle = None
+            self._scope = None
+            _untrack(self)
+            if backend.jgrapht_isolate_is_attached():
+                backend.jgrapht_handles_destroy(handle)
+
     def __del__(self):
-        if backend.jgrapht_isolate_is_attached():
-            backend.jgrapht_handles_destroy(self._handle)
+        handle = self._handle
+        if handle is None:
+            return
+        self._handle = None
+        _untrack(self)
+        scope = self._scope
+        if scope is not None and scope._open:
+            scope._pending.append(handle)
+        elif backend.jgrapht_isolate_is_attached():
+            backend.jgrapht_handles_destroy(handle)
 
     def __repr__(self):
         return "_HandleWrapper(%r)" % self._handle
 
 
+class _NativeResource(ABC):
+    """An object kept on this side of the backend, such as a native snapshot of a
+    graph or one of the slots used by masks and heuristics.
+
+    Such objects are released by their own destroy function instead of as handles,
+    but they are accounted and owned by handle scopes just like handle wrappers.
+    Subclasses call :py:meth:`_own` once allocated and implement :py:meth:`_destroy`.
+    """
+
+    _live = False
+    _scope = None
+    _tracked = False
+
+    def _own(self):
+        self._live = True
+        if _accounting:
+            _track(self)
+        scope = _current_scope()
+        if scope is not None:
+            scope._register(self)
+
+    @abstractmethod
+    def _destroy(self):
+        """Release the backend object."""
+        pass
+
+    def close(self):
+        """Release the backend object. The object cannot be used afterwards."""
+        if self._live:
+            self._live = False
+            self._scope = None
+            _untrack(self)
+            if backend.jgrapht_isolate_is_attached():
+                self._destroy()
+
+    def __del__(self):
+        self.close()
+
+
 class _JGraphTString(_HandleWrapper):
     """A JGraphT string.
     
@@ -42,55 +277,185 @@ class _JGraphTString(_HandleWrapper):
         return "_JGraphTString(%r)" % self._handle
 
 
-class _JGraphTIntegerIterator(_HandleWrapper, Iterator):
-    """Integer values iterator"""
+class _JGraphTChunkedIterator(_HandleWrapper, Iterator):
+    """Base class for iterators over primitive values.
+
+    Values are read from the backend in chunks which are then served from a
+    local buffer. This avoids crossing the backend boundary for each element.
+    Chunks start small, so that short iterations stay cheap, and grow up to a
+    maximum size.
+    """
+
+    _MIN_CHUNK_SIZE = 64
+    _MAX_CHUNK_SIZE = 8192
 
     def __init__(self, handle, **kwargs):
         super().__init__(handle=handle, **kwargs)
+        self._chunk = None
+        self._count = 0
+        self._pos = 0
+        self._exhausted = False
 
     def __next__(self):
-        res = backend.jgrapht_it_hasnext(self._handle)
-        if not res:
-            raise StopIteration()
-        return backend.jgrapht_it_next_int(self._handle)
+        if self._pos == self._count:
+            self._fill()
+            if self._count == 0:
+                raise StopIteration()
+        value = self._value_at(self._pos)
+        self._pos += 1
+        return value
+
+    def to_array(self):
+        """Consume the rest of the iterator.
+
+        :returns: the remaining values as an :py:class:`array.array`
+        """
+        return self._drain()
+
+    def tolist(self):
+        """Consume the rest of the iterator.
+
+        :returns: the remaining values as a list
+        """
+        return self._drain().tolist()
+
+    def _fill(self):
+        self._pos = 0
+        self._count = 0
+        if self._exhausted:
+            return
+        if self._chunk is None:
+            self._chunk = self._new_chunk(self._MIN_CHUNK_SIZE)
+        elif self._chunk_size() < self._MAX_CHUNK_SIZE:
+            self._chunk = self._new_chunk(
+                min(2 * self._chunk_size(), self._MAX_CHUNK_SIZE)
+            )
+        self._count = self._read_chunk(self._chunk)
+        if self._count < self._chunk_size():
+            self._exhausted = True
+
+    def _drain(self):
+        """Read all remaining values, including any buffered ones, using as
+        few backend calls as possible.
+        """
+        if self._chunk is None:
+            res = self._new_chunk(0)
+        else:
+            res = self._slice(self._chunk, self._pos, self._count)
+        self._pos = self._count
+        size = max(self._MIN_CHUNK_SIZE, 2 * self._count)
+        while not self._exhausted:
+            chunk = self._new_chunk(size)
+            count = self._read_chunk(chunk)
+            if count < size:
+                self._exhausted = True
+            res = self._extend(res, chunk, count)
+            size *= 2
+        return res
+
+    def _chunk_size(self):
+        return len(self._chunk)
+
+    def _value_at(self, pos):
+        return self._chunk[pos]
+
+    def _slice(self, chunk, start, end):
+        return chunk[start:end]
+
+    def _extend(self, res, chunk, count):
+        if count < len(chunk):
+            del chunk[count:]
+        res.extend(chunk)
+        return res
+
+
+class _JGraphTIntegerIterator(_JGraphTChunkedIterator):
+    """Integer values iterator"""
+
+    def __init__(self, handle, **kwargs):
+        super().__init__(handle=handle, **kwargs)
+
+    def _new_chunk(self, size):
+        return _new_int_array(size)
+
+    def _read_chunk(self, chunk):
+        return backend.jgrapht_it_next_int_chunk(self._handle, chunk)
 
     def __repr__(self):
         return "_JGraphTIntegerIterator(%r)" % self._handle
 
 
-class _JGraphTDoubleIterator(_HandleWrapper, Iterator):
+class _JGraphTDoubleIterator(_JGraphTChunkedIterator):
     """Double values iterator"""
 
     def __init__(self, handle, **kwargs):
         super().__init__(handle=handle, **kwargs)
 
-    def __next__(self):
-        res = backend.jgrapht_it_hasnext(self._handle)
-        if not res:
-            raise StopIteration()
-        return backend.jgrapht_it_next_double(self._handle)
+    def _new_chunk(self, size):
+        return _new_double_array(size)
+
+    def _read_chunk(self, chunk):
+        return backend.jgrapht_it_next_double_chunk(self._handle, chunk)
 
     def __repr__(self):
         return "_JGraphTDoubleIterator(%r)" % self._handle
 
 
-class _JGraphTEdgeTripleIterator(_HandleWrapper, Iterator):
+_EdgeTriple = namedtuple("Edge", ["source", "target", "weight"])
+
+
+class _JGraphTEdgeTripleIterator(_JGraphTChunkedIterator):
     """An edge triple iterator"""
 
     def __init__(self, handle, **kwargs):
         super().__init__(handle=handle, **kwargs)
-        self._edge_triple_class = namedtuple("Edge", ["source", "target", "weight"])
-
-    def __next__(self):
-        res = backend.jgrapht_it_hasnext(self._handle)
-        if not res:
-            raise StopIteration()
-
-        # read edge triple
-        s, t, w = backend.jgrapht_it_next_edge_triple(self._handle)
-
-        # return a named tuple
-        return self._edge_triple_class(source=s, target=t, weight=w)
+        self._edge_triple_class = _EdgeTriple
+
+    def to_array(self):
+        """Consume the rest of the iterator.
+
+        :returns: a tuple (sources, targets, weights) of :py:class:`array.array`
+        """
+        return super().to_array()
+
+    def tolist(self):
+        """Consume the rest of the iterator.
+
+        :returns: the remaining edge triples as a list
+        """
+        sources, targets, weights = self._drain()
+        return [
+            self._edge_triple_class(source=s, target=t, weight=w)
+            for s, t, w in zip(sources, targets, weights)
+        ]
+
+    def _new_chunk(self, size):
+        return _new_int_array(size), _new_int_array(size), _new_double_array(size)
+
+    def _chunk_size(self):
+        return len(self._chunk[0])
+
+    def _read_chunk(self, chunk):
+        sources, targets, weights = chunk
+        return backend.jgrapht_it_next_edge_triple_chunk(
+            self._handle, sources, targets, weights
+        )
+
+    def _value_at(self, pos):
+        sources, targets, weights = self._chunk
+        return self._edge_triple_class(
+            source=sources[pos], target=targets[pos], weight=weights[pos]
+        )
+
+    def _slice(self, chunk, start, end):
+        return tuple(a[start:end] for a in chunk)
+
+    def _extend(self, res, chunk, count):
+        for a, b in zip(res, chunk):
+            if count < len(b):
+                del b[count:]
+            a.extend(b)
+        return res
 
     def __repr__(self):
         return "_JGraphTEdgeTripleIterator(%r)" % self._handle
@@ -101,7 +466,7 @@ class _JGraphTEdgeStrTripleIterator(_HandleWrapper, Iterator):
 
     def __init__(self, handle, **kwargs):
         super().__init__(handle=handle, **kwargs)
-        self._edge_triple_class = namedtuple("Edge", ["source", "target", "weight"])
+        self._edge_triple_class = _EdgeTriple
 
     def __next__(self):
         res = backend.jgrapht_it_hasnext(self._handle)
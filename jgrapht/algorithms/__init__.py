@@ -1,20 +1,56 @@
-from . import (
-    cliques,
-    clustering,
-    coloring,
-    connectivity,
-    cuts,
-    cycles,
-    drawing,
-    flow,
-    independent,
-    isomorphism,
-    matching,
-    partition,
-    planar,
-    scoring,
-    shortestpaths,
-    spanning,
-    tour,
-    vertexcover,
+import importlib
+import sys
+
+# Submodules are imported on first access.
+_SUBMODULES = (
+    "cliques",
+    "clustering",
+    "coloring",
+    "connectivity",
+    "cuts",
+    "cycles",
+    "drawing",
+    "flow",
+    "independent",
+    "isomorphism",
+    "matching",
+    "partition",
+    "planar",
+    "scoring",
+    "shortestpaths",
+    "spanning",
+    "tour",
+    "vertexcover",
 )
+
+if sys.version_info < (3, 7):
+    # no support for module level __getattr__
+    from . import (
+        cliques,
+        clustering,
+        coloring,
+        connectivity,
+        cuts,
+        cycles,
+        drawing,
+        flow,
+        independent,
+        isomorphism,
+        matching,
+        partition,
+        planar,
+        scoring,
+        shortestpaths,
+        spanning,
+        tour,
+        vertexcover,
+    )
+else:
+
+    def __getattr__(name):
+        if name in _SUBMODULES:
+            return importlib.import_module("." + name, __name__)
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | set(_SUBMODULES))
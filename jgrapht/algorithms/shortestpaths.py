@@ -184,6 +184,9 @@ def johnson_allpairs(graph):
 
     Running time :math:`\mathcal{O}(n m + n^2 \log n)`.
 
+    All paths are kept in memory. For large graphs where only the distances are needed,
+    see :py:meth:`allpairs_distances`.
+
     :param graph: the input graph
     :returns: all-pairs shortest paths as an instance of :py:class:`.AllPairsPaths`
     """
@@ -202,52 +205,124 @@ def floyd_warshall_allpairs(graph):
     return _sp_allpairs_alg("floydwarshall_get_allpairs", graph)
 
 
-def a_star(graph, source_vertex, target_vertex, heuristic_cb, use_bidirectional=False):
+def coordinate_heuristic(graph, coordinates, metric="euclidean", scale=1.0):
+    """Create a heuristic for the A* algorithm from per-vertex coordinates.
+
+    The heuristic is evaluated entirely by the backend, without calling into Python
+    for every expanded vertex. Coordinates can be given as a mapping from vertices to
+    (x, y) pairs, as a two-dimensional array with one row per vertex or as a pair of
+    arrays (xs, ys), indexed by the vertices. For any-hashable graphs only mappings
+    are supported.
+
+    Supported metrics are `euclidean`, `manhattan` and `haversine`. For the haversine
+    metric the coordinates are (longitude, latitude) in degrees and distances are
+    in meters. All distances are multiplied by `scale`, which can be used to convert
+    to the units of the edge weights. The heuristic is admissible only if the scaled
+    distance never exceeds the weight of the shortest path. Vertices without
+    coordinates are estimated with zero.
+
+    The returned heuristic can be reused across queries on the same graph::
+
+        h = sp.coordinate_heuristic(g, coordinates, metric="haversine")
+        path = sp.a_star(g, source, target, heuristic_cb=h)
+
+    Native heuristics, including ALT indices, occupy one of a limited number (256) of
+    slots of the backend until they are closed, using their `close` method or a
+    :py:meth:`jgrapht.handle_scope`, or garbage collected.
+
+    :param graph: the graph
+    :param coordinates: the coordinates of the vertices
+    :param metric: the metric, one of `euclidean`, `manhattan` or `haversine`
+    :param scale: a non-negative factor to multiply all distances
+    :returns: a heuristic to be used with :py:meth:`a_star`
+    """
+    from .._internals._heuristics import _JGraphTCoordinateHeuristic
+
+    return _JGraphTCoordinateHeuristic(graph, coordinates, metric=metric, scale=scale)
+
+
+def a_star(
+    graph,
+    source_vertex,
+    target_vertex,
+    heuristic_cb=None,
+    use_bidirectional=False,
+    coordinates=None,
+    metric="euclidean",
+):
     """The A* algorithm.
 
+    The heuristic is either a Python callback, or a heuristic over per-vertex coordinates
+    evaluated by the backend. The latter can be created using :py:meth:`coordinate_heuristic`
+    or implicitly by passing the `coordinates` and the `metric`::
+
+        path = sp.a_star(g, source, target, coordinates=coordinates, metric="manhattan")
+
     :param graph: the graph
     :param source_vertex: the source vertex
     :param target_vertex: the target vertex.
     :param heuristic_cb: the heuristic callback. Must be a function which accepts two long parameters
-      (source and target) and returns a double
+      (source and target) and returns a double, or a heuristic returned by
+      :py:meth:`coordinate_heuristic` or :py:meth:`alt_index`
     :param use_bidirectional: use a bidirectional search
+    :param coordinates: the coordinates of the vertices, used instead of the heuristic callback.
+      See :py:meth:`coordinate_heuristic` for the supported formats
+    :param metric: the metric used with the coordinates, one of `euclidean`, `manhattan`
+      or `haversine`
     :returns: a :py:class:`.GraphPath`
     """
+    from .._internals._heuristics import (
+        _JGraphTNativeHeuristic,
+        _JGraphTCoordinateHeuristic,
+        _JGraphTALTIndex,
+    )
 
-    if _is_anyhashable_graph(graph):
-        # redefine in order to translate from integer to user vertices
-        def actual_heuristic_cb(s, t):
-            return heuristic_cb(
-                _vertex_g_to_attrsg(graph, s), _vertex_g_to_attrsg(graph, t)
-            )
-
+    if coordinates is not None:
+        if heuristic_cb is not None:
+            raise ValueError("Cannot use both a heuristic callback and coordinates")
+        heuristic_cb = _JGraphTCoordinateHeuristic(graph, coordinates, metric=metric)
+    elif heuristic_cb is None:
+        raise ValueError("Either a heuristic callback or coordinates must be provided")
+
+    if isinstance(heuristic_cb, _JGraphTALTIndex) and heuristic_cb.graph is not graph:
+        raise ValueError("ALT index was computed for another graph")
+
+    if isinstance(heuristic_cb, _JGraphTNativeHeuristic):
+        if heuristic_cb.closed:
+            raise ValueError("Heuristic has been closed")
+        # evaluated by the backend, the reference keeps it alive during the call
+        heuristic_f = heuristic_cb
+        heuristic_f_ptr = heuristic_cb.fptr
     else:
-        actual_heuristic_cb = heuristic_cb
+        if _is_anyhashable_graph(graph):
+            # redefine in order to translate from integer to user vertices
+            def actual_heuristic_cb(s, t):
+                return heuristic_cb(
+                    _vertex_g_to_attrsg(graph, s), _vertex_g_to_attrsg(graph, t)
+                )
 
-    heuristic_f_type = ctypes.CFUNCTYPE(
-        ctypes.c_double, ctypes.c_longlong, ctypes.c_longlong
-    )
-    heuristic_f = heuristic_f_type(actual_heuristic_cb)
-    heuristic_f_ptr = ctypes.cast(heuristic_f, ctypes.c_void_p).value
+        else:
+            actual_heuristic_cb = heuristic_cb
+
+        heuristic_f_type = ctypes.CFUNCTYPE(
+            ctypes.c_double, ctypes.c_longlong, ctypes.c_longlong
+        )
+        heuristic_f = heuristic_f_type(actual_heuristic_cb)
+        heuristic_f_ptr = ctypes.cast(heuristic_f, ctypes.c_void_p).value
 
     custom = [heuristic_f_ptr]
 
     if use_bidirectional:
-        return _sp_between_alg(
-            "bidirectional_astar_get_path_between_vertices",
-            graph,
-            source_vertex,
-            target_vertex,
-            *custom
-        )
+        name = "bidirectional_astar_get_path_between_vertices"
     else:
-        return _sp_between_alg(
-            "astar_get_path_between_vertices",
-            graph,
-            source_vertex,
-            target_vertex,
-            *custom
-        )
+        name = "astar_get_path_between_vertices"
+
+    try:
+        return _sp_between_alg(name, graph, source_vertex, target_vertex, *custom)
+    finally:
+        if coordinates is not None:
+            # release the slot of the temporary heuristic right away
+            heuristic_cb.close()
 
 
 def a_star_with_alt_heuristic(
@@ -285,10 +360,21 @@ def a_star_with_alt_heuristic(
     :param graph: the graph
     :param source_vertex: the source vertex
     :param target_vertex: the target vertex.
-    :param landmarks: set of graph vertices to use for landmarks
+    :param landmarks: set of graph vertices to use for landmarks, or an index computed
+      by :py:meth:`alt_index` in which case no pre-processing takes place
     :param use_bidirectional: use a bidirectional search
     :returns: a :py:class:`.GraphPath`
     """
+    from .._internals._heuristics import _JGraphTALTIndex
+
+    if isinstance(landmarks, _JGraphTALTIndex):
+        return a_star(
+            graph,
+            source_vertex,
+            target_vertex,
+            heuristic_cb=landmarks,
+            use_bidirectional=use_bidirectional,
+        )
 
     landmarks_set = _JGraphTIntegerMutableSet(linked=True)
     if _is_anyhashable_graph(graph):
@@ -318,6 +404,360 @@ def a_star_with_alt_heuristic(
         )
 
 
+def alt_index(graph, landmarks=None, num_landmarks=16, selection="farthest", seed=None):
+    r"""Compute a reusable index for the A* algorithm with the ALT admissible heuristic.
+
+    The pre-processing of the ALT heuristic (see :py:meth:`a_star_with_alt_heuristic`)
+    requires two shortest path computations per landmark. This function performs it once,
+    natively in the backend, and returns an index which can serve any number of queries
+    on the same graph, as long as the graph is not modified::
+
+        index = sp.alt_index(g, num_landmarks=16)
+        path = index.get_path(source, target)
+
+    The index can also be passed as the heuristic of :py:meth:`a_star`, saved to a file
+    using its `save` method and loaded again using :py:meth:`load_alt_index`. Its space
+    requirement is :math:`\mathcal{O}(n)` per landmark, or twice as much for directed
+    graphs, and is reported by its `memory_usage` property in bytes. The index is a
+    native heuristic, see :py:meth:`coordinate_heuristic` on releasing it.
+
+    Landmarks are either given explicitly or selected automatically. The `farthest`
+    selection starts from a random vertex and repeatedly picks the vertex with the largest
+    distance to its closest landmark, while the `random` selection picks vertices uniformly
+    at random. Edge weights must be non-negative.
+
+    :param graph: the graph
+    :param landmarks: the vertices to use as landmarks. If not given, they are selected
+      automatically
+    :param num_landmarks: the number of landmarks to select automatically
+    :param selection: the landmark selection strategy, either `farthest` or `random`
+    :param seed: seed for the random number generator. If None then the system time is used
+    :returns: an index as an instance of :py:class:`.ALTIndex`
+    """
+    from .._internals._heuristics import _compute_alt_index
+
+    return _compute_alt_index(
+        graph,
+        landmarks=landmarks,
+        num_landmarks=num_landmarks,
+        selection=selection,
+        seed=seed,
+    )
+
+
+def load_alt_index(graph, filename):
+    """Load an index for the A* algorithm with the ALT admissible heuristic.
+
+    The index must have been computed using :py:meth:`alt_index` on the same graph
+    and saved using its `save` method.
+
+    :param graph: the graph
+    :param filename: the filename
+    :returns: an index as an instance of :py:class:`.ALTIndex`
+    :raises ValueError: if the file is not a valid index for the graph
+    """
+    from .._internals._heuristics import _load_alt_index
+
+    return _load_alt_index(graph, filename)
+
+
+def contraction_hierarchy(graph):
+    r"""Compute a contraction hierarchy for fast point-to-point shortest path queries.
+
+    The pre-processing contracts the vertices one by one, in an order driven by the
+    number of shortcuts each contraction requires, and adds shortcut edges which preserve
+    the shortest path distances among the remaining vertices. Queries then run a
+    bidirectional Dijkstra which only follows edges towards higher ranked vertices and
+    settles a small fraction of the graph. Shortcuts are unpacked, so the returned paths
+    contain the actual edges of the graph. Switching from a plain query is a one-line
+    change::
+
+        ch = sp.contraction_hierarchy(g)
+        path = ch.get_path(source, target)
+
+    Both the pre-processing and the queries are performed natively in the backend, on a
+    snapshot of the graph. The hierarchy can be saved to a file using its `save` method
+    and loaded again using :py:meth:`load_contraction_hierarchy`. Its space requirement
+    is reported by its `memory_usage` property in bytes. Edge weights must be non-negative.
+
+    :param graph: the graph
+    :returns: a hierarchy as an instance of :py:class:`.ContractionHierarchy`
+    """
+    from .._internals._contraction import _compute_contraction_hierarchy
+
+    return _compute_contraction_hierarchy(graph)
+
+
+def load_contraction_hierarchy(graph, filename):
+    """Load a contraction hierarchy.
+
+    The hierarchy must have been computed using :py:meth:`contraction_hierarchy` on
+    the same graph and saved using its `save` method.
+
+    :param graph: the graph
+    :param filename: the filename
+    :returns: a hierarchy as an instance of :py:class:`.ContractionHierarchy`
+    :raises ValueError: if the file is not a valid hierarchy for the graph
+    """
+    from .._internals._contraction import _load_contraction_hierarchy
+
+    return _load_contraction_hierarchy(graph, filename)
+
+
+def distance_matrix(
+    graph,
+    sources=None,
+    targets=None,
+    algorithm="dijkstra",
+    predecessors=False,
+    parallelism=None,
+):
+    r"""Compute the shortest path distances from a set of sources to a set of targets.
+
+    One search is executed per source, natively in the backend and on a snapshot of
+    the graph, using multiple threads. No path objects are created. Each search stops
+    as soon as all targets have been reached, unless predecessors are requested.
+
+    The distances are returned as a dense row-major matrix with one row per source and
+    one column per target, where unreachable targets have distance infinity. The matrix
+    is a two-dimensional :py:class:`memoryview` of C doubles, which can be indexed as
+    `distances[i, j]`, converted using `tolist()` or wrapped as a NumPy array without
+    copying::
+
+        distances = sp.distance_matrix(g, sources, targets)
+        matrix = numpy.asarray(distances)
+
+    When predecessors are requested, a predecessor matrix is also returned with one row
+    per source and one column per vertex, containing the previous vertex on the shortest
+    path from the source or -1 if the vertex is the source itself or is unreachable.
+    For any-hashable graphs the predecessors of each source are returned instead as a
+    dictionary from vertices to their previous vertex.
+
+    Algorithms `dijkstra` and `delta` (sequential delta-stepping, see
+    :py:meth:`multi_source`) require non-negative edge weights, while `bfs` ignores
+    the weights and counts the edges of the paths.
+
+    :param graph: the graph
+    :param sources: the source vertices. If None all vertices are used
+    :param targets: the target vertices. If None all vertices are used
+    :param algorithm: the algorithm, one of `dijkstra`, `bfs` or `delta`
+    :param predecessors: whether to also compute the predecessors
+    :param parallelism: number of threads to use. If None then the number of
+      cpus is used
+    :returns: the distance matrix, or a tuple with the distance and predecessor matrices
+    :raises ValueError: if sources or targets are empty or contain invalid vertices
+    """
+    from .._internals._spgraphs import _distance_matrix
+
+    if parallelism is None:
+        parallelism = multiprocessing.cpu_count()
+
+    return _distance_matrix(
+        graph, sources, targets, algorithm, predecessors, parallelism
+    )
+
+
+def multi_source(
+    graph,
+    sources=None,
+    algorithm="dijkstra",
+    reduce=None,
+    targets=None,
+    radius=None,
+    delta=None,
+    parallelism=None,
+    batch_size=None,
+):
+    r"""Compute single-source shortest paths from many sources in parallel.
+
+    One search is executed per source, natively in the backend and on a snapshot of
+    the graph, using multiple threads. Searches never go further than the radius.
+
+    Without a reducer the results are streamed. The function returns an iterator of
+    tuples (source, distances), in the order of the sources, which are computed in
+    batches of `batch_size` sources. For graphs with integer vertices the distances
+    are an :py:class:`array.array` of C doubles indexed by vertex, with infinity for
+    unreachable vertices and NaN for identifiers which do not correspond to a vertex.
+    For any-hashable graphs they are a dictionary from vertices to distances.
+
+    With a reducer each search is reduced to a single value inside the backend and
+    the function returns an :py:class:`array.array` of C doubles with one value per
+    source, in the order of the sources. The reducer considers the targets, or all
+    vertices if not given, except the source itself:
+
+    * `sum` -- the sum of the distances to the reachable targets, e.g. for closeness
+    * `min` -- the distance to the closest target, which stops the search early
+    * `count` -- the number of targets within the radius, e.g. for accessibility
+
+    Algorithm `dijkstra` and `delta` (sequential delta-stepping with buckets of width
+    `delta`) require non-negative edge weights, while `bfs` ignores the weights and
+    counts the edges of the paths.
+
+    :param graph: the graph
+    :param sources: the source vertices. If None all vertices are used
+    :param algorithm: the algorithm, one of `dijkstra`, `bfs` or `delta`
+    :param reduce: the reducer, one of `sum`, `min` or `count`. If None the distances
+      are streamed
+    :param targets: the targets considered by the reducer. If None all vertices are used
+    :param radius: maximum distance of the searches. If None there is no limit
+    :param delta: the bucket width of the delta-stepping algorithm. If None it is
+      the maximum edge weight divided by the maximum degree
+    :param parallelism: number of threads to use. If None then the number of
+      cpus is used
+    :param batch_size: number of sources per batch when streaming. If None four
+      times the parallelism is used
+    :returns: an iterator of (source, distances) tuples, or the reduced values
+    :raises ValueError: if the sources contain invalid vertices
+    """
+    from .._internals._spgraphs import _multi_source
+
+    if parallelism is None:
+        parallelism = multiprocessing.cpu_count()
+
+    return _multi_source(
+        graph,
+        sources,
+        algorithm,
+        reduce,
+        targets,
+        radius,
+        delta,
+        parallelism,
+        batch_size,
+    )
+
+
+def allpairs_distances(
+    graph,
+    out,
+    dtype="float64",
+    rows=None,
+    algorithm="dijkstra",
+    block_size=None,
+    parallelism=None,
+):
+    r"""Compute all-pairs shortest path distances directly into a dense matrix.
+
+    Unlike :py:meth:`johnson_allpairs` and :py:meth:`floyd_warshall_allpairs`, which
+    keep all paths inside the backend, only distances are computed and they are written
+    block by block into their final storage. One search is executed per row, natively in
+    the backend and on a snapshot of the graph, using multiple threads.
+
+    The matrix has one row and one column per vertex, in the order of `graph.vertices`,
+    and is stored in row-major order with infinity for unreachable vertices. It is
+    written either into a file, which is memory-mapped, or into a writable C-contiguous
+    buffer with exactly :math:`n^2` items of the requested type. In a file the matrix
+    follows a header of 32 bytes, which records the number of vertices and the type.
+    A missing or empty file is created with its final size, while an existing file must
+    have been created for the same number of vertices and type. Files are never
+    truncated, so that a large matrix can be filled by several processes each computing
+    a different range of rows::
+
+        sp.allpairs_distances(g, "dist.bin", dtype="float32", rows=(0, 0))
+        # then, in parallel
+        sp.allpairs_distances(g, "dist.bin", dtype="float32", rows=(0, 25000))
+        sp.allpairs_distances(g, "dist.bin", dtype="float32", rows=(25000, 50000))
+        # finally
+        matrix = numpy.memmap(
+            "dist.bin", dtype="float32", mode="r", offset=32, shape=(n, n)
+        )
+
+    The first call with an empty range only creates the file, which avoids processes
+    seeing a partially created file. Rows outside the range are left untouched, which
+    also allows an interrupted computation to be resumed. A NumPy memory-mapped array
+    can also be passed directly as the output.
+
+    Algorithms `dijkstra` and `delta` require non-negative edge weights, while `bfs`
+    ignores the weights and counts the edges of the paths.
+
+    :param graph: the graph
+    :param out: a filename or a writable buffer
+    :param dtype: the type of the distances, either `float64` or `float32`
+    :param rows: a tuple (start, stop) with the range of rows to compute. If None all
+      rows are computed
+    :param algorithm: the algorithm, one of `dijkstra`, `bfs` or `delta`
+    :param block_size: number of rows computed per call into the backend. If None four
+      times the parallelism is used
+    :param parallelism: number of threads to use. If None then the number of
+      cpus is used
+    :returns: the list of vertices, in the order of the rows and columns
+    :raises ValueError: if the output does not match the matrix
+    """
+    from .._internals._spgraphs import _allpairs_distances
+
+    if parallelism is None:
+        parallelism = multiprocessing.cpu_count()
+
+    return _allpairs_distances(
+        graph, out, dtype, rows, algorithm, block_size, parallelism
+    )
+
+
+def query_cache(graph, max_entries=1024, max_total_length=None):
+    r"""Create a cache for repeated point-to-point shortest path queries.
+
+    The cache answers queries through its methods `dijkstra`, `a_star` and `bfs`,
+    which accept the same parameters as the corresponding functions of this module
+    but always require a target vertex. Computed paths are kept in least-recently-used
+    order, bounded by the number of paths and optionally by their total number of
+    edges, and repeated queries return the same path object::
+
+        lg = jgrapht.views.as_listenable(g)
+        cache = sp.query_cache(lg, max_entries=10000)
+        path = cache.dijkstra(source, target)
+        print(cache.hits, cache.misses)
+
+    The graph must be listenable, i.e. a view created by
+    :py:meth:`jgrapht.views.as_listenable` or an any-hashable graph. The cache
+    registers a listener and is cleared whenever vertices are removed or edges are
+    added or removed. Edge weight changes only discard the weighted paths, since
+    breadth-first search ignores the weights. Modifications which bypass the
+    listenable view, e.g. on the underlying graph, are not observed.
+
+    :param graph: a listenable graph
+    :param max_entries: maximum number of cached paths
+    :param max_total_length: maximum total number of edges of the cached paths. If
+      None there is no limit
+    :returns: a cache as an instance of :py:class:`.ShortestPathCache`
+    :raises ValueError: if the graph is not listenable or the limits are invalid
+    """
+    from .._internals._querycache import _JGraphTShortestPathCache
+
+    return _JGraphTShortestPathCache(graph, max_entries, max_total_length)
+
+
+def dynamic_dijkstra(graph, source_vertex):
+    r"""Compute single-source shortest paths which follow the changes of the graph.
+
+    The shortest path tree is computed once using Dijkstra's algorithm and is then
+    repaired incrementally by a listener on the graph, whenever edges are added or
+    removed or edge weights change. A decrease only propagates the improved distances,
+    while an increase or removal of a tree edge only recomputes the subtree below it.
+    The cost of an update is thus proportional to the affected region and its incident
+    edges, rather than to the whole graph::
+
+        lg = jgrapht.views.as_listenable(g)
+        tree = sp.dynamic_dijkstra(lg, source)
+        lg.set_edge_weight(e, math.inf)
+        distance = tree.distance_to(target)
+
+    The graph must be listenable, i.e. a view created by
+    :py:meth:`jgrapht.views.as_listenable` or an any-hashable graph, and is followed
+    until the returned object is garbage collected or its `close()` method is called.
+    The tree and a copy of the edges are kept in Python, hence memory usage is higher
+    than with :py:meth:`dijkstra`. Edge weights must be non-negative; once a negative
+    weight is set the paths can no longer be queried.
+
+    :param graph: a listenable graph
+    :param source_vertex: the source vertex
+    :returns: a shortest path tree as an instance of :py:class:`.SingleSourcePaths`
+    :raises ValueError: if the graph is not listenable or has negative edge weights
+    """
+    from .._internals._dynamicpaths import _JGraphTDynamicSingleSourcePaths
+
+    return _JGraphTDynamicSingleSourcePaths(graph, source_vertex)
+
+
 def yen_k_loopless(graph, source_vertex, target_vertex, k):
     r"""Yen's algorithm for k loopless shortest paths. 
 
@@ -1,48 +1,371 @@
 #include <stdlib.h>
 #include <stdio.h>
+#include <string.h>
+#include <stdint.h>
+#include <math.h>
+
+#if defined(_WIN32)
+#include <windows.h>
+#else
+#include <pthread.h>
+#endif
 
 #include <jgrapht_capi_types.h>
 #include <jgrapht_capi.h>
 
+#ifndef M_PI
+#define M_PI 3.14159265358979323846
+#endif
+
+#if defined(_MSC_VER)
+#define BACKEND_THREAD_LOCAL __declspec(thread)
+#else
+#define BACKEND_THREAD_LOCAL __thread
+#endif
+
+// The isolate is shared by the whole process, while each system thread uses
+// its own isolate thread.
 static graal_isolate_t *isolate = NULL;
-static graal_isolatethread_t *thread = NULL;
+static BACKEND_THREAD_LOCAL graal_isolatethread_t *thread = NULL;
+
+// Error message for errors detected in this file, before reaching the 
+// capi. When set, it takes precedence over the message of the capi.
+static BACKEND_THREAD_LOCAL char *backend_errno_msg = NULL;
+
+static int backend_error(status_t status, char *msg) { 
+    backend_errno_msg = msg;
+    return status;
+}
+
+// thread attachment
+//
+// Threads are attached lazily, on their first call, and detached automatically
+// when they exit.
+
+#if defined(_WIN32)
+
+static DWORD backend_thread_key = FLS_OUT_OF_INDEXES;
+static INIT_ONCE backend_thread_key_once = INIT_ONCE_STATIC_INIT;
+static SRWLOCK isolate_lock = SRWLOCK_INIT;
+
+static VOID WINAPI backend_thread_detach(PVOID value) { 
+    if (value != NULL) { 
+        graal_detach_thread((graal_isolatethread_t *) value);
+    }
+}
+
+static BOOL CALLBACK backend_thread_key_init(PINIT_ONCE once, PVOID param, PVOID *context) { 
+    backend_thread_key = FlsAlloc(backend_thread_detach);
+    return TRUE;
+}
+
+static void backend_thread_register(graal_isolatethread_t *t) { 
+    InitOnceExecuteOnce(&backend_thread_key_once, backend_thread_key_init, NULL, NULL);
+    if (backend_thread_key != FLS_OUT_OF_INDEXES) { 
+        FlsSetValue(backend_thread_key, t);
+    }
+}
+
+static void isolate_lock_acquire() { 
+    AcquireSRWLockExclusive(&isolate_lock);
+}
+
+static void isolate_lock_release() { 
+    ReleaseSRWLockExclusive(&isolate_lock);
+}
+
+typedef struct { 
+    void (*fn)(void *);
+    void *arg;
+} backend_thread_start_t;
+
+static DWORD WINAPI backend_thread_main(LPVOID value) { 
+    backend_thread_start_t *start = (backend_thread_start_t *) value;
+    start->fn(start->arg);
+    return 0;
+}
+
+static long backend_atomic_next(volatile long *counter) { 
+    return InterlockedIncrement(counter) - 1;
+}
+
+static void *backend_atomic_load_ptr(void * volatile *p) { 
+    return InterlockedCompareExchangePointer(p, NULL, NULL);
+}
+
+static void backend_atomic_store_ptr(void * volatile *p, void *value) { 
+    InterlockedExchangePointer(p, value);
+}
+
+// Run fn on each of the count arguments in its own thread, the first one in
+// the calling thread. Arguments whose thread cannot be started also run in 
+// the calling thread, afterwards.
+static void backend_run_parallel(void (*fn)(void *), void **args, int count) { 
+    HANDLE *handles = calloc((size_t) count, sizeof(HANDLE));
+    backend_thread_start_t *starts = calloc((size_t) count, sizeof(backend_thread_start_t));
+    int i;
+    for (i = 1; i < count && handles != NULL && starts != NULL; i++) { 
+        starts[i].fn = fn;
+        starts[i].arg = args[i];
+        handles[i] = CreateThread(NULL, 0, backend_thread_main, &starts[i], 0, NULL);
+    }
+    fn(args[0]);
+    for (i = 1; i < count; i++) { 
+        if (handles != NULL && starts != NULL && handles[i] != NULL) { 
+            WaitForSingleObject(handles[i], INFINITE);
+            CloseHandle(handles[i]);
+        } else { 
+            fn(args[i]);
+        }
+    }
+    free(handles);
+    free(starts);
+}
+
+#else
+
+static pthread_key_t backend_thread_key;
+static pthread_once_t backend_thread_key_once = PTHREAD_ONCE_INIT;
+static pthread_mutex_t isolate_lock = PTHREAD_MUTEX_INITIALIZER;
+
+static void backend_thread_detach(void *value) { 
+    if (value != NULL) { 
+        graal_detach_thread((graal_isolatethread_t *) value);
+    }
+}
+
+static void backend_thread_key_init() { 
+    pthread_key_create(&backend_thread_key, backend_thread_detach);
+}
+
+static void backend_thread_register(graal_isolatethread_t *t) { 
+    pthread_once(&backend_thread_key_once, backend_thread_key_init);
+    pthread_setspecific(backend_thread_key, t);
+}
+
+static void isolate_lock_acquire() { 
+    pthread_mutex_lock(&isolate_lock);
+}
+
+static void isolate_lock_release() { 
+    pthread_mutex_unlock(&isolate_lock);
+}
+
+typedef struct { 
+    void (*fn)(void *);
+    void *arg;
+} backend_thread_start_t;
+
+static void *backend_thread_main(void *value) { 
+    backend_thread_start_t *start = (backend_thread_start_t *) value;
+    start->fn(start->arg);
+    return NULL;
+}
+
+static long backend_atomic_next(volatile long *counter) { 
+    return __atomic_fetch_add(counter, 1, __ATOMIC_RELAXED);
+}
+
+static void *backend_atomic_load_ptr(void * volatile *p) { 
+    return __atomic_load_n(p, __ATOMIC_ACQUIRE);
+}
+
+static void backend_atomic_store_ptr(void * volatile *p, void *value) { 
+    __atomic_store_n(p, value, __ATOMIC_RELEASE);
+}
+
+// Run fn on each of the count arguments in its own thread, the first one in
+// the calling thread. Arguments whose thread cannot be started also run in 
+// the calling thread, afterwards.
+static void backend_run_parallel(void (*fn)(void *), void **args, int count) { 
+    pthread_t *threads = calloc((size_t) count, sizeof(pthread_t));
+    unsigned char *started = calloc((size_t) count, sizeof(unsigned char));
+    backend_thread_start_t *starts = calloc((size_t) count, sizeof(backend_thread_start_t));
+    int i, ok = threads != NULL && started != NULL && starts != NULL;
+    for (i = 1; i < count && ok; i++) { 
+        starts[i].fn = fn;
+        starts[i].arg = args[i];
+        started[i] = pthread_create(&threads[i], NULL, backend_thread_main, &starts[i]) == 0;
+    }
+    fn(args[0]);
+    for (i = 1; i < count; i++) { 
+        if (ok && started[i]) { 
+            pthread_join(threads[i], NULL);
+        } else { 
+            fn(args[i]);
+        }
+    }
+    free(threads);
+    free(started);
+    free(starts);
+}
+
+#endif
 
 // library init
+//
+// The isolate is created on the first call into the backend, using the 
+// parameters given to jgrapht_isolate_configure() (if any).
+//
+// The reserved address space is part of all versions of the isolate parameters. 
+// The heap sizes can only be passed as runtime options, through the argc/argv 
+// fields which newer GraalVM releases add to graal_create_isolate_params_t. Older 
+// releases, such as the one used for the official builds, lack these fields, thus 
+// passing them must be enabled explicitly when building with JGRAPHT_ISOLATE_ARGS.
+
+#define ISOLATE_MAX_ARGS 5
+#define ISOLATE_ARG_SIZE 32
+
+static long long isolate_max_heap = 0;
+static long long isolate_min_heap = 0;
+static long long isolate_young_gen = 0;
+static long long isolate_reserved_address_space = 0;
+static int isolate_destroyed = 0;
+
+int jgrapht_isolate_configure(long long max_heap, long long min_heap, long long young_gen, long long reserved_address_space) { 
+    int configured = 0;
+    isolate_lock_acquire();
+    if (isolate == NULL && !isolate_destroyed) { 
+        isolate_max_heap = max_heap;
+        isolate_min_heap = min_heap;
+        isolate_young_gen = young_gen;
+        isolate_reserved_address_space = reserved_address_space;
+        configured = 1;
+    }
+    isolate_lock_release();
+    return configured;
+}
+
+int jgrapht_isolate_supports_heap_options() { 
+#ifdef JGRAPHT_ISOLATE_ARGS
+    return 1;
+#else
+    return 0;
+#endif
+}
+
+static int isolate_create_locked() { 
+    graal_create_isolate_params_t params = { 0 };
+#ifdef JGRAPHT_ISOLATE_ARGS
+    char args[ISOLATE_MAX_ARGS][ISOLATE_ARG_SIZE];
+    char *argv[ISOLATE_MAX_ARGS];
+    int argc = 0;
+
+    // the first argument is the program name, which the isolate ignores
+    snprintf(args[argc], ISOLATE_ARG_SIZE, "jgrapht");
+    argv[argc] = args[argc];
+    argc++;
+    if (isolate_max_heap > 0) { 
+        snprintf(args[argc], ISOLATE_ARG_SIZE, "-Xmx%lld", isolate_max_heap);
+        argv[argc] = args[argc];
+        argc++;
+    }
+    if (isolate_min_heap > 0) { 
+        snprintf(args[argc], ISOLATE_ARG_SIZE, "-Xms%lld", isolate_min_heap);
+        argv[argc] = args[argc];
+        argc++;
+    }
+    if (isolate_young_gen > 0) { 
+        snprintf(args[argc], ISOLATE_ARG_SIZE, "-Xmn%lld", isolate_young_gen);
+        argv[argc] = args[argc];
+        argc++;
+    }
+
+    // version 3 of the parameters carries the runtime options as argc/argv
+    params.version = 3;
+    params._reserved_1 = argc;
+    params._reserved_2 = argv;
+#else
+    params.version = 1;
+#endif
+    params.reserved_address_space_size = (__graal_uword) isolate_reserved_address_space;
+
+    if (graal_create_isolate(&params, &isolate, &thread) != 0) {
+        isolate = NULL;
+        thread = NULL;
+        return 0;
+    }
+    backend_thread_register(thread);
+    return 1;
+}
 
 void jgrapht_isolate_create() {
-    if (thread == NULL) { 
-        if (graal_create_isolate(NULL, &isolate, &thread) != 0) {
-            fprintf(stderr, "graal_create_isolate error\n");
-            exit(EXIT_FAILURE);
-        }
-    } 
+    isolate_lock_acquire();
+    if (isolate == NULL && !isolate_destroyed && !isolate_create_locked()) { 
+        fprintf(stderr, "graal_create_isolate error\n");
+        exit(EXIT_FAILURE);
+    }
+    isolate_lock_release();
 }
 
 void jgrapht_isolate_destroy() { 
+    isolate_lock_acquire();
     if (thread != NULL) { 
+        backend_thread_register(NULL);
         if (graal_detach_thread(thread) != 0) {
             fprintf(stderr, "graal_detach_thread error\n");
         }
-        thread  = NULL;
-        isolate = NULL;
+        thread = NULL;
     }
+    isolate = NULL;
+    isolate_destroyed = 1;
+    isolate_lock_release();
 }
 
 int jgrapht_isolate_is_attached() {
-    return thread != NULL; 
+    return isolate != NULL; 
+}
+
+int jgrapht_thread_attach() { 
+    int created;
+
+    if (thread != NULL) { 
+        return STATUS_SUCCESS;
+    }
+
+    isolate_lock_acquire();
+    if (isolate_destroyed) { 
+        isolate_lock_release();
+        return backend_error(STATUS_ERROR, "Backend isolate has been destroyed");
+    }
+    if (isolate == NULL) { 
+        created = isolate_create_locked();
+        isolate_lock_release();
+        if (!created) { 
+            return backend_error(STATUS_ERROR, "Failed to create the backend isolate");
+        }
+        return STATUS_SUCCESS;
+    }
+    isolate_lock_release();
+
+    if (graal_attach_thread(isolate, &thread) != 0) { 
+        thread = NULL;
+        return backend_error(STATUS_ERROR, "Failed to attach thread to the backend isolate");
+    }
+    backend_thread_register(thread);
+    return STATUS_SUCCESS;
 }
 
 // error
 
 void jgrapht_error_clear_errno() { 
-    jgrapht_capi_error_clear_errno(thread);
+    backend_errno_msg = NULL;
+    if (thread != NULL) { 
+        jgrapht_capi_error_clear_errno(thread);
+    }
 }
 
 status_t jgrapht_error_get_errno() { 
+    if (thread == NULL) { 
+        return backend_errno_msg != NULL ? STATUS_ERROR : STATUS_SUCCESS;
+    }
     return jgrapht_capi_error_get_errno(thread);
 }
 
 char * jgrapht_error_get_errno_msg() { 
+    if (backend_errno_msg != NULL || thread == NULL) { 
+        return backend_errno_msg != NULL ? backend_errno_msg : "Backend thread not attached";
+    }
     return jgrapht_capi_error_get_errno_msg(thread);
 }
 
@@ -516,6 +839,57 @@ int jgrapht_graph_sparse_create(int directed, int weighted, int num_vertices, vo
     return jgrapht_capi_graph_sparse_create(thread, directed, weighted, num_vertices, edges, res);
 }
 
+// Create a sparse graph from contiguous arrays of sources, targets and 
+// (optionally) weights. The edge list is built here, in a single call from
+// the caller. An empty weights array means that all edges get weight 1.0. 
+// A negative number of vertices means that it should be computed from the 
+// maximum vertex found in the arrays.
+int jgrapht_graph_sparse_create_from_arrays(int directed, int weighted, int num_vertices, int *sources, int sources_len, int *targets, int targets_len, double *weights, int weights_len, void** res) { 
+    void *edges;
+    int i, status, ignored, max_vertex = -1;
+
+    if (sources_len != targets_len) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Sources and targets must have the same length");
+    }
+    if (weights_len != 0 && weights_len != sources_len) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Weights must have the same length as sources and targets");
+    }
+    for (i = 0; i < sources_len; i++) { 
+        if (sources[i] < 0 || targets[i] < 0) { 
+            return backend_error(STATUS_ILLEGAL_ARGUMENT, "Vertices must be non-negative");
+        }
+        if (sources[i] > max_vertex) { 
+            max_vertex = sources[i];
+        }
+        if (targets[i] > max_vertex) { 
+            max_vertex = targets[i];
+        }
+    }
+    if (num_vertices < 0) { 
+        num_vertices = max_vertex + 1;
+    } else if (max_vertex >= num_vertices) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Vertex out of range");
+    }
+
+    if ((status = jgrapht_capi_list_create(thread, &edges)) != STATUS_SUCCESS) { 
+        return status;
+    }
+    for (i = 0; i < sources_len; i++) { 
+        if (weighted) { 
+            status = jgrapht_capi_list_edge_triple_add(thread, edges, sources[i], targets[i], weights_len != 0 ? weights[i] : 1.0, &ignored);
+        } else { 
+            status = jgrapht_capi_list_edge_pair_add(thread, edges, sources[i], targets[i], &ignored);
+        }
+        if (status != STATUS_SUCCESS) { 
+            jgrapht_capi_handles_destroy(thread, edges);
+            return status;
+        }
+    }
+    status = jgrapht_capi_graph_sparse_create(thread, directed, weighted, num_vertices, edges, res);
+    jgrapht_capi_handles_destroy(thread, edges);
+    return status;
+}
+
 int jgrapht_graph_vertices_count(void *g, int* res) { 
     return jgrapht_capi_graph_vertices_count(thread, g, res);
 }
@@ -532,140 +906,2839 @@ int jgrapht_graph_add_given_vertex(void *g, int vertex, int *res) {
     return jgrapht_capi_graph_add_given_vertex(thread, g, vertex, res);
 }
 
+// Bulk insertion of vertices. The first adds n new vertices and stores their 
+// identifiers in res, the second adds the given vertices, ignoring those
+// already in the graph.
+
+int jgrapht_graph_add_vertices(void *g, int *res, int n) { 
+    int i, status;
+    for (i = 0; i < n; i++) { 
+        if ((status = jgrapht_capi_graph_add_vertex(thread, g, res + i)) != STATUS_SUCCESS) { 
+            return status;
+        }
+    }
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_graph_add_given_vertices(void *g, int *vertices, int n) { 
+    int i, added, status;
+    for (i = 0; i < n; i++) { 
+        if ((status = jgrapht_capi_graph_add_given_vertex(thread, g, vertices[i], &added)) != STATUS_SUCCESS) { 
+            return status;
+        }
+    }
+    return STATUS_SUCCESS;
+}
+
 int jgrapht_graph_remove_vertex(void *g, int v, int* res) { 
     return jgrapht_capi_graph_remove_vertex(thread, g, v, res);
 }
 
-int jgrapht_graph_contains_vertex(void *g, int v, int* res) { 
-    return jgrapht_capi_graph_contains_vertex(thread, g, v, res);
+int jgrapht_graph_contains_vertex(void *g, int v, int* res) { 
+    return jgrapht_capi_graph_contains_vertex(thread, g, v, res);
+}
+
+int jgrapht_graph_add_edge(void *g, int u, int v, int* res) { 
+    return jgrapht_capi_graph_add_edge(thread, g, u, v, res);
+}
+
+int jgrapht_graph_add_given_edge(void *g, int u, int v, int edge, int* res) { 
+    return jgrapht_capi_graph_add_given_edge(thread, g, u, v, edge, res);
+}
+
+// Bulk insertion of edges. Adds an edge for each pair of sources and targets
+// and stores the new edge identifiers in res. If weights is not empty, the 
+// weight of each new edge is also set, except for NaN weights which keep the
+// default weight without notifying the listeners of a listenable graph.
+int jgrapht_graph_add_edges(void *g, int *sources, int sources_len, int *targets, int targets_len, double *weights, int weights_len, int *res, int res_len) { 
+    int i, status;
+
+    if (sources_len != targets_len || sources_len != res_len) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Sources and targets must have the same length");
+    }
+    if (weights_len != 0 && weights_len != sources_len) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Weights must have the same length as sources and targets");
+    }
+    for (i = 0; i < sources_len; i++) { 
+        if ((status = jgrapht_capi_graph_add_edge(thread, g, sources[i], targets[i], res + i)) != STATUS_SUCCESS) { 
+            return status;
+        }
+        if (weights_len != 0 && !isnan(weights[i])) { 
+            if ((status = jgrapht_capi_graph_set_edge_weight(thread, g, res[i], weights[i])) != STATUS_SUCCESS) { 
+                return status;
+            }
+        }
+    }
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_graph_remove_edge(void *g, int e, int* res) { 
+    return jgrapht_capi_graph_remove_edge(thread, g, e, res);
+}
+
+int jgrapht_graph_contains_edge(void *g, int e, int* res) { 
+    return jgrapht_capi_graph_contains_edge(thread, g, e, res);
+}
+
+int jgrapht_graph_contains_edge_between(void *g, int u, int v, int* res) { 
+    return jgrapht_capi_graph_contains_edge_between(thread, g, u, v, res);
+}
+
+int jgrapht_graph_degree_of(void *g, int v, int* res) { 
+    return jgrapht_capi_graph_degree_of(thread, g, v, res);
+}
+
+int jgrapht_graph_indegree_of(void *g, int v, int* res) { 
+    return jgrapht_capi_graph_indegree_of(thread, g, v, res);
+}
+
+int jgrapht_graph_outdegree_of(void *g, int v, int* res) { 
+    return jgrapht_capi_graph_outdegree_of(thread, g, v, res);
+}
+
+// Vectorized degrees. The first call computes the maximum vertex identifier 
+// (or -1 if the graph is empty), which allows the caller to allocate an array
+// indexed by vertex. The second fills such an array with the degree of each 
+// vertex, where kind is 0 for the degree, 1 for the indegree and 2 for the 
+// outdegree. Entries not corresponding to any vertex are set to zero.
+
+int jgrapht_graph_vertices_max(void *g, int* res) { 
+    void *it;
+    int v, hasnext, status;
+
+    *res = -1;
+    if ((status = jgrapht_capi_graph_create_all_vit(thread, g, &it)) != STATUS_SUCCESS) { 
+        return status;
+    }
+    while ((status = jgrapht_capi_it_hasnext(thread, it, &hasnext)) == STATUS_SUCCESS && hasnext) { 
+        if ((status = jgrapht_capi_it_next_int(thread, it, &v)) != STATUS_SUCCESS) { 
+            break;
+        }
+        if (v > *res) { 
+            *res = v;
+        }
+    }
+    jgrapht_capi_handles_destroy(thread, it);
+    return status;
+}
+
+int jgrapht_graph_degrees(void *g, int kind, int *res, int res_len) { 
+    void *it;
+    int i, v, hasnext, status;
+
+    if (kind < 0 || kind > 2) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Unknown degree kind");
+    }
+    for (i = 0; i < res_len; i++) { 
+        res[i] = 0;
+    }
+    if ((status = jgrapht_capi_graph_create_all_vit(thread, g, &it)) != STATUS_SUCCESS) { 
+        return status;
+    }
+    while ((status = jgrapht_capi_it_hasnext(thread, it, &hasnext)) == STATUS_SUCCESS && hasnext) { 
+        if ((status = jgrapht_capi_it_next_int(thread, it, &v)) != STATUS_SUCCESS) { 
+            break;
+        }
+        if (v < 0 || v >= res_len) { 
+            status = backend_error(STATUS_INDEX_OUT_OF_BOUNDS, "Vertex out of range");
+            break;
+        }
+        if (kind == 0) { 
+            status = jgrapht_capi_graph_degree_of(thread, g, v, res + v);
+        } else if (kind == 1) { 
+            status = jgrapht_capi_graph_indegree_of(thread, g, v, res + v);
+        } else { 
+            status = jgrapht_capi_graph_outdegree_of(thread, g, v, res + v);
+        }
+        if (status != STATUS_SUCCESS) { 
+            break;
+        }
+    }
+    jgrapht_capi_handles_destroy(thread, it);
+    return status;
+}
+
+// Copy a graph to a sparse graph. The vertices array maps each vertex of the 
+// sparse graph to a vertex of the input graph. If empty, vertices are kept 
+// as is and the sparse graph has as many vertices as the maximum vertex plus 
+// one. On return, the edges array maps each edge of the sparse graph to the 
+// corresponding edge of the input graph and must have one entry per edge.
+int jgrapht_graph_copy_to_sparse(void *g, int *vertices, int vertices_len, int *edges, int edges_len, void** res) { 
+    void *it = NULL, *list = NULL;
+    int *index = NULL;
+    int i, n, m, e, source, target, max_vertex, directed, weighted, hasnext, ignored, status;
+    double weight = 1.0;
+
+    if ((status = jgrapht_graph_vertices_max(g, &max_vertex)) != STATUS_SUCCESS
+        || (status = jgrapht_capi_graph_edges_count(thread, g, &m)) != STATUS_SUCCESS
+        || (status = jgrapht_capi_graph_is_directed(thread, g, &directed)) != STATUS_SUCCESS
+        || (status = jgrapht_capi_graph_is_weighted(thread, g, &weighted)) != STATUS_SUCCESS) { 
+        return status;
+    }
+    if (edges_len != m) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Edges array must have one entry per edge");
+    }
+
+    if (vertices_len == 0) { 
+        n = max_vertex + 1;
+    } else { 
+        n = vertices_len;
+        if ((index = malloc((max_vertex >= 0 ? max_vertex + 1 : 1) * sizeof(int))) == NULL) { 
+            return backend_error(STATUS_ERROR, "Out of memory");
+        }
+        for (i = 0; i <= max_vertex; i++) { 
+            index[i] = -1;
+        }
+        for (i = 0; i < vertices_len; i++) { 
+            if (vertices[i] < 0 || vertices[i] > max_vertex || index[vertices[i]] != -1) { 
+                free(index);
+                return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid vertex mapping");
+            }
+            index[vertices[i]] = i;
+        }
+    }
+
+    if ((status = jgrapht_capi_list_create(thread, &list)) != STATUS_SUCCESS) { 
+        free(index);
+        return status;
+    }
+    if ((status = jgrapht_capi_graph_create_all_eit(thread, g, &it)) != STATUS_SUCCESS) { 
+        goto cleanup;
+    }
+    i = 0;
+    while ((status = jgrapht_capi_it_hasnext(thread, it, &hasnext)) == STATUS_SUCCESS && hasnext) { 
+        if ((status = jgrapht_capi_it_next_int(thread, it, &e)) != STATUS_SUCCESS
+            || (status = jgrapht_capi_graph_edge_source(thread, g, e, &source)) != STATUS_SUCCESS
+            || (status = jgrapht_capi_graph_edge_target(thread, g, e, &target)) != STATUS_SUCCESS) { 
+            goto cleanup;
+        }
+        if (weighted && (status = jgrapht_capi_graph_get_edge_weight(thread, g, e, &weight)) != STATUS_SUCCESS) { 
+            goto cleanup;
+        }
+        if (index != NULL) { 
+            source = index[source];
+            target = index[target];
+            if (source == -1 || target == -1) { 
+                status = backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid vertex mapping");
+                goto cleanup;
+            }
+        }
+        if (i >= m) { 
+            status = backend_error(STATUS_ILLEGAL_ARGUMENT, "Graph modified during copy");
+            goto cleanup;
+        }
+        if (weighted) { 
+            status = jgrapht_capi_list_edge_triple_add(thread, list, source, target, weight, &ignored);
+        } else { 
+            status = jgrapht_capi_list_edge_pair_add(thread, list, source, target, &ignored);
+        }
+        if (status != STATUS_SUCCESS) { 
+            goto cleanup;
+        }
+        edges[i++] = e;
+    }
+    if (status != STATUS_SUCCESS) { 
+        goto cleanup;
+    }
+    if (i != m) { 
+        status = backend_error(STATUS_ILLEGAL_ARGUMENT, "Graph modified during copy");
+        goto cleanup;
+    }
+    status = jgrapht_capi_graph_sparse_create(thread, directed, weighted, n, list, res);
+
+cleanup:
+    if (it != NULL) { 
+        jgrapht_capi_handles_destroy(thread, it);
+    }
+    jgrapht_capi_handles_destroy(thread, list);
+    free(index);
+    return status;
+}
+
+int jgrapht_graph_edge_source(void *g, int v, int* res) { 
+    return jgrapht_capi_graph_edge_source(thread, g, v, res);
+}
+
+int jgrapht_graph_edge_target(void *g, int v, int* res) { 
+    return jgrapht_capi_graph_edge_target(thread, g, v, res);
+}
+
+int jgrapht_graph_is_weighted(void *g, int* res) { 
+    return jgrapht_capi_graph_is_weighted(thread, g, res);
+}
+
+int jgrapht_graph_is_directed(void *g, int* res) { 
+    return jgrapht_capi_graph_is_directed(thread, g, res);
+}
+
+int jgrapht_graph_is_undirected(void *g, int* res) { 
+    return jgrapht_capi_graph_is_undirected(thread, g, res);
+}
+
+int jgrapht_graph_is_allowing_selfloops(void *g, int* res) { 
+    return jgrapht_capi_graph_is_allowing_selfloops(thread, g, res);
+}
+
+int jgrapht_graph_is_allowing_multipleedges(void *g, int* res) { 
+    return jgrapht_capi_graph_is_allowing_multipleedges(thread, g, res);
+}
+
+int jgrapht_graph_is_allowing_cycles(void *g, int* res) { 
+    return jgrapht_capi_graph_is_allowing_cycles(thread, g, res);
+}
+
+int jgrapht_graph_is_modifiable(void *g, int* res) { 
+    return jgrapht_capi_graph_is_modifiable(thread, g, res);
+}
+
+int jgrapht_graph_get_edge_weight(void *g, int e, double* res) { 
+    return jgrapht_capi_graph_get_edge_weight(thread, g, e, res);
+}
+
+int jgrapht_graph_set_edge_weight(void *g, int e, double weight) { 
+    return jgrapht_capi_graph_set_edge_weight(thread, g, e, weight);
+}
+
+// Bulk edge weights, for arrays of edges and weights of the same length.
+
+int jgrapht_graph_get_edge_weights(void *g, int *edges, int edges_len, double *weights, int weights_len) { 
+    int i, status;
+    if (edges_len != weights_len) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Edges and weights must have the same length");
+    }
+    for (i = 0; i < edges_len; i++) { 
+        if ((status = jgrapht_capi_graph_get_edge_weight(thread, g, edges[i], weights + i)) != STATUS_SUCCESS) { 
+            return status;
+        }
+    }
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_graph_set_edge_weights(void *g, int *edges, int edges_len, double *weights, int weights_len) { 
+    int i, status;
+    if (edges_len != weights_len) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Edges and weights must have the same length");
+    }
+    for (i = 0; i < edges_len; i++) { 
+        if ((status = jgrapht_capi_graph_set_edge_weight(thread, g, edges[i], weights[i])) != STATUS_SUCCESS) { 
+            return status;
+        }
+    }
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_graph_create_all_vit(void *g, void** res)  { 
+    return jgrapht_capi_graph_create_all_vit(thread, g, res);
+}
+
+int jgrapht_graph_create_all_eit(void *g, void** res) { 
+    return jgrapht_capi_graph_create_all_eit(thread, g, res);
+}
+
+int jgrapht_graph_create_between_eit(void *g, int u, int v, void** res) { 
+    return jgrapht_capi_graph_create_between_eit(thread, g, u, v, res);
+}
+
+int jgrapht_graph_vertex_create_eit(void *g, int v, void** res) { 
+    return jgrapht_capi_graph_vertex_create_eit(thread, g, v, res);
+}
+
+int jgrapht_graph_vertex_create_out_eit(void *g, int v, void** res) { 
+    return jgrapht_capi_graph_vertex_create_out_eit(thread, g, v, res);
+}
+
+int jgrapht_graph_vertex_create_in_eit(void *g, int v, void** res) { 
+    return jgrapht_capi_graph_vertex_create_in_eit(thread, g, v, res);
+}
+
+// CSR export. Vertices are assumed to be 0,...,n-1 where n+1 is the length of 
+// the offsets array. The first call computes the row offsets from the outgoing 
+// edges of each vertex, the second one fills the columns (opposite vertices), 
+// edge identifiers and weights. For undirected graphs all edges touching a vertex
+// are considered outgoing.
+
+int jgrapht_graph_csr_offsets(void *g, int *offsets, int offsets_len) { 
+    void *it;
+    int v, hasnext, e, count, status;
+
+    if (offsets_len < 1) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Offsets must contain at least one element");
+    }
+    offsets[0] = 0;
+    for (v = 0; v < offsets_len - 1; v++) { 
+        if ((status = jgrapht_capi_graph_vertex_create_out_eit(thread, g, v, &it)) != STATUS_SUCCESS) { 
+            return status;
+        }
+        count = 0;
+        while ((status = jgrapht_capi_it_hasnext(thread, it, &hasnext)) == STATUS_SUCCESS && hasnext) { 
+            if ((status = jgrapht_capi_it_next_int(thread, it, &e)) != STATUS_SUCCESS) { 
+                break;
+            }
+            count++;
+        }
+        jgrapht_capi_handles_destroy(thread, it);
+        if (status != STATUS_SUCCESS) { 
+            return status;
+        }
+        offsets[v + 1] = offsets[v] + count;
+    }
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_graph_csr_fill(void *g, int *offsets, int offsets_len, int *indices, int indices_len, int *edges, int edges_len, double *weights, int weights_len) { 
+    void *it;
+    int v, pos, hasnext, e, source, target, status;
+
+    if (offsets_len < 1 || indices_len != offsets[offsets_len - 1] || edges_len != indices_len || weights_len != indices_len) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Arrays do not match the offsets");
+    }
+    for (v = 0; v < offsets_len - 1; v++) { 
+        if ((status = jgrapht_capi_graph_vertex_create_out_eit(thread, g, v, &it)) != STATUS_SUCCESS) { 
+            return status;
+        }
+        pos = offsets[v];
+        while ((status = jgrapht_capi_it_hasnext(thread, it, &hasnext)) == STATUS_SUCCESS && hasnext) { 
+            if (pos >= offsets[v + 1]) { 
+                status = backend_error(STATUS_ILLEGAL_ARGUMENT, "Graph modified during CSR export");
+                break;
+            }
+            if ((status = jgrapht_capi_it_next_int(thread, it, &e)) != STATUS_SUCCESS 
+                || (status = jgrapht_capi_graph_edge_source(thread, g, e, &source)) != STATUS_SUCCESS
+                || (status = jgrapht_capi_graph_edge_target(thread, g, e, &target)) != STATUS_SUCCESS
+                || (status = jgrapht_capi_graph_get_edge_weight(thread, g, e, weights + pos)) != STATUS_SUCCESS) { 
+                break;
+            }
+            indices[pos] = source == v ? target : source;
+            edges[pos] = e;
+            pos++;
+        }
+        jgrapht_capi_handles_destroy(thread, it);
+        if (status != STATUS_SUCCESS) { 
+            return status;
+        }
+        if (pos != offsets[v + 1]) { 
+            return backend_error(STATUS_ILLEGAL_ARGUMENT, "Graph modified during CSR export");
+        }
+    }
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_graph_as_undirected(void *g, void** res) { 
+    return jgrapht_capi_graph_as_undirected(thread, g, res);
+}
+
+int jgrapht_graph_as_unmodifiable(void *g, void** res) { 
+    return jgrapht_capi_graph_as_unmodifiable(thread, g, res);
+}
+
+int jgrapht_graph_as_unweighted(void *g, void** res) { 
+    return jgrapht_capi_graph_as_unweighted(thread, g, res);
+}
+
+int jgrapht_graph_as_edgereversed(void *g, void** res) { 
+    return jgrapht_capi_graph_as_edgereversed(thread, g, res);
+}
+
+int jgrapht_graph_as_weighted(void *g, void *weight_function, int cache_weights, int write_weights_through, void** res) { 
+    return jgrapht_capi_graph_as_weighted(thread, g, weight_function, cache_weights, write_weights_through, res);
+}
+
+int jgrapht_graph_as_masked_subgraph(void *g, void *vertex_mask_function, void *edge_mask_function, void** res) {
+    return jgrapht_capi_graph_as_masked_subgraph(thread, g, vertex_mask_function, edge_mask_function, res);
+}
+
+int jgrapht_graph_as_subgraph(void *g, void *vertex_set, void *edge_set, void** res) { 
+    return jgrapht_capi_graph_as_subgraph(thread, g, vertex_set, edge_set, res);
+}
+
+// slots
+//
+// Callbacks of the capi carry no context, thus objects which provide callbacks
+// implemented in this file (masks, heuristics) occupy one of a fixed number of 
+// slots. Each slot has its own set of callbacks, generated by the following macros 
+// which expand a macro once per slot number.
+
+#define BACKEND_SLOTS_COUNT 256
+
+#define BACKEND_SLOTS_16(M, P) \
+    M(P##0) M(P##1) M(P##2) M(P##3) M(P##4) M(P##5) M(P##6) M(P##7) \
+    M(P##8) M(P##9) M(P##a) M(P##b) M(P##c) M(P##d) M(P##e) M(P##f)
+
+#define BACKEND_SLOTS(M) \
+    BACKEND_SLOTS_16(M, 0x0) BACKEND_SLOTS_16(M, 0x1) BACKEND_SLOTS_16(M, 0x2) BACKEND_SLOTS_16(M, 0x3) \
+    BACKEND_SLOTS_16(M, 0x4) BACKEND_SLOTS_16(M, 0x5) BACKEND_SLOTS_16(M, 0x6) BACKEND_SLOTS_16(M, 0x7) \
+    BACKEND_SLOTS_16(M, 0x8) BACKEND_SLOTS_16(M, 0x9) BACKEND_SLOTS_16(M, 0xa) BACKEND_SLOTS_16(M, 0xb) \
+    BACKEND_SLOTS_16(M, 0xc) BACKEND_SLOTS_16(M, 0xd) BACKEND_SLOTS_16(M, 0xe) BACKEND_SLOTS_16(M, 0xf)
+
+// masks
+//
+// Vertex and edge masks kept as bitsets on this side of the backend, so that
+// masked subgraphs can test membership without calling into Python.
+
+#define MASK_SLOTS BACKEND_SLOTS_COUNT
+
+// The bits are kept in blocks which are never resized in place. Growing a 
+// bitset publishes a larger copy and retires the old block until the mask is 
+// destroyed, since masked subgraphs may be read by algorithms running in other 
+// threads while the mask is updated.
+
+typedef struct backend_bitset_block { 
+    struct backend_bitset_block *retired;
+    int capacity;
+    unsigned char bits[];
+} backend_bitset_block_t;
+
+typedef struct { 
+    backend_bitset_block_t * volatile block;
+} backend_bitset_t;
+
+typedef struct { 
+    int used;
+    backend_bitset_t sets[2];
+} backend_mask_t;
+
+static backend_mask_t masks[MASK_SLOTS];
+
+static backend_bitset_block_t *bitset_block(backend_bitset_t *b) { 
+    return (backend_bitset_block_t *) backend_atomic_load_ptr((void * volatile *) &b->block);
+}
+
+static int bitset_test(backend_bitset_t *b, int i) { 
+    backend_bitset_block_t *block = bitset_block(b);
+    if (block == NULL || i < 0 || i >= block->capacity) { 
+        return 0;
+    }
+    return (block->bits[i >> 3] >> (i & 7)) & 1;
+}
+
+static backend_bitset_block_t *bitset_reserve(backend_bitset_t *b, int size) { 
+    backend_bitset_block_t *block, *old = bitset_block(b);
+    int bytes, old_bytes = 0;
+
+    if (old != NULL) { 
+        if (size <= old->capacity) { 
+            return old;
+        }
+        if (size < 2 * old->capacity) { 
+            size = 2 * old->capacity;
+        }
+        old_bytes = old->capacity / 8;
+    }
+    bytes = (size + 7) / 8;
+    block = (backend_bitset_block_t *) calloc(1, sizeof(backend_bitset_block_t) + (size_t) bytes);
+    if (block == NULL) { 
+        return NULL;
+    }
+    if (old != NULL) { 
+        memcpy(block->bits, old->bits, (size_t) old_bytes);
+    }
+    block->retired = old;
+    block->capacity = bytes * 8;
+    backend_atomic_store_ptr((void * volatile *) &b->block, block);
+    return block;
+}
+
+static void bitset_clear(backend_bitset_t *b) { 
+    backend_bitset_block_t *block = bitset_block(b);
+    if (block != NULL) { 
+        memset(block->bits, 0, (size_t) (block->capacity / 8));
+    }
+}
+
+static void bitset_free(backend_bitset_t *b) { 
+    backend_bitset_block_t *block = bitset_block(b), *retired;
+    backend_atomic_store_ptr((void * volatile *) &b->block, NULL);
+    while (block != NULL) { 
+        retired = block->retired;
+        free(block);
+        block = retired;
+    }
+}
+
+#define MASK_CALLBACKS(N) \
+    static int backend_mask_vertex_##N(int v) { return bitset_test(&masks[N].sets[0], v); } \
+    static int backend_mask_edge_##N(int e) { return bitset_test(&masks[N].sets[1], e); }
+
+#define MASK_ENTRY(N) { backend_mask_vertex_##N, backend_mask_edge_##N },
+
+BACKEND_SLOTS(MASK_CALLBACKS)
+
+typedef int (*backend_mask_callback_t)(int);
+
+static backend_mask_callback_t mask_callbacks[MASK_SLOTS][2] = { 
+    BACKEND_SLOTS(MASK_ENTRY)
+};
+
+static backend_bitset_t *mask_bitset(int slot, int kind) { 
+    if (slot < 0 || slot >= MASK_SLOTS || !masks[slot].used || kind < 0 || kind > 1) { 
+        return NULL;
+    }
+    return &masks[slot].sets[kind];
+}
+
+int jgrapht_mask_create(int* res) { 
+    int slot;
+    isolate_lock_acquire();
+    for (slot = 0; slot < MASK_SLOTS; slot++) { 
+        if (!masks[slot].used) { 
+            masks[slot].used = 1;
+            break;
+        }
+    }
+    isolate_lock_release();
+    if (slot == MASK_SLOTS) { 
+        return backend_error(STATUS_ERROR, "Too many masks in use");
+    }
+    *res = slot;
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_mask_destroy(int slot) { 
+    if (mask_bitset(slot, 0) == NULL) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid mask");
+    }
+    isolate_lock_acquire();
+    bitset_free(&masks[slot].sets[0]);
+    bitset_free(&masks[slot].sets[1]);
+    masks[slot].used = 0;
+    isolate_lock_release();
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_mask_get_callbacks(int slot, long long* vertex_mask_function, long long* edge_mask_function) { 
+    if (mask_bitset(slot, 0) == NULL) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid mask");
+    }
+    *vertex_mask_function = (long long) (intptr_t) mask_callbacks[slot][0];
+    *edge_mask_function = (long long) (intptr_t) mask_callbacks[slot][1];
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_mask_assign(int slot, int kind, unsigned char *flags, int size) { 
+    int i;
+    backend_bitset_block_t *block;
+    backend_bitset_t *b = mask_bitset(slot, kind);
+    if (b == NULL) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid mask");
+    }
+    block = bitset_reserve(b, size);
+    if (block == NULL) { 
+        return backend_error(STATUS_ERROR, "Failed to allocate mask");
+    }
+    memset(block->bits, 0, (size_t) (block->capacity / 8));
+    for (i = 0; i < size; i++) { 
+        if (flags[i]) { 
+            block->bits[i >> 3] |= (unsigned char) (1 << (i & 7));
+        }
+    }
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_mask_set(int slot, int kind, int *ids, int size, int masked) { 
+    int i, max = -1;
+    backend_bitset_block_t *block;
+    backend_bitset_t *b = mask_bitset(slot, kind);
+    if (b == NULL) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid mask");
+    }
+    for (i = 0; i < size; i++) { 
+        if (ids[i] < 0) { 
+            return backend_error(STATUS_ILLEGAL_ARGUMENT, "Negative identifier in mask");
+        }
+        if (ids[i] > max) { 
+            max = ids[i];
+        }
+    }
+    block = masked ? bitset_reserve(b, max + 1) : bitset_block(b);
+    if (masked && block == NULL) { 
+        return backend_error(STATUS_ERROR, "Failed to allocate mask");
+    }
+    for (i = 0; i < size && block != NULL; i++) { 
+        if (masked) { 
+            block->bits[ids[i] >> 3] |= (unsigned char) (1 << (ids[i] & 7));
+        } else if (ids[i] < block->capacity) { 
+            block->bits[ids[i] >> 3] &= (unsigned char) ~(1 << (ids[i] & 7));
+        }
+    }
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_mask_clear(int slot, int kind) { 
+    backend_bitset_t *b = mask_bitset(slot, kind);
+    if (b == NULL) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid mask");
+    }
+    bitset_clear(b);
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_mask_test(int slot, int kind, int id, int* res) { 
+    backend_bitset_t *b = mask_bitset(slot, kind);
+    if (b == NULL) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid mask");
+    }
+    *res = bitset_test(b, id);
+    return STATUS_SUCCESS;
+}
+
+// shortest path graphs
+//
+// Read-only snapshots of a graph in compressed sparse row format, on which 
+// shortest paths are computed natively, without calling into the capi. The 
+// rows are indexed by the vertex identifiers, which must be non-negative, and
+// identifiers not corresponding to any vertex have no arcs. Undirected edges
+// appear in the rows of both endpoints. For directed graphs the incoming arcs
+// are also kept, in order to search backwards.
+
+typedef struct { 
+    int n;
+    int m;
+    int directed;
+    int negative;
+    unsigned char *present;
+    int *offsets;
+    int *targets;
+    int *edges;
+    double *weights;
+    // same as the above for undirected graphs
+    int *rev_offsets;
+    int *rev_targets;
+    int *rev_edges;
+    double *rev_weights;
+} backend_spgraph_t;
+
+static void spgraph_free(backend_spgraph_t *g) { 
+    if (g == NULL) { 
+        return;
+    }
+    if (g->rev_offsets != g->offsets) { 
+        free(g->rev_offsets);
+        free(g->rev_targets);
+        free(g->rev_edges);
+        free(g->rev_weights);
+    }
+    free(g->present);
+    free(g->offsets);
+    free(g->targets);
+    free(g->edges);
+    free(g->weights);
+    free(g);
+}
+
+// Fill the rows of a CSR from a list of arcs, keeping their order.
+static int spgraph_fill_rows(int n, int count, const int *tails, const int *heads, const int *ids, const double *ws, 
+    int **offsets, int **targets, int **edges, double **weights) { 
+    int i, pos;
+    int *o = calloc((size_t) n + 1, sizeof(int));
+    int *next = malloc(((size_t) n + 1) * sizeof(int));
+    int *t = malloc(((size_t) count + 1) * sizeof(int));
+    int *e = malloc(((size_t) count + 1) * sizeof(int));
+    double *w = malloc(((size_t) count + 1) * sizeof(double));
+    if (o == NULL || next == NULL || t == NULL || e == NULL || w == NULL) { 
+        free(o); free(next); free(t); free(e); free(w);
+        return 0;
+    }
+    for (i = 0; i < count; i++) { 
+        o[tails[i] + 1]++;
+    }
+    for (i = 0; i < n; i++) { 
+        o[i + 1] += o[i];
+        next[i] = o[i];
+    }
+    for (i = 0; i < count; i++) { 
+        pos = next[tails[i]]++;
+        t[pos] = heads[i];
+        e[pos] = ids[i];
+        w[pos] = ws[i];
+    }
+    free(next);
+    *offsets = o;
+    *targets = t;
+    *edges = e;
+    *weights = w;
+    return 1;
+}
+
+int jgrapht_spgraph_create(void *g, void** res) { 
+    void *it;
+    backend_spgraph_t *sg;
+    int *tails = NULL, *heads = NULL, *ids = NULL;
+    double *ws = NULL;
+    int i, v, e, m, count, max_vertex, weighted, source, target, hasnext, status;
+    double weight = 1.0;
+
+    if ((sg = calloc(1, sizeof(backend_spgraph_t))) == NULL) { 
+        return backend_error(STATUS_ERROR, "Out of memory");
+    }
+    if ((status = jgrapht_graph_vertices_max(g, &max_vertex)) != STATUS_SUCCESS
+        || (status = jgrapht_capi_graph_edges_count(thread, g, &m)) != STATUS_SUCCESS
+        || (status = jgrapht_capi_graph_is_directed(thread, g, &sg->directed)) != STATUS_SUCCESS
+        || (status = jgrapht_capi_graph_is_weighted(thread, g, &weighted)) != STATUS_SUCCESS) { 
+        free(sg);
+        return status;
+    }
+    sg->n = max_vertex + 1;
+
+    // arcs, twice as many for undirected graphs
+    count = sg->directed ? m : 2 * m;
+    tails = malloc(((size_t) count + 1) * sizeof(int));
+    heads = malloc(((size_t) count + 1) * sizeof(int));
+    ids = malloc(((size_t) count + 1) * sizeof(int));
+    ws = malloc(((size_t) count + 1) * sizeof(double));
+    sg->present = calloc((size_t) sg->n + 1, sizeof(unsigned char));
+    if (tails == NULL || heads == NULL || ids == NULL || ws == NULL || sg->present == NULL) { 
+        status = backend_error(STATUS_ERROR, "Out of memory");
+        goto cleanup;
+    }
+
+    if ((status = jgrapht_capi_graph_create_all_vit(thread, g, &it)) != STATUS_SUCCESS) { 
+        goto cleanup;
+    }
+    while ((status = jgrapht_capi_it_hasnext(thread, it, &hasnext)) == STATUS_SUCCESS && hasnext) { 
+        if ((status = jgrapht_capi_it_next_int(thread, it, &v)) != STATUS_SUCCESS) { 
+            break;
+        }
+        if (v < 0) { 
+            status = backend_error(STATUS_ILLEGAL_ARGUMENT, "Negative vertex identifier");
+            break;
+        }
+        sg->present[v] = 1;
+    }
+    jgrapht_capi_handles_destroy(thread, it);
+    if (status != STATUS_SUCCESS) { 
+        goto cleanup;
+    }
+
+    if ((status = jgrapht_capi_graph_create_all_eit(thread, g, &it)) != STATUS_SUCCESS) { 
+        goto cleanup;
+    }
+    i = 0;
+    while ((status = jgrapht_capi_it_hasnext(thread, it, &hasnext)) == STATUS_SUCCESS && hasnext) { 
+        if ((status = jgrapht_capi_it_next_int(thread, it, &e)) != STATUS_SUCCESS
+            || (status = jgrapht_capi_graph_edge_source(thread, g, e, &source)) != STATUS_SUCCESS
+            || (status = jgrapht_capi_graph_edge_target(thread, g, e, &target)) != STATUS_SUCCESS) { 
+            break;
+        }
+        if (weighted && (status = jgrapht_capi_graph_get_edge_weight(thread, g, e, &weight)) != STATUS_SUCCESS) { 
+            break;
+        }
+        if (i + (sg->directed ? 1 : 2) > count) { 
+            status = backend_error(STATUS_ILLEGAL_ARGUMENT, "Graph modified during copy");
+            break;
+        }
+        if (weight < 0.0) { 
+            sg->negative = 1;
+        }
+        tails[i] = source;
+        heads[i] = target;
+        ids[i] = e;
+        ws[i] = weight;
+        i++;
+        if (!sg->directed && source != target) { 
+            tails[i] = target;
+            heads[i] = source;
+            ids[i] = e;
+            ws[i] = weight;
+            i++;
+        }
+    }
+    jgrapht_capi_handles_destroy(thread, it);
+    if (status != STATUS_SUCCESS) { 
+        goto cleanup;
+    }
+    sg->m = i;
+
+    if (!spgraph_fill_rows(sg->n, sg->m, tails, heads, ids, ws, &sg->offsets, &sg->targets, &sg->edges, &sg->weights)) { 
+        status = backend_error(STATUS_ERROR, "Out of memory");
+        goto cleanup;
+    }
+    if (sg->directed) { 
+        if (!spgraph_fill_rows(sg->n, sg->m, heads, tails, ids, ws, &sg->rev_offsets, &sg->rev_targets, &sg->rev_edges, &sg->rev_weights)) { 
+            status = backend_error(STATUS_ERROR, "Out of memory");
+            goto cleanup;
+        }
+    } else { 
+        sg->rev_offsets = sg->offsets;
+        sg->rev_targets = sg->targets;
+        sg->rev_edges = sg->edges;
+        sg->rev_weights = sg->weights;
+    }
+
+cleanup:
+    free(tails);
+    free(heads);
+    free(ids);
+    free(ws);
+    if (status != STATUS_SUCCESS) { 
+        spgraph_free(sg);
+        return status;
+    }
+    *res = sg;
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_spgraph_destroy(void *g) { 
+    spgraph_free((backend_spgraph_t *) g);
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_spgraph_get_info(void *g, int* n_res, int* m_res, int* directed_res) { 
+    backend_spgraph_t *sg = (backend_spgraph_t *) g;
+    *n_res = sg->n;
+    *m_res = sg->m;
+    *directed_res = sg->directed;
+    return STATUS_SUCCESS;
+}
+
+#define SPSEARCH_DIJKSTRA 0
+#define SPSEARCH_BFS 1
+#define SPSEARCH_DELTA 2
+
+// The state of a search, which can be reused by subsequent searches on the 
+// same graph. Only the entries touched by a search are reset afterwards, so
+// that short searches do not pay for the size of the graph.
+
+typedef struct { 
+    int n;
+    double *dist;
+    int *pred_edge;
+    int *pred_vertex;
+    // binary heap of vertices keyed by their distance
+    int *heap;
+    int *pos;
+    int heap_size;
+    int *touched;
+    int touched_size;
+} backend_spsearch_t;
+
+static void spsearch_free(backend_spsearch_t *s) { 
+    free(s->dist);
+    free(s->pred_edge);
+    free(s->pred_vertex);
+    free(s->heap);
+    free(s->pos);
+    free(s->touched);
+    memset(s, 0, sizeof(backend_spsearch_t));
+}
+
+static int spsearch_init(backend_spsearch_t *s, int n) { 
+    int v;
+    size_t size = (size_t) n + 1;
+    s->n = n;
+    s->dist = malloc(size * sizeof(double));
+    s->pred_edge = malloc(size * sizeof(int));
+    s->pred_vertex = malloc(size * sizeof(int));
+    s->heap = malloc(size * sizeof(int));
+    s->pos = malloc(size * sizeof(int));
+    s->touched = malloc(size * sizeof(int));
+    s->heap_size = 0;
+    s->touched_size = 0;
+    if (s->dist == NULL || s->pred_edge == NULL || s->pred_vertex == NULL 
+        || s->heap == NULL || s->pos == NULL || s->touched == NULL) { 
+        spsearch_free(s);
+        return 0;
+    }
+    for (v = 0; v < n; v++) { 
+        s->dist[v] = INFINITY;
+        s->pred_edge[v] = -1;
+        s->pred_vertex[v] = -1;
+        s->pos[v] = -1;
+    }
+    return 1;
+}
+
+static void spsearch_reset(backend_spsearch_t *s) { 
+    int i, v;
+    for (i = 0; i < s->touched_size; i++) { 
+        v = s->touched[i];
+        s->dist[v] = INFINITY;
+        s->pred_edge[v] = -1;
+        s->pred_vertex[v] = -1;
+        s->pos[v] = -1;
+    }
+    s->touched_size = 0;
+    s->heap_size = 0;
+}
+
+static void heap_sift_up(backend_spsearch_t *s, int i) { 
+    int v = s->heap[i], parent;
+    double d = s->dist[v];
+    while (i > 0) { 
+        parent = (i - 1) >> 1;
+        if (s->dist[s->heap[parent]] <= d) { 
+            break;
+        }
+        s->heap[i] = s->heap[parent];
+        s->pos[s->heap[i]] = i;
+        i = parent;
+    }
+    s->heap[i] = v;
+    s->pos[v] = i;
+}
+
+static void heap_sift_down(backend_spsearch_t *s, int i) { 
+    int v = s->heap[i], child;
+    double d = s->dist[v];
+    while ((child = 2 * i + 1) < s->heap_size) { 
+        if (child + 1 < s->heap_size && s->dist[s->heap[child + 1]] < s->dist[s->heap[child]]) { 
+            child++;
+        }
+        if (d <= s->dist[s->heap[child]]) { 
+            break;
+        }
+        s->heap[i] = s->heap[child];
+        s->pos[s->heap[i]] = i;
+        i = child;
+    }
+    s->heap[i] = v;
+    s->pos[v] = i;
+}
+
+// Lower the distance of a vertex, inserting it into the heap if needed.
+static void spsearch_relax(backend_spsearch_t *s, int v, double d, int e, int u) { 
+    if (s->dist[v] == INFINITY && s->pos[v] == -1) { 
+        s->touched[s->touched_size++] = v;
+    }
+    s->dist[v] = d;
+    s->pred_edge[v] = e;
+    s->pred_vertex[v] = u;
+    if (s->pos[v] < 0) { 
+        s->heap[s->heap_size] = v;
+        s->pos[v] = s->heap_size++;
+    }
+    heap_sift_up(s, s->pos[v]);
+}
+
+static int spsearch_pop(backend_spsearch_t *s) { 
+    int v = s->heap[0];
+    // settled vertices are marked with -2
+    s->pos[v] = -2;
+    if (--s->heap_size > 0) { 
+        s->heap[0] = s->heap[s->heap_size];
+        s->pos[s->heap[0]] = 0;
+        heap_sift_down(s, 0);
+    }
+    return v;
+}
+
+// Dijkstra's algorithm from a source, following the incoming arcs if reverse 
+// is set. Stops after settling the target, if non-negative, or when the next
+// vertex is further than the radius.
+static void spsearch_dijkstra(const backend_spgraph_t *g, backend_spsearch_t *s, int source, int reverse, int target, double radius) { 
+    const int *offsets = reverse ? g->rev_offsets : g->offsets;
+    const int *targets = reverse ? g->rev_targets : g->targets;
+    const int *edges = reverse ? g->rev_edges : g->edges;
+    const double *weights = reverse ? g->rev_weights : g->weights;
+    int u, v, i;
+    double d;
+
+    spsearch_reset(s);
+    if (source < 0 || source >= g->n || !g->present[source]) { 
+        return;
+    }
+    spsearch_relax(s, source, 0.0, -1, -1);
+    while (s->heap_size > 0) { 
+        if (s->dist[s->heap[0]] > radius) { 
+            break;
+        }
+        u = spsearch_pop(s);
+        if (u == target) { 
+            break;
+        }
+        for (i = offsets[u]; i < offsets[u + 1]; i++) { 
+            v = targets[i];
+            d = s->dist[u] + weights[i];
+            if (d < s->dist[v] && s->pos[v] != -2) { 
+                spsearch_relax(s, v, d, edges[i], u);
+            }
+        }
+    }
+}
+
+// Search from a source, using either Dijkstra's algorithm or a breadth-first
+// search which counts hops. Settled vertices, whose distance is final, are 
+// marked in pos with -2. Stops after settling all targets, if is_target is 
+// given, or when the next vertex is further than the radius.
+static void spsearch_run(const backend_spgraph_t *g, backend_spsearch_t *s, int source, int algorithm, 
+    const unsigned char *is_target, int num_targets, double radius) { 
+    int u, v, i, head;
+    double d;
+
+    spsearch_reset(s);
+    if (source < 0 || source >= g->n || !g->present[source]) { 
+        return;
+    }
+
+    if (algorithm == SPSEARCH_BFS) { 
+        // the heap is used as a FIFO queue, vertices are settled when discovered
+        s->touched[s->touched_size++] = source;
+        s->dist[source] = 0.0;
+        s->pos[source] = -2;
+        s->heap[s->heap_size++] = source;
+        if (is_target != NULL && is_target[source] && --num_targets == 0) { 
+            return;
+        }
+        for (head = 0; head < s->heap_size; head++) { 
+            u = s->heap[head];
+            d = s->dist[u] + 1.0;
+            if (d > radius) { 
+                break;
+            }
+            for (i = g->offsets[u]; i < g->offsets[u + 1]; i++) { 
+                v = g->targets[i];
+                if (s->pos[v] == -2) { 
+                    continue;
+                }
+                s->touched[s->touched_size++] = v;
+                s->dist[v] = d;
+                s->pred_edge[v] = g->edges[i];
+                s->pred_vertex[v] = u;
+                s->pos[v] = -2;
+                s->heap[s->heap_size++] = v;
+                if (is_target != NULL && is_target[v] && --num_targets == 0) { 
+                    return;
+                }
+            }
+        }
+        return;
+    }
+
+    spsearch_relax(s, source, 0.0, -1, -1);
+    while (s->heap_size > 0) { 
+        if (s->dist[s->heap[0]] > radius) { 
+            break;
+        }
+        u = spsearch_pop(s);
+        if (is_target != NULL && is_target[u] && --num_targets == 0) { 
+            break;
+        }
+        for (i = g->offsets[u]; i < g->offsets[u + 1]; i++) { 
+            v = g->targets[i];
+            d = s->dist[u] + g->weights[i];
+            if (d < s->dist[v] && s->pos[v] != -2) { 
+                spsearch_relax(s, v, d, g->edges[i], u);
+            }
+        }
+    }
+}
+
+// Buckets of the delta-stepping algorithm, indexed cyclically. Vertices may 
+// appear in more than one bucket and stale entries are skipped when removed.
+
+#define SPBUCKETS_MAX_COUNT (1 << 20)
+
+typedef struct { 
+    int *items;
+    int size;
+    int capacity;
+} spbucket_t;
+
+typedef struct { 
+    double delta;
+    int count;
+    spbucket_t *buckets;
+    // vertices removed from the current bucket
+    spbucket_t removed;
+} spbuckets_t;
+
+static int spbucket_push(spbucket_t *b, int v) { 
+    int *items;
+    if (b->size == b->capacity) { 
+        items = realloc(b->items, ((size_t) b->capacity * 2 + 4) * sizeof(int));
+        if (items == NULL) { 
+            return 0;
+        }
+        b->items = items;
+        b->capacity = b->capacity * 2 + 4;
+    }
+    b->items[b->size++] = v;
+    return 1;
+}
+
+static void spbuckets_free(spbuckets_t *q) { 
+    int i;
+    for (i = 0; q->buckets != NULL && i < q->count; i++) { 
+        free(q->buckets[i].items);
+    }
+    free(q->buckets);
+    free(q->removed.items);
+    memset(q, 0, sizeof(spbuckets_t));
+}
+
+// Choose the bucket width, unless given, as the maximum edge weight over the
+// maximum degree. The number of buckets must cover the maximum edge weight.
+static int spbuckets_init(spbuckets_t *q, const backend_spgraph_t *g, double delta) { 
+    double max_weight = 0.0;
+    int i, max_degree = 1;
+
+    memset(q, 0, sizeof(spbuckets_t));
+    for (i = 0; i < g->m; i++) { 
+        if (g->weights[i] > max_weight) { 
+            max_weight = g->weights[i];
+        }
+    }
+    for (i = 0; i < g->n; i++) { 
+        if (g->offsets[i + 1] - g->offsets[i] > max_degree) { 
+            max_degree = g->offsets[i + 1] - g->offsets[i];
+        }
+    }
+    if (!(delta > 0.0)) { 
+        delta = max_weight > 0.0 ? max_weight / max_degree : 1.0;
+    }
+    if (max_weight / delta > SPBUCKETS_MAX_COUNT - 2) { 
+        delta = max_weight / (SPBUCKETS_MAX_COUNT - 2);
+    }
+    q->delta = delta;
+    q->count = (int) (max_weight / delta) + 2;
+    q->buckets = calloc((size_t) q->count, sizeof(spbucket_t));
+    return q->buckets != NULL;
+}
+
+static int spsearch_delta_relax(backend_spsearch_t *s, spbuckets_t *q, int v, double d, int e, int u) { 
+    if (s->dist[v] == INFINITY && s->pos[v] == -1) { 
+        s->touched[s->touched_size++] = v;
+    }
+    s->dist[v] = d;
+    s->pred_edge[v] = e;
+    s->pred_vertex[v] = u;
+    // the vertex must be processed again at its new distance
+    s->pos[v] = -1;
+    return spbucket_push(&q->buckets[(long long) (d / q->delta) % q->count], v);
+}
+
+// The delta-stepping algorithm, executed sequentially, with the same 
+// semantics as spsearch_run(). Vertices are settled one bucket at a time, 
+// after relaxing the light edges of the bucket until it becomes empty and 
+// then the heavy edges of all its vertices. Returns zero if out of memory.
+static int spsearch_delta(const backend_spgraph_t *g, backend_spsearch_t *s, spbuckets_t *q, int source, 
+    const unsigned char *is_target, int num_targets, double radius) { 
+    spbucket_t *bucket;
+    long long current = 0;
+    long long pending = 1;
+    int u, v, i, j;
+    double d;
+
+    spsearch_reset(s);
+    for (i = 0; i < q->count; i++) { 
+        q->buckets[i].size = 0;
+    }
+    if (source < 0 || source >= g->n || !g->present[source]) { 
+        return 1;
+    }
+    if (!spsearch_delta_relax(s, q, source, 0.0, -1, -1)) { 
+        return 0;
+    }
+
+    // pos is -1 for vertices in some bucket, -3 for vertices removed from the
+    // current bucket and -2 for settled vertices
+    for (; pending > 0 && current * q->delta <= radius; current++) { 
+        bucket = &q->buckets[current % q->count];
+        q->removed.size = 0;
+        while (bucket->size > 0) { 
+            u = bucket->items[--bucket->size];
+            pending--;
+            if (s->pos[u] != -1 || (long long) (s->dist[u] / q->delta) != current) { 
+                continue;
+            }
+            s->pos[u] = -3;
+            if (!spbucket_push(&q->removed, u)) { 
+                return 0;
+            }
+            for (i = g->offsets[u]; i < g->offsets[u + 1]; i++) { 
+                v = g->targets[i];
+                d = s->dist[u] + g->weights[i];
+                if (g->weights[i] <= q->delta && d < s->dist[v] && s->pos[v] != -2) { 
+                    if (!spsearch_delta_relax(s, q, v, d, g->edges[i], u)) { 
+                        return 0;
+                    }
+                    pending++;
+                }
+            }
+        }
+        for (j = 0; j < q->removed.size; j++) { 
+            u = q->removed.items[j];
+            if (s->pos[u] == -3) { 
+                s->pos[u] = -2;
+                if (is_target != NULL && is_target[u]) { 
+                    num_targets--;
+                }
+            }
+        }
+        if (is_target != NULL && num_targets <= 0) { 
+            break;
+        }
+        for (j = 0; j < q->removed.size; j++) { 
+            u = q->removed.items[j];
+            for (i = g->offsets[u]; i < g->offsets[u + 1]; i++) { 
+                v = g->targets[i];
+                d = s->dist[u] + g->weights[i];
+                if (g->weights[i] > q->delta && d < s->dist[v] && s->pos[v] != -2) { 
+                    if (!spsearch_delta_relax(s, q, v, d, g->edges[i], u)) { 
+                        return 0;
+                    }
+                    pending++;
+                }
+            }
+        }
+    }
+    return 1;
+}
+
+// Batches of searches from many sources, executed by a number of workers in
+// parallel. Each worker owns a search state and takes the next source from a
+// shared counter. Workers never call into the capi, thus they need not be 
+// attached to the isolate.
+
+typedef struct spbatch spbatch_t;
+
+struct spbatch { 
+    const backend_spgraph_t *g;
+    const int *sources;
+    int count;
+    int algorithm;
+    double delta;
+    double radius;
+    const unsigned char *is_target;
+    int num_targets;
+    // stop at the first target other than the source
+    int first_target;
+    volatile long next;
+    // called with the state of the search from the source at index
+    void (*visit)(spbatch_t *b, int worker, int index, const backend_spsearch_t *s);
+    void *ctx;
+};
+
+typedef struct { 
+    spbatch_t *batch;
+    int id;
+    int processed;
+} spbatch_worker_t;
+
+static void spbatch_worker(void *value) { 
+    spbatch_worker_t *w = (spbatch_worker_t *) value;
+    spbatch_t *b = w->batch;
+    backend_spsearch_t s;
+    spbuckets_t q;
+    long i;
+    int source, num_targets;
+
+    memset(&s, 0, sizeof(backend_spsearch_t));
+    memset(&q, 0, sizeof(spbuckets_t));
+    if (!spsearch_init(&s, b->g->n) || (b->algorithm == SPSEARCH_DELTA && !spbuckets_init(&q, b->g, b->delta))) { 
+        spsearch_free(&s);
+        spbuckets_free(&q);
+        return;
+    }
+    while ((i = backend_atomic_next(&b->next)) < b->count) { 
+        source = b->sources[i];
+        num_targets = b->num_targets;
+        if (b->is_target != NULL && b->first_target) { 
+            // the source itself does not count
+            num_targets = b->is_target[source] ? 2 : 1;
+        }
+        if (b->algorithm == SPSEARCH_DELTA) { 
+            if (!spsearch_delta(b->g, &s, &q, source, b->is_target, num_targets, b->radius)) { 
+                break;
+            }
+        } else { 
+            spsearch_run(b->g, &s, source, b->algorithm, b->is_target, num_targets, b->radius);
+        }
+        b->visit(b, w->id, (int) i, &s);
+        w->processed++;
+    }
+    spsearch_free(&s);
+    spbuckets_free(&q);
+}
+
+static int spbatch_check(const backend_spgraph_t *g, const int *vertices, int count, int algorithm) { 
+    int i;
+    if (algorithm != SPSEARCH_DIJKSTRA && algorithm != SPSEARCH_BFS && algorithm != SPSEARCH_DELTA) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Unknown algorithm");
+    }
+    if (algorithm != SPSEARCH_BFS && g->negative) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Negative edge weights are not supported");
+    }
+    for (i = 0; i < count; i++) { 
+        if (vertices[i] < 0 || vertices[i] >= g->n || !g->present[vertices[i]]) { 
+            return backend_error(STATUS_ILLEGAL_ARGUMENT, "Vertex not in the graph");
+        }
+    }
+    return STATUS_SUCCESS;
+}
+
+// Check that the vertices are valid sources for the algorithm.
+int jgrapht_spgraph_check(void *g, int *vertices, int vertices_len, int algorithm) { 
+    return spbatch_check((backend_spgraph_t *) g, vertices, vertices_len, algorithm);
+}
+
+// Run a batch using the given number of workers, which is bounded by the 
+// number of sources.
+static int spbatch_run(spbatch_t *b, int workers) { 
+    spbatch_worker_t *ws;
+    void **args;
+    int i, processed = 0;
+
+    if (b->count == 0) { 
+        return STATUS_SUCCESS;
+    }
+    if (workers > b->count) { 
+        workers = b->count;
+    }
+    if (workers < 1) { 
+        workers = 1;
+    }
+    ws = calloc((size_t) workers, sizeof(spbatch_worker_t));
+    args = calloc((size_t) workers, sizeof(void *));
+    if (ws == NULL || args == NULL) { 
+        free(ws);
+        free(args);
+        return backend_error(STATUS_ERROR, "Out of memory");
+    }
+    b->next = 0;
+    for (i = 0; i < workers; i++) { 
+        ws[i].batch = b;
+        ws[i].id = i;
+        args[i] = &ws[i];
+    }
+    backend_run_parallel(spbatch_worker, args, workers);
+    for (i = 0; i < workers; i++) { 
+        processed += ws[i].processed;
+    }
+    free(ws);
+    free(args);
+    if (processed < b->count) { 
+        return backend_error(STATUS_ERROR, "Out of memory");
+    }
+    return STATUS_SUCCESS;
+}
+
+typedef struct { 
+    const int *targets;
+    int num_targets;
+    double *dist;
+    float *fdist;
+    int *pred;
+} spmatrix_t;
+
+static void spmatrix_visit(spbatch_t *b, int worker, int index, const backend_spsearch_t *s) { 
+    spmatrix_t *m = (spmatrix_t *) b->ctx;
+    size_t offset = (size_t) index * m->num_targets;
+    int *pred_row;
+    int j, v;
+
+    if (m->fdist != NULL) { 
+        for (j = 0; j < m->num_targets; j++) { 
+            v = m->targets[j];
+            m->fdist[offset + j] = s->pos[v] == -2 ? (float) s->dist[v] : INFINITY;
+        }
+    } else { 
+        for (j = 0; j < m->num_targets; j++) { 
+            v = m->targets[j];
+            m->dist[offset + j] = s->pos[v] == -2 ? s->dist[v] : INFINITY;
+        }
+    }
+    if (m->pred != NULL) { 
+        pred_row = m->pred + (size_t) index * b->g->n;
+        for (v = 0; v < b->g->n; v++) { 
+            pred_row[v] = -1;
+        }
+        for (j = 0; j < s->touched_size; j++) { 
+            v = s->touched[j];
+            if (s->pos[v] == -2) { 
+                pred_row[v] = s->pred_vertex[v];
+            }
+        }
+    }
+}
+
+static int spmatrix_run(void *g, int *sources, int sources_len, int *targets, int targets_len, 
+    int algorithm, int workers, double *dist, float *fdist, int dist_len, int *pred, int pred_len) { 
+    backend_spgraph_t *sg = (backend_spgraph_t *) g;
+    spbatch_t batch;
+    spmatrix_t matrix;
+    unsigned char *is_target;
+    int j, num_targets = 0, status;
+
+    if ((status = spbatch_check(sg, sources, sources_len, algorithm)) != STATUS_SUCCESS 
+        || (status = spbatch_check(sg, targets, targets_len, algorithm)) != STATUS_SUCCESS) { 
+        return status;
+    }
+    if ((long long) dist_len != (long long) sources_len * targets_len 
+        || (pred_len != 0 && (long long) pred_len != (long long) sources_len * sg->n)) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Arrays do not match the matrix");
+    }
+    if ((is_target = calloc((size_t) sg->n + 1, sizeof(unsigned char))) == NULL) { 
+        return backend_error(STATUS_ERROR, "Out of memory");
+    }
+    for (j = 0; j < targets_len; j++) { 
+        if (!is_target[targets[j]]) { 
+            is_target[targets[j]] = 1;
+            num_targets++;
+        }
+    }
+
+    matrix.targets = targets;
+    matrix.num_targets = targets_len;
+    matrix.dist = dist;
+    matrix.fdist = fdist;
+    matrix.pred = pred_len != 0 ? pred : NULL;
+
+    memset(&batch, 0, sizeof(spbatch_t));
+    batch.g = sg;
+    batch.sources = sources;
+    batch.count = sources_len;
+    batch.algorithm = algorithm;
+    batch.radius = INFINITY;
+    // with predecessors the whole trees are needed
+    batch.is_target = matrix.pred == NULL ? is_target : NULL;
+    batch.num_targets = num_targets;
+    batch.visit = spmatrix_visit;
+    batch.ctx = &matrix;
+
+    status = spbatch_run(&batch, workers);
+    free(is_target);
+    return status;
+}
+
+// Compute the distances from each source to each target, as a row-major 
+// matrix with one row per source. Optionally also compute the predecessor of
+// each vertex in the shortest path tree of each source, as a matrix with one 
+// row per source and one column per vertex row of the graph, using -1 for 
+// vertices not in the tree. The sources are processed in parallel.
+int jgrapht_spgraph_distance_matrix(void *g, int *sources, int sources_len, int *targets, int targets_len, 
+    int algorithm, int workers, double *dist, int dist_len, int *pred, int pred_len) { 
+    return spmatrix_run(g, sources, sources_len, targets, targets_len, algorithm, workers, 
+        dist, NULL, dist_len, pred, pred_len);
+}
+
+// Same as above but with single precision distances and without predecessors. 
+// Used to fill large matrices block by block, directly into their final storage.
+int jgrapht_spgraph_distance_matrix_float(void *g, int *sources, int sources_len, int *targets, int targets_len, 
+    int algorithm, int workers, float *dist, int dist_len) { 
+    return spmatrix_run(g, sources, sources_len, targets, targets_len, algorithm, workers, 
+        NULL, dist, dist_len, NULL, 0);
+}
+
+#define SPREDUCE_NONE 0
+#define SPREDUCE_SUM 1
+#define SPREDUCE_MIN 2
+#define SPREDUCE_COUNT 3
+
+typedef struct { 
+    int reducer;
+    double *values;
+} spreduce_t;
+
+// Either store the distances of all vertices as a row, indexed by vertex, or
+// reduce the distances of the settled targets (all vertices if no targets are
+// given) other than the source to a single value.
+static void spreduce_visit(spbatch_t *b, int worker, int index, const backend_spsearch_t *s) { 
+    spreduce_t *r = (spreduce_t *) b->ctx;
+    double *row, d, value;
+    int i, v, source = b->sources[index];
+
+    if (r->reducer == SPREDUCE_NONE) { 
+        row = r->values + (size_t) index * b->g->n;
+        for (v = 0; v < b->g->n; v++) { 
+            row[v] = b->g->present[v] ? INFINITY : NAN;
+        }
+        for (i = 0; i < s->touched_size; i++) { 
+            v = s->touched[i];
+            if (s->pos[v] == -2 && s->dist[v] <= b->radius) { 
+                row[v] = s->dist[v];
+            }
+        }
+        return;
+    }
+
+    value = r->reducer == SPREDUCE_MIN ? INFINITY : 0.0;
+    for (i = 0; i < s->touched_size; i++) { 
+        v = s->touched[i];
+        d = s->dist[v];
+        if (v == source || s->pos[v] != -2 || d > b->radius || (b->is_target != NULL && !b->is_target[v])) { 
+            continue;
+        }
+        switch (r->reducer) { 
+        case SPREDUCE_SUM:
+            value += d;
+            break;
+        case SPREDUCE_MIN:
+            value = d < value ? d : value;
+            break;
+        default:
+            value += 1.0;
+            break;
+        }
+    }
+    r->values[index] = value;
+}
+
+// Shortest paths from many sources, processed in parallel. Without a reducer
+// the distances from each source are stored as a row-major matrix with one 
+// row per source and one column per vertex row of the graph, using infinity 
+// for unreachable vertices and NaN for identifiers not corresponding to any 
+// vertex. With a reducer a single value is stored per source: the sum of the 
+// distances to the reachable targets, the distance to the closest target or 
+// the number of targets within the radius. Targets default to all vertices 
+// and the source itself is never counted. Searches stop at the radius.
+int jgrapht_spgraph_multi_source(void *g, int *sources, int sources_len, int *targets, int targets_len, 
+    int algorithm, double delta, double radius, int reducer, int workers, double *values, int values_len) { 
+    backend_spgraph_t *sg = (backend_spgraph_t *) g;
+    spbatch_t batch;
+    spreduce_t reduce;
+    unsigned char *is_target = NULL;
+    int j, num_targets = 0, status;
+
+    if (reducer < SPREDUCE_NONE || reducer > SPREDUCE_COUNT) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Unknown reducer");
+    }
+    if ((status = spbatch_check(sg, sources, sources_len, algorithm)) != STATUS_SUCCESS 
+        || (status = spbatch_check(sg, targets, targets_len, algorithm)) != STATUS_SUCCESS) { 
+        return status;
+    }
+    if ((long long) values_len != (reducer == SPREDUCE_NONE ? (long long) sources_len * sg->n : (long long) sources_len)) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Array does not match the sources");
+    }
+    // the closest target is searched among all vertices if none are given
+    if (reducer != SPREDUCE_NONE && (targets_len > 0 || reducer == SPREDUCE_MIN)) { 
+        if ((is_target = calloc((size_t) sg->n + 1, sizeof(unsigned char))) == NULL) { 
+            return backend_error(STATUS_ERROR, "Out of memory");
+        }
+        for (j = 0; j < targets_len; j++) { 
+            if (!is_target[targets[j]]) { 
+                is_target[targets[j]] = 1;
+                num_targets++;
+            }
+        }
+        if (targets_len == 0) { 
+            memcpy(is_target, sg->present, (size_t) sg->n * sizeof(unsigned char));
+        }
+    }
+
+    reduce.reducer = reducer;
+    reduce.values = values;
+
+    memset(&batch, 0, sizeof(spbatch_t));
+    batch.g = sg;
+    batch.sources = sources;
+    batch.count = sources_len;
+    batch.algorithm = algorithm;
+    batch.delta = delta;
+    batch.radius = radius;
+    batch.is_target = is_target;
+    batch.num_targets = num_targets;
+    batch.first_target = reducer == SPREDUCE_MIN;
+    batch.visit = spreduce_visit;
+    batch.ctx = &reduce;
+
+    status = spbatch_run(&batch, workers);
+    free(is_target);
+    return status;
+}
+
+// heuristics
+//
+// Heuristics for A* computed natively, without calling into Python, either 
+// from per-vertex coordinates or from distances to and from a set of landmarks
+// (ALT heuristic).
+
+#define HEURISTIC_SLOTS BACKEND_SLOTS_COUNT
+
+#define HEURISTIC_EUCLIDEAN 0
+#define HEURISTIC_MANHATTAN 1
+#define HEURISTIC_HAVERSINE 2
+#define HEURISTIC_LANDMARKS 3
+
+#define LANDMARKS_RANDOM 0
+#define LANDMARKS_FARTHEST 1
+
+// mean earth radius in meters
+#define EARTH_RADIUS 6371008.8
+
+typedef struct { 
+    int used;
+    int metric;
+    double scale;
+    int size;
+    double *x;
+    double *y;
+    // cosine of the latitude, for the haversine metric
+    double *cos_y;
+    // landmarks and their distances, one row of size per landmark, for the 
+    // landmarks metric. Distances to the landmarks are not kept for undirected 
+    // graphs, where they are equal to the distances from the landmarks.
+    int k;
+    int *landmarks;
+    double *from;
+    double *to;
+} backend_heuristic_t;
+
+static backend_heuristic_t heuristics[HEURISTIC_SLOTS];
+
+static double landmarks_value(backend_heuristic_t *h, long long s, long long t) { 
+    int l;
+    double best = 0.0;
+    const double *from, *to;
+    for (l = 0; l < h->k; l++) { 
+        from = h->from + (size_t) l * h->size;
+        to = h->to != NULL ? h->to + (size_t) l * h->size : from;
+        // by the triangle inequality d(s,t) >= d(l,t) - d(l,s) and d(s,t) >= d(s,l) - d(t,l)
+        if (from[s] < INFINITY && from[t] < INFINITY && from[t] - from[s] > best) { 
+            best = from[t] - from[s];
+        }
+        if (to[s] < INFINITY && to[t] < INFINITY && to[s] - to[t] > best) { 
+            best = to[s] - to[t];
+        }
+    }
+    return best;
+}
+
+static double heuristic_value(backend_heuristic_t *h, long long s, long long t) { 
+    double dx, dy, a;
+    if (s < 0 || t < 0 || s >= h->size || t >= h->size) { 
+        return 0.0;
+    }
+    switch(h->metric) { 
+    case HEURISTIC_LANDMARKS:
+        return landmarks_value(h, s, t);
+    case HEURISTIC_MANHATTAN:
+        dx = fabs(h->x[s] - h->x[t]);
+        dy = fabs(h->y[s] - h->y[t]);
+        a = dx + dy;
+        break;
+    case HEURISTIC_HAVERSINE:
+        dx = sin((h->x[t] - h->x[s]) / 2.0);
+        dy = sin((h->y[t] - h->y[s]) / 2.0);
+        a = dy * dy + h->cos_y[s] * h->cos_y[t] * dx * dx;
+        a = 2.0 * EARTH_RADIUS * asin(sqrt(a < 1.0 ? a : 1.0));
+        break;
+    case HEURISTIC_EUCLIDEAN:
+    default:
+        dx = h->x[s] - h->x[t];
+        dy = h->y[s] - h->y[t];
+        a = sqrt(dx * dx + dy * dy);
+        break;
+    }
+    // vertices without coordinates are given as NaN
+    if (a != a) { 
+        return 0.0;
+    }
+    return h->scale * a;
+}
+
+#define HEURISTIC_CALLBACK(N) \
+    static double backend_heuristic_##N(long long s, long long t) { return heuristic_value(&heuristics[N], s, t); }
+
+#define HEURISTIC_ENTRY(N) backend_heuristic_##N,
+
+BACKEND_SLOTS(HEURISTIC_CALLBACK)
+
+typedef double (*backend_heuristic_callback_t)(long long, long long);
+
+static backend_heuristic_callback_t heuristic_callbacks[HEURISTIC_SLOTS] = { 
+    BACKEND_SLOTS(HEURISTIC_ENTRY)
+};
+
+static void heuristic_free(backend_heuristic_t *h) { 
+    free(h->x);
+    free(h->y);
+    free(h->cos_y);
+    free(h->landmarks);
+    free(h->from);
+    free(h->to);
+    h->x = h->y = h->cos_y = NULL;
+    h->landmarks = NULL;
+    h->from = h->to = NULL;
+    h->size = 0;
+    h->k = 0;
+}
+
+static int heuristic_acquire(int *res) { 
+    int slot;
+    isolate_lock_acquire();
+    for (slot = 0; slot < HEURISTIC_SLOTS; slot++) { 
+        if (!heuristics[slot].used) { 
+            heuristics[slot].used = 1;
+            break;
+        }
+    }
+    isolate_lock_release();
+    if (slot == HEURISTIC_SLOTS) { 
+        return backend_error(STATUS_ERROR, "Too many heuristics in use");
+    }
+    *res = slot;
+    return STATUS_SUCCESS;
+}
+
+static void heuristic_release(int slot) { 
+    isolate_lock_acquire();
+    heuristic_free(&heuristics[slot]);
+    heuristics[slot].used = 0;
+    isolate_lock_release();
+}
+
+int jgrapht_heuristic_create(int metric, double scale, double *x, int x_size, double *y, int y_size, int* res) { 
+    int slot, i, status;
+    backend_heuristic_t *h;
+
+    if (metric < HEURISTIC_EUCLIDEAN || metric > HEURISTIC_HAVERSINE) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Unknown heuristic metric");
+    }
+    if (x_size != y_size) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Coordinate arrays must have the same length");
+    }
+    if (!(scale >= 0.0)) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Heuristic scale must be non-negative");
+    }
+    if ((status = heuristic_acquire(&slot)) != STATUS_SUCCESS) { 
+        return status;
+    }
+
+    h = &heuristics[slot];
+    h->metric = metric;
+    h->scale = scale;
+    h->x = (double *) malloc(sizeof(double) * (x_size > 0 ? x_size : 1));
+    h->y = (double *) malloc(sizeof(double) * (x_size > 0 ? x_size : 1));
+    h->cos_y = NULL;
+    if (metric == HEURISTIC_HAVERSINE) { 
+        h->cos_y = (double *) malloc(sizeof(double) * (x_size > 0 ? x_size : 1));
+    }
+    if (h->x == NULL || h->y == NULL || (metric == HEURISTIC_HAVERSINE && h->cos_y == NULL)) { 
+        heuristic_release(slot);
+        return backend_error(STATUS_ERROR, "Failed to allocate heuristic");
+    }
+    for (i = 0; i < x_size; i++) { 
+        if (metric == HEURISTIC_HAVERSINE) { 
+            // longitude and latitude in degrees
+            h->x[i] = x[i] * M_PI / 180.0;
+            h->y[i] = y[i] * M_PI / 180.0;
+            h->cos_y[i] = cos(h->y[i]);
+        } else { 
+            h->x[i] = x[i];
+            h->y[i] = y[i];
+        }
+    }
+    h->size = x_size;
+
+    *res = slot;
+    return STATUS_SUCCESS;
 }
 
-int jgrapht_graph_add_edge(void *g, int u, int v, int* res) { 
-    return jgrapht_capi_graph_add_edge(thread, g, u, v, res);
+int jgrapht_heuristic_destroy(int slot) { 
+    if (slot < 0 || slot >= HEURISTIC_SLOTS || !heuristics[slot].used) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid heuristic");
+    }
+    heuristic_release(slot);
+    return STATUS_SUCCESS;
 }
 
-int jgrapht_graph_add_given_edge(void *g, int u, int v, int edge, int* res) { 
-    return jgrapht_capi_graph_add_given_edge(thread, g, u, v, edge, res);
+int jgrapht_heuristic_get_callback(int slot, long long* res) { 
+    if (slot < 0 || slot >= HEURISTIC_SLOTS || !heuristics[slot].used) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid heuristic");
+    }
+    *res = (long long) (intptr_t) heuristic_callbacks[slot];
+    return STATUS_SUCCESS;
 }
 
-int jgrapht_graph_remove_edge(void *g, int e, int* res) { 
-    return jgrapht_capi_graph_remove_edge(thread, g, e, res);
+int jgrapht_heuristic_get_memory(int slot, long long* res) { 
+    backend_heuristic_t *h;
+    long long rows;
+    if (slot < 0 || slot >= HEURISTIC_SLOTS || !heuristics[slot].used) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid heuristic");
+    }
+    h = &heuristics[slot];
+    if (h->metric == HEURISTIC_LANDMARKS) { 
+        rows = h->to != NULL ? 2LL * h->k : (long long) h->k;
+        *res = rows * h->size * (long long) sizeof(double) + h->k * (long long) sizeof(int);
+    } else { 
+        *res = (h->cos_y != NULL ? 3LL : 2LL) * h->size * (long long) sizeof(double);
+    }
+    return STATUS_SUCCESS;
 }
 
-int jgrapht_graph_contains_edge(void *g, int e, int* res) { 
-    return jgrapht_capi_graph_contains_edge(thread, g, e, res);
+static unsigned long long splitmix64(unsigned long long *state) { 
+    unsigned long long z = (*state += 0x9E3779B97F4A7C15ULL);
+    z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL;
+    z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL;
+    return z ^ (z >> 31);
 }
 
-int jgrapht_graph_contains_edge_between(void *g, int u, int v, int* res) { 
-    return jgrapht_capi_graph_contains_edge_between(thread, g, u, v, res);
-}
+static int landmarks_alloc(backend_heuristic_t *h, int k, int size, int directed) { 
+    size_t cells = (size_t) k * (size > 0 ? size : 1);
+    h->metric = HEURISTIC_LANDMARKS;
+    h->scale = 1.0;
+    h->landmarks = malloc(((size_t) k + 1) * sizeof(int));
+    h->from = malloc(cells * sizeof(double));
+    h->to = directed ? malloc(cells * sizeof(double)) : NULL;
+    if (h->landmarks == NULL || h->from == NULL || (directed && h->to == NULL)) { 
+        return 0;
+    }
+    h->k = k;
+    h->size = size;
+    return 1;
+}
+
+// Select landmarks and compute the distances from and to them. Landmarks are 
+// either given or selected randomly or as far apart from each other as possible
+// (farthest selection), starting from a random vertex.
+int jgrapht_heuristic_landmarks_compute(void *g, int *landmarks, int landmarks_len, int num_landmarks, int selection, long long seed, int* res) { 
+    backend_spgraph_t *sg = (backend_spgraph_t *) g;
+    backend_spsearch_t search;
+    backend_heuristic_t *h;
+    double *mindist = NULL, *row;
+    int *candidates = NULL;
+    unsigned long long state = (unsigned long long) seed;
+    int i, j, v, l, k, count, start, slot, status;
+
+    memset(&search, 0, sizeof(backend_spsearch_t));
+    if (sg->negative) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Landmarks require non-negative edge weights");
+    }
+    if (selection != LANDMARKS_RANDOM && selection != LANDMARKS_FARTHEST) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Unknown landmark selection");
+    }
+    if ((candidates = malloc(((size_t) sg->n + 1) * sizeof(int))) == NULL) { 
+        return backend_error(STATUS_ERROR, "Out of memory");
+    }
+    count = 0;
+    for (v = 0; v < sg->n; v++) { 
+        if (sg->present[v]) { 
+            candidates[count++] = v;
+        }
+    }
+    if (landmarks_len > 0) { 
+        k = landmarks_len;
+        for (l = 0; l < k; l++) { 
+            if (landmarks[l] < 0 || landmarks[l] >= sg->n || !sg->present[landmarks[l]]) { 
+                free(candidates);
+                return backend_error(STATUS_ILLEGAL_ARGUMENT, "Landmark is not a vertex of the graph");
+            }
+        }
+    } else { 
+        k = num_landmarks < count ? num_landmarks : count;
+    }
+    if (k <= 0) { 
+        free(candidates);
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "At least one landmark is required");
+    }
 
-int jgrapht_graph_degree_of(void *g, int v, int* res) { 
-    return jgrapht_capi_graph_degree_of(thread, g, v, res);
-}
+    if ((status = heuristic_acquire(&slot)) != STATUS_SUCCESS) { 
+        free(candidates);
+        return status;
+    }
+    h = &heuristics[slot];
+    if (!landmarks_alloc(h, k, sg->n, sg->directed) || !spsearch_init(&search, sg->n)
+        || (selection == LANDMARKS_FARTHEST && (mindist = malloc(((size_t) sg->n + 1) * sizeof(double))) == NULL)) { 
+        free(candidates);
+        spsearch_free(&search);
+        heuristic_release(slot);
+        return backend_error(STATUS_ERROR, "Out of memory");
+    }
 
-int jgrapht_graph_indegree_of(void *g, int v, int* res) { 
-    return jgrapht_capi_graph_indegree_of(thread, g, v, res);
-}
+    if (landmarks_len > 0) { 
+        memcpy(h->landmarks, landmarks, (size_t) k * sizeof(int));
+    } else if (selection == LANDMARKS_RANDOM) { 
+        // partial Fisher-Yates shuffle
+        for (l = 0; l < k; l++) { 
+            j = l + (int) (splitmix64(&state) % (unsigned long long) (count - l));
+            v = candidates[j];
+            candidates[j] = candidates[l];
+            candidates[l] = v;
+            h->landmarks[l] = v;
+        }
+    } else { 
+        // the first landmark is the farthest vertex from a random one
+        start = candidates[splitmix64(&state) % (unsigned long long) count];
+        spsearch_dijkstra(sg, &search, start, 0, -1, INFINITY);
+        for (v = 0; v < sg->n; v++) { 
+            mindist[v] = search.dist[v];
+        }
+    }
 
-int jgrapht_graph_outdegree_of(void *g, int v, int* res) { 
-    return jgrapht_capi_graph_outdegree_of(thread, g, v, res);
-}
+    for (l = 0; l < k; l++) { 
+        if (landmarks_len == 0 && selection == LANDMARKS_FARTHEST) { 
+            // pick the vertex maximizing the distance to the closest landmark, 
+            // preferring unreachable ones which belong to other components
+            v = -1;
+            for (i = 0; i < count; i++) { 
+                j = candidates[i];
+                if (v == -1 || mindist[j] > mindist[v]) { 
+                    v = j;
+                }
+            }
+            h->landmarks[l] = v;
+            // never pick the same landmark twice
+            mindist[v] = -1.0;
+        }
+        row = h->from + (size_t) l * sg->n;
+        spsearch_dijkstra(sg, &search, h->landmarks[l], 0, -1, INFINITY);
+        for (v = 0; v < sg->n; v++) { 
+            row[v] = search.dist[v];
+            if (mindist != NULL && row[v] < mindist[v]) { 
+                mindist[v] = row[v];
+            }
+        }
+        if (h->to != NULL) { 
+            row = h->to + (size_t) l * sg->n;
+            spsearch_dijkstra(sg, &search, h->landmarks[l], 1, -1, INFINITY);
+            for (v = 0; v < sg->n; v++) { 
+                row[v] = search.dist[v];
+            }
+        }
+    }
 
-int jgrapht_graph_edge_source(void *g, int v, int* res) { 
-    return jgrapht_capi_graph_edge_source(thread, g, v, res);
+    free(candidates);
+    free(mindist);
+    spsearch_free(&search);
+    *res = slot;
+    return STATUS_SUCCESS;
 }
 
-int jgrapht_graph_edge_target(void *g, int v, int* res) { 
-    return jgrapht_capi_graph_edge_target(thread, g, v, res);
-}
+// Create a landmarks heuristic from previously computed distances, with one 
+// row per landmark. The distances to the landmarks are empty for undirected 
+// graphs.
+int jgrapht_heuristic_landmarks_create(int *landmarks, int landmarks_len, double *from, int from_len, double *to, int to_len, int* res) { 
+    backend_heuristic_t *h;
+    int slot, size, status;
 
-int jgrapht_graph_is_weighted(void *g, int* res) { 
-    return jgrapht_capi_graph_is_weighted(thread, g, res);
+    if (landmarks_len <= 0 || from_len % landmarks_len != 0 || (to_len != 0 && to_len != from_len)) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Distances do not match the landmarks");
+    }
+    size = from_len / landmarks_len;
+    if ((status = heuristic_acquire(&slot)) != STATUS_SUCCESS) { 
+        return status;
+    }
+    h = &heuristics[slot];
+    if (!landmarks_alloc(h, landmarks_len, size, to_len != 0)) { 
+        heuristic_release(slot);
+        return backend_error(STATUS_ERROR, "Out of memory");
+    }
+    memcpy(h->landmarks, landmarks, (size_t) landmarks_len * sizeof(int));
+    memcpy(h->from, from, (size_t) from_len * sizeof(double));
+    if (to_len != 0) { 
+        memcpy(h->to, to, (size_t) to_len * sizeof(double));
+    }
+    *res = slot;
+    return STATUS_SUCCESS;
 }
 
-int jgrapht_graph_is_directed(void *g, int* res) { 
-    return jgrapht_capi_graph_is_directed(thread, g, res);
+static backend_heuristic_t *landmarks_heuristic(int slot) { 
+    if (slot < 0 || slot >= HEURISTIC_SLOTS || !heuristics[slot].used || heuristics[slot].metric != HEURISTIC_LANDMARKS) { 
+        return NULL;
+    }
+    return &heuristics[slot];
 }
 
-int jgrapht_graph_is_undirected(void *g, int* res) { 
-    return jgrapht_capi_graph_is_undirected(thread, g, res);
+int jgrapht_heuristic_landmarks_get_info(int slot, int* k_res, int* size_res, int* directed_res) { 
+    backend_heuristic_t *h = landmarks_heuristic(slot);
+    if (h == NULL) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid landmarks heuristic");
+    }
+    *k_res = h->k;
+    *size_res = h->size;
+    *directed_res = h->to != NULL;
+    return STATUS_SUCCESS;
 }
 
-int jgrapht_graph_is_allowing_selfloops(void *g, int* res) { 
-    return jgrapht_capi_graph_is_allowing_selfloops(thread, g, res);
+int jgrapht_heuristic_landmarks_get(int slot, int *landmarks, int landmarks_len, double *from, int from_len, double *to, int to_len) { 
+    backend_heuristic_t *h = landmarks_heuristic(slot);
+    size_t cells;
+    if (h == NULL) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid landmarks heuristic");
+    }
+    cells = (size_t) h->k * h->size;
+    if (landmarks_len != h->k || (size_t) from_len != cells || (size_t) to_len != (h->to != NULL ? cells : 0)) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Arrays do not match the landmarks");
+    }
+    memcpy(landmarks, h->landmarks, (size_t) h->k * sizeof(int));
+    memcpy(from, h->from, cells * sizeof(double));
+    if (h->to != NULL) { 
+        memcpy(to, h->to, cells * sizeof(double));
+    }
+    return STATUS_SUCCESS;
+}
+
+// contraction hierarchies
+//
+// Vertices of a shortest path graph are contracted one by one, in order of 
+// importance, adding shortcut arcs between their remaining neighbors whenever
+// no witness path avoiding the contracted vertex exists. Queries then run a 
+// bidirectional Dijkstra which only follows arcs towards more important 
+// vertices. Shortcuts remember the two arcs they replace, so that paths can be 
+// unpacked to the edges of the original graph.
+
+// settled vertices after which a witness search gives up, which only results
+// in additional shortcuts. Searches while computing priorities are shorter.
+#define CH_WITNESS_LIMIT 200
+#define CH_SIMULATION_WITNESS_LIMIT 16
+
+#define CH_ARC_ALIVE 1
+
+typedef struct { 
+    int *arcs;
+    int size;
+    int capacity;
+} ch_list_t;
+
+typedef struct { 
+    int n;
+    int num_arcs;
+    int capacity;
+    unsigned char *present;
+    int *rank;
+    // arcs, both original and shortcuts
+    int *arc_from;
+    int *arc_to;
+    int *arc_edge;
+    int *arc_skip1;
+    int *arc_skip2;
+    int *arc_flags;
+    double *arc_weight;
+    // upward arcs by tail, and downward arcs by head (reversed)
+    int *up_offsets;
+    int *up_targets;
+    int *up_arcs;
+    int *down_offsets;
+    int *down_targets;
+    int *down_arcs;
+    // pool of search workspaces, two per query
+    backend_spsearch_t **pool;
+    int pool_size;
+} backend_ch_t;
+
+#define CH_POOL_SIZE 64
+
+static void ch_free(backend_ch_t *ch) { 
+    int i;
+    if (ch == NULL) { 
+        return;
+    }
+    for (i = 0; i < ch->pool_size; i++) { 
+        spsearch_free(ch->pool[i]);
+        free(ch->pool[i]);
+    }
+    free(ch->pool);
+    free(ch->present);
+    free(ch->rank);
+    free(ch->arc_from);
+    free(ch->arc_to);
+    free(ch->arc_edge);
+    free(ch->arc_skip1);
+    free(ch->arc_skip2);
+    free(ch->arc_flags);
+    free(ch->arc_weight);
+    free(ch->up_offsets);
+    free(ch->up_targets);
+    free(ch->up_arcs);
+    free(ch->down_offsets);
+    free(ch->down_targets);
+    free(ch->down_arcs);
+    free(ch);
+}
+
+static int ch_reserve_arcs(backend_ch_t *ch, int capacity) { 
+    int *from, *to, *edge, *skip1, *skip2, *flags;
+    double *weight;
+    if (capacity <= ch->capacity) { 
+        return 1;
+    }
+    // assign each reallocation separately, so that nothing leaks on failure
+    if ((from = realloc(ch->arc_from, (size_t) capacity * sizeof(int))) == NULL) return 0;
+    ch->arc_from = from;
+    if ((to = realloc(ch->arc_to, (size_t) capacity * sizeof(int))) == NULL) return 0;
+    ch->arc_to = to;
+    if ((edge = realloc(ch->arc_edge, (size_t) capacity * sizeof(int))) == NULL) return 0;
+    ch->arc_edge = edge;
+    if ((skip1 = realloc(ch->arc_skip1, (size_t) capacity * sizeof(int))) == NULL) return 0;
+    ch->arc_skip1 = skip1;
+    if ((skip2 = realloc(ch->arc_skip2, (size_t) capacity * sizeof(int))) == NULL) return 0;
+    ch->arc_skip2 = skip2;
+    if ((flags = realloc(ch->arc_flags, (size_t) capacity * sizeof(int))) == NULL) return 0;
+    ch->arc_flags = flags;
+    if ((weight = realloc(ch->arc_weight, (size_t) capacity * sizeof(double))) == NULL) return 0;
+    ch->arc_weight = weight;
+    ch->capacity = capacity;
+    return 1;
+}
+
+static int ch_list_add(ch_list_t *l, int arc) { 
+    int *arcs;
+    if (l->size == l->capacity) { 
+        if ((arcs = realloc(l->arcs, (size_t) (l->capacity > 0 ? 2 * l->capacity : 4) * sizeof(int))) == NULL) { 
+            return 0;
+        }
+        l->arcs = arcs;
+        l->capacity = l->capacity > 0 ? 2 * l->capacity : 4;
+    }
+    l->arcs[l->size++] = arc;
+    return 1;
 }
 
-int jgrapht_graph_is_allowing_multipleedges(void *g, int* res) { 
-    return jgrapht_capi_graph_is_allowing_multipleedges(thread, g, res);
+static void ch_list_remove(ch_list_t *l, int arc) { 
+    int i;
+    for (i = 0; i < l->size; i++) { 
+        if (l->arcs[i] == arc) { 
+            l->arcs[i] = l->arcs[--l->size];
+            return;
+        }
+    }
 }
 
-int jgrapht_graph_is_allowing_cycles(void *g, int* res) { 
-    return jgrapht_capi_graph_is_allowing_cycles(thread, g, res);
+// The graph during contraction, with the alive arcs of each vertex.
+typedef struct { 
+    backend_ch_t *ch;
+    ch_list_t *out;
+    ch_list_t *in;
+    unsigned char *contracted;
+    int *deleted_neighbors;
+    int *level;
+    // targets of the current witness search are marked with its stamp
+    int *target_stamp;
+    int stamp;
+    backend_spsearch_t witness;
+    backend_spsearch_t queue;
+} ch_builder_t;
+
+// Add an arc, unless a parallel one which is not heavier exists, replacing a
+// heavier parallel arc. Returns 0 on allocation failure.
+static int ch_add_arc(ch_builder_t *b, int from, int to, double weight, int edge, int skip1, int skip2) { 
+    backend_ch_t *ch = b->ch;
+    ch_list_t *out = &b->out[from];
+    int i, a;
+
+    for (i = 0; i < out->size; i++) { 
+        a = out->arcs[i];
+        if (ch->arc_to[a] == to) { 
+            if (ch->arc_weight[a] <= weight) { 
+                return 1;
+            }
+            ch->arc_flags[a] &= ~CH_ARC_ALIVE;
+            ch_list_remove(out, a);
+            ch_list_remove(&b->in[to], a);
+            break;
+        }
+    }
+    if (ch->num_arcs == ch->capacity && !ch_reserve_arcs(ch, 2 * ch->capacity + 16)) { 
+        return 0;
+    }
+    a = ch->num_arcs++;
+    ch->arc_from[a] = from;
+    ch->arc_to[a] = to;
+    ch->arc_weight[a] = weight;
+    ch->arc_edge[a] = edge;
+    ch->arc_skip1[a] = skip1;
+    ch->arc_skip2[a] = skip2;
+    ch->arc_flags[a] = CH_ARC_ALIVE;
+    return ch_list_add(out, a) && ch_list_add(&b->in[to], a);
+}
+
+// Dijkstra from a source among the uncontracted vertices, avoiding a vertex, 
+// up to a distance bound or until all marked targets are settled.
+static void ch_witness_search(ch_builder_t *b, int source, int avoid, double bound, int targets, int limit) { 
+    backend_ch_t *ch = b->ch;
+    backend_spsearch_t *s = &b->witness;
+    ch_list_t *out;
+    int u, v, i, a, settled = 0;
+    double d;
+
+    spsearch_reset(s);
+    spsearch_relax(s, source, 0.0, -1, -1);
+    while (s->heap_size > 0 && settled < limit && targets > 0) { 
+        if (s->dist[s->heap[0]] > bound) { 
+            break;
+        }
+        u = spsearch_pop(s);
+        settled++;
+        if (b->target_stamp[u] == b->stamp) { 
+            targets--;
+        }
+        out = &b->out[u];
+        for (i = 0; i < out->size; i++) { 
+            a = out->arcs[i];
+            v = ch->arc_to[a];
+            if (v == avoid || b->contracted[v]) { 
+                continue;
+            }
+            d = s->dist[u] + ch->arc_weight[a];
+            if (d < s->dist[v] && s->pos[v] != -2) { 
+                spsearch_relax(s, v, d, a, u);
+            }
+        }
+    }
 }
 
-int jgrapht_graph_is_modifiable(void *g, int* res) { 
-    return jgrapht_capi_graph_is_modifiable(thread, g, res);
+// Contract a vertex, or only count the shortcuts it needs when simulating.
+// Returns 0 on allocation failure.
+static int ch_contract(ch_builder_t *b, int v, int simulate, int *shortcuts, int *removed) { 
+    backend_ch_t *ch = b->ch;
+    ch_list_t *in = &b->in[v], *out = &b->out[v];
+    int i, j, a1, a2, u, w, targets;
+    double bound, d;
+
+    *shortcuts = 0;
+    *removed = 0;
+    for (i = 0; i < out->size; i++) { 
+        if (!b->contracted[ch->arc_to[out->arcs[i]]]) { 
+            (*removed)++;
+        }
+    }
+    for (i = 0; i < in->size; i++) { 
+        a1 = in->arcs[i];
+        u = ch->arc_from[a1];
+        if (b->contracted[u]) { 
+            continue;
+        }
+        (*removed)++;
+
+        bound = 0.0;
+        targets = 0;
+        b->stamp++;
+        for (j = 0; j < out->size; j++) { 
+            a2 = out->arcs[j];
+            w = ch->arc_to[a2];
+            if (w == u || b->contracted[w]) { 
+                continue;
+            }
+            if (b->target_stamp[w] != b->stamp) { 
+                b->target_stamp[w] = b->stamp;
+                targets++;
+            }
+            if (ch->arc_weight[a1] + ch->arc_weight[a2] > bound) { 
+                bound = ch->arc_weight[a1] + ch->arc_weight[a2];
+            }
+        }
+        if (targets == 0) { 
+            continue;
+        }
+        ch_witness_search(b, u, v, bound, targets, simulate ? CH_SIMULATION_WITNESS_LIMIT : CH_WITNESS_LIMIT);
+
+        // the lists of v do not change while adding shortcuts between its neighbors
+        for (j = 0; j < out->size; j++) { 
+            a2 = out->arcs[j];
+            w = ch->arc_to[a2];
+            if (w == u || b->contracted[w]) { 
+                continue;
+            }
+            d = ch->arc_weight[a1] + ch->arc_weight[a2];
+            if (b->witness.dist[w] <= d) { 
+                continue;
+            }
+            (*shortcuts)++;
+            if (!simulate && !ch_add_arc(b, u, w, d, -1, a1, a2)) { 
+                return 0;
+            }
+        }
+    }
+    return 1;
 }
 
-int jgrapht_graph_get_edge_weight(void *g, int e, double* res) { 
-    return jgrapht_capi_graph_get_edge_weight(thread, g, e, res);
+static int ch_priority(ch_builder_t *b, int v, double *res) { 
+    int shortcuts, removed;
+    if (!ch_contract(b, v, 1, &shortcuts, &removed)) { 
+        return 0;
+    }
+    *res = 2.0 * (shortcuts - removed) + b->deleted_neighbors[v] + b->level[v];
+    return 1;
+}
+
+// Set the key of a vertex in a queue, inserting it if needed.
+static void spsearch_update(backend_spsearch_t *s, int v, double key) { 
+    double old = s->dist[v];
+    s->dist[v] = key;
+    if (s->pos[v] < 0) { 
+        s->heap[s->heap_size] = v;
+        s->pos[v] = s->heap_size++;
+        heap_sift_up(s, s->pos[v]);
+    } else if (key < old) { 
+        heap_sift_up(s, s->pos[v]);
+    } else { 
+        heap_sift_down(s, s->pos[v]);
+    }
 }
 
-int jgrapht_graph_set_edge_weight(void *g, int e, double weight) { 
-    return jgrapht_capi_graph_set_edge_weight(thread, g, e, weight);
+// Build the upward and downward search graphs from the alive arcs.
+static int ch_build_search_graphs(backend_ch_t *ch) { 
+    int a, v, pos, count_up = 0, count_down = 0;
+    int *up_next, *down_next;
+
+    ch->up_offsets = calloc((size_t) ch->n + 1, sizeof(int));
+    ch->down_offsets = calloc((size_t) ch->n + 1, sizeof(int));
+    up_next = malloc(((size_t) ch->n + 1) * sizeof(int));
+    down_next = malloc(((size_t) ch->n + 1) * sizeof(int));
+    if (ch->up_offsets == NULL || ch->down_offsets == NULL || up_next == NULL || down_next == NULL) { 
+        free(up_next);
+        free(down_next);
+        return 0;
+    }
+    for (a = 0; a < ch->num_arcs; a++) { 
+        if (!(ch->arc_flags[a] & CH_ARC_ALIVE)) { 
+            continue;
+        }
+        if (ch->rank[ch->arc_from[a]] < ch->rank[ch->arc_to[a]]) { 
+            ch->up_offsets[ch->arc_from[a] + 1]++;
+            count_up++;
+        } else { 
+            ch->down_offsets[ch->arc_to[a] + 1]++;
+            count_down++;
+        }
+    }
+    for (v = 0; v < ch->n; v++) { 
+        ch->up_offsets[v + 1] += ch->up_offsets[v];
+        ch->down_offsets[v + 1] += ch->down_offsets[v];
+        up_next[v] = ch->up_offsets[v];
+        down_next[v] = ch->down_offsets[v];
+    }
+    ch->up_targets = malloc(((size_t) count_up + 1) * sizeof(int));
+    ch->up_arcs = malloc(((size_t) count_up + 1) * sizeof(int));
+    ch->down_targets = malloc(((size_t) count_down + 1) * sizeof(int));
+    ch->down_arcs = malloc(((size_t) count_down + 1) * sizeof(int));
+    if (ch->up_targets == NULL || ch->up_arcs == NULL || ch->down_targets == NULL || ch->down_arcs == NULL) { 
+        free(up_next);
+        free(down_next);
+        return 0;
+    }
+    for (a = 0; a < ch->num_arcs; a++) { 
+        if (!(ch->arc_flags[a] & CH_ARC_ALIVE)) { 
+            continue;
+        }
+        if (ch->rank[ch->arc_from[a]] < ch->rank[ch->arc_to[a]]) { 
+            pos = up_next[ch->arc_from[a]]++;
+            ch->up_targets[pos] = ch->arc_to[a];
+            ch->up_arcs[pos] = a;
+        } else { 
+            pos = down_next[ch->arc_to[a]]++;
+            ch->down_targets[pos] = ch->arc_from[a];
+            ch->down_arcs[pos] = a;
+        }
+    }
+    free(up_next);
+    free(down_next);
+    return 1;
 }
 
-int jgrapht_graph_create_all_vit(void *g, void** res)  { 
-    return jgrapht_capi_graph_create_all_vit(thread, g, res);
+static void ch_builder_free(ch_builder_t *b) { 
+    int v;
+    if (b->out != NULL) { 
+        for (v = 0; v < b->ch->n; v++) { 
+            free(b->out[v].arcs);
+        }
+    }
+    if (b->in != NULL) { 
+        for (v = 0; v < b->ch->n; v++) { 
+            free(b->in[v].arcs);
+        }
+    }
+    free(b->out);
+    free(b->in);
+    free(b->contracted);
+    free(b->deleted_neighbors);
+    free(b->level);
+    free(b->target_stamp);
+    spsearch_free(&b->witness);
+    spsearch_free(&b->queue);
+}
+
+static int ch_build(ch_builder_t *b, const backend_spgraph_t *sg) { 
+    backend_ch_t *ch = b->ch;
+    ch_list_t *in, *out;
+    int u, v, i, order, shortcuts, removed;
+    double priority;
+
+    // original arcs, without self-loops
+    for (u = 0; u < sg->n; u++) { 
+        for (i = sg->offsets[u]; i < sg->offsets[u + 1]; i++) { 
+            if (sg->targets[i] != u && !ch_add_arc(b, u, sg->targets[i], sg->weights[i], sg->edges[i], -1, -1)) { 
+                return 0;
+            }
+        }
+    }
+
+    for (v = 0; v < ch->n; v++) { 
+        if (!sg->present[v]) { 
+            continue;
+        }
+        if (!ch_priority(b, v, &priority)) { 
+            return 0;
+        }
+        spsearch_update(&b->queue, v, priority);
+    }
+
+    order = 0;
+    while (b->queue.heap_size > 0) { 
+        v = spsearch_pop(&b->queue);
+        // lazy updates, the priority may have increased since it was computed
+        if (!ch_priority(b, v, &priority)) { 
+            return 0;
+        }
+        if (b->queue.heap_size > 0 && priority > b->queue.dist[b->queue.heap[0]]) { 
+            b->queue.pos[v] = -1;
+            spsearch_update(&b->queue, v, priority);
+            continue;
+        }
+        if (!ch_contract(b, v, 0, &shortcuts, &removed)) { 
+            return 0;
+        }
+        b->contracted[v] = 1;
+        ch->rank[v] = order++;
+
+        // detach from the remaining graph and update the neighbors
+        in = &b->in[v];
+        out = &b->out[v];
+        for (i = 0; i < in->size; i++) { 
+            ch_list_remove(&b->out[ch->arc_from[in->arcs[i]]], in->arcs[i]);
+        }
+        for (i = 0; i < out->size; i++) { 
+            ch_list_remove(&b->in[ch->arc_to[out->arcs[i]]], out->arcs[i]);
+        }
+        for (i = 0; i < in->size + out->size; i++) { 
+            u = i < in->size ? ch->arc_from[in->arcs[i]] : ch->arc_to[out->arcs[i - in->size]];
+            if (b->contracted[u]) { 
+                continue;
+            }
+            b->deleted_neighbors[u]++;
+            if (b->level[u] < b->level[v] + 1) { 
+                b->level[u] = b->level[v] + 1;
+            }
+            if (!ch_priority(b, u, &priority)) { 
+                return 0;
+            }
+            spsearch_update(&b->queue, u, priority);
+        }
+    }
+    // vertices not in the graph are ranked last and have no arcs
+    for (v = 0; v < ch->n; v++) { 
+        if (!sg->present[v]) { 
+            ch->rank[v] = order++;
+        }
+    }
+    return ch_build_search_graphs(ch);
 }
 
-int jgrapht_graph_create_all_eit(void *g, void** res) { 
-    return jgrapht_capi_graph_create_all_eit(thread, g, res);
+static backend_ch_t *ch_alloc(int n, int capacity) { 
+    backend_ch_t *ch = calloc(1, sizeof(backend_ch_t));
+    if (ch == NULL) { 
+        return NULL;
+    }
+    ch->n = n;
+    ch->present = calloc((size_t) n + 1, sizeof(unsigned char));
+    ch->rank = malloc(((size_t) n + 1) * sizeof(int));
+    ch->pool = malloc(CH_POOL_SIZE * sizeof(backend_spsearch_t *));
+    if (ch->present == NULL || ch->rank == NULL || ch->pool == NULL || !ch_reserve_arcs(ch, capacity > 0 ? capacity : 16)) { 
+        ch_free(ch);
+        return NULL;
+    }
+    return ch;
 }
 
-int jgrapht_graph_create_between_eit(void *g, int u, int v, void** res) { 
-    return jgrapht_capi_graph_create_between_eit(thread, g, u, v, res);
+int jgrapht_ch_create(void *g, void** res) { 
+    backend_spgraph_t *sg = (backend_spgraph_t *) g;
+    ch_builder_t b;
+    backend_ch_t *ch;
+    int ok;
+
+    if (sg->negative) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Contraction hierarchies require non-negative edge weights");
+    }
+    if ((ch = ch_alloc(sg->n, sg->m)) == NULL) { 
+        return backend_error(STATUS_ERROR, "Out of memory");
+    }
+    memcpy(ch->present, sg->present, (size_t) sg->n * sizeof(unsigned char));
+
+    memset(&b, 0, sizeof(ch_builder_t));
+    b.ch = ch;
+    b.out = calloc((size_t) sg->n + 1, sizeof(ch_list_t));
+    b.in = calloc((size_t) sg->n + 1, sizeof(ch_list_t));
+    b.contracted = calloc((size_t) sg->n + 1, sizeof(unsigned char));
+    b.deleted_neighbors = calloc((size_t) sg->n + 1, sizeof(int));
+    b.level = calloc((size_t) sg->n + 1, sizeof(int));
+    b.target_stamp = calloc((size_t) sg->n + 1, sizeof(int));
+    ok = b.out != NULL && b.in != NULL && b.contracted != NULL && b.deleted_neighbors != NULL && b.level != NULL && b.target_stamp != NULL
+        && spsearch_init(&b.witness, sg->n) && spsearch_init(&b.queue, sg->n) && ch_build(&b, sg);
+    ch_builder_free(&b);
+    if (!ok) { 
+        ch_free(ch);
+        return backend_error(STATUS_ERROR, "Out of memory");
+    }
+    *res = ch;
+    return STATUS_SUCCESS;
 }
 
-int jgrapht_graph_vertex_create_eit(void *g, int v, void** res) { 
-    return jgrapht_capi_graph_vertex_create_eit(thread, g, v, res);
+int jgrapht_ch_destroy(void *c) { 
+    ch_free((backend_ch_t *) c);
+    return STATUS_SUCCESS;
 }
 
-int jgrapht_graph_vertex_create_out_eit(void *g, int v, void** res) { 
-    return jgrapht_capi_graph_vertex_create_out_eit(thread, g, v, res);
+int jgrapht_ch_get_info(void *c, int* n_res, int* arcs_res) { 
+    backend_ch_t *ch = (backend_ch_t *) c;
+    *n_res = ch->n;
+    *arcs_res = ch->num_arcs;
+    return STATUS_SUCCESS;
 }
 
-int jgrapht_graph_vertex_create_in_eit(void *g, int v, void** res) { 
-    return jgrapht_capi_graph_vertex_create_in_eit(thread, g, v, res);
+int jgrapht_ch_get_memory(void *c, long long* res) { 
+    backend_ch_t *ch = (backend_ch_t *) c;
+    long long up = ch->up_offsets[ch->n], down = ch->down_offsets[ch->n];
+    *res = (long long) ch->capacity * (6 * (long long) sizeof(int) + (long long) sizeof(double))
+        + (long long) ch->n * (3 * (long long) sizeof(int) + 1)
+        + (up + down) * 2 * (long long) sizeof(int);
+    return STATUS_SUCCESS;
 }
 
-int jgrapht_graph_as_undirected(void *g, void** res) { 
-    return jgrapht_capi_graph_as_undirected(thread, g, res);
+// Export the hierarchy, with one entry per vertex in rank and one per arc in 
+// the other arrays.
+int jgrapht_ch_get_arrays(void *c, int *rank, int rank_len, int *from, int from_len, int *to, int to_len, 
+    int *edge, int edge_len, int *skip1, int skip1_len, int *skip2, int skip2_len, int *flags, int flags_len, double *weight, int weight_len) { 
+    backend_ch_t *ch = (backend_ch_t *) c;
+    int v;
+    size_t m = (size_t) ch->num_arcs * sizeof(int);
+    if (rank_len != ch->n || from_len != ch->num_arcs || to_len != ch->num_arcs || edge_len != ch->num_arcs 
+        || skip1_len != ch->num_arcs || skip2_len != ch->num_arcs || flags_len != ch->num_arcs || weight_len != ch->num_arcs) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Arrays do not match the hierarchy");
+    }
+    for (v = 0; v < ch->n; v++) { 
+        // vertices not in the graph are marked with a negative rank
+        rank[v] = ch->present[v] ? ch->rank[v] : -1 - ch->rank[v];
+    }
+    memcpy(from, ch->arc_from, m);
+    memcpy(to, ch->arc_to, m);
+    memcpy(edge, ch->arc_edge, m);
+    memcpy(skip1, ch->arc_skip1, m);
+    memcpy(skip2, ch->arc_skip2, m);
+    memcpy(flags, ch->arc_flags, m);
+    memcpy(weight, ch->arc_weight, (size_t) ch->num_arcs * sizeof(double));
+    return STATUS_SUCCESS;
+}
+
+// Import a hierarchy exported by jgrapht_ch_get_arrays for the graph g. A 
+// shortcut refers to two earlier arcs, while any other arc has both skips 
+// equal to -1 and refers to an edge of the graph.
+int jgrapht_ch_create_from_arrays(void *g, int *rank, int rank_len, int *from, int from_len, int *to, int to_len, 
+    int *edge, int edge_len, int *skip1, int skip1_len, int *skip2, int skip2_len, int *flags, int flags_len, double *weight, int weight_len, void** res) { 
+    backend_ch_t *ch;
+    int v, a, contains, status, m = from_len;
+    size_t size = (size_t) m * sizeof(int);
+
+    if (to_len != m || edge_len != m || skip1_len != m || skip2_len != m || flags_len != m || weight_len != m) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Arrays do not match the hierarchy");
+    }
+    for (a = 0; a < m; a++) { 
+        if (from[a] < 0 || from[a] >= rank_len || to[a] < 0 || to[a] >= rank_len) { 
+            return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid hierarchy");
+        }
+        if (skip1[a] == -1 && skip2[a] == -1) { 
+            if ((status = jgrapht_capi_graph_contains_edge(thread, g, edge[a], &contains)) != STATUS_SUCCESS) { 
+                return status;
+            }
+            if (!contains) { 
+                return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid hierarchy");
+            }
+        } else if (skip1[a] < 0 || skip1[a] >= a || skip2[a] < 0 || skip2[a] >= a) { 
+            return backend_error(STATUS_ILLEGAL_ARGUMENT, "Invalid hierarchy");
+        }
+    }
+    if ((ch = ch_alloc(rank_len, m)) == NULL) { 
+        return backend_error(STATUS_ERROR, "Out of memory");
+    }
+    for (v = 0; v < rank_len; v++) { 
+        ch->present[v] = rank[v] >= 0;
+        ch->rank[v] = rank[v] >= 0 ? rank[v] : -1 - rank[v];
+    }
+    memcpy(ch->arc_from, from, size);
+    memcpy(ch->arc_to, to, size);
+    memcpy(ch->arc_edge, edge, size);
+    memcpy(ch->arc_skip1, skip1, size);
+    memcpy(ch->arc_skip2, skip2, size);
+    memcpy(ch->arc_flags, flags, size);
+    memcpy(ch->arc_weight, weight, (size_t) m * sizeof(double));
+    ch->num_arcs = m;
+    if (!ch_build_search_graphs(ch)) { 
+        ch_free(ch);
+        return backend_error(STATUS_ERROR, "Out of memory");
+    }
+    *res = ch;
+    return STATUS_SUCCESS;
 }
 
-int jgrapht_graph_as_unmodifiable(void *g, void** res) { 
-    return jgrapht_capi_graph_as_unmodifiable(thread, g, res);
+static backend_spsearch_t *ch_search_acquire(backend_ch_t *ch) { 
+    backend_spsearch_t *s = NULL;
+    isolate_lock_acquire();
+    if (ch->pool_size > 0) { 
+        s = ch->pool[--ch->pool_size];
+    }
+    isolate_lock_release();
+    if (s == NULL && (s = malloc(sizeof(backend_spsearch_t))) != NULL && !spsearch_init(s, ch->n)) { 
+        free(s);
+        s = NULL;
+    }
+    return s;
 }
 
-int jgrapht_graph_as_unweighted(void *g, void** res) { 
-    return jgrapht_capi_graph_as_unweighted(thread, g, res);
+static void ch_search_release(backend_ch_t *ch, backend_spsearch_t *s) { 
+    if (s == NULL) { 
+        return;
+    }
+    spsearch_reset(s);
+    isolate_lock_acquire();
+    if (ch->pool_size < CH_POOL_SIZE) { 
+        ch->pool[ch->pool_size++] = s;
+        s = NULL;
+    }
+    isolate_lock_release();
+    if (s != NULL) { 
+        spsearch_free(s);
+        free(s);
+    }
 }
 
-int jgrapht_graph_as_edgereversed(void *g, void** res) { 
-    return jgrapht_capi_graph_as_edgereversed(thread, g, res);
+// One step of the search in one direction, updating the best meeting vertex.
+static void ch_search_step(backend_ch_t *ch, backend_spsearch_t *s, backend_spsearch_t *other, int up, double *best, int *meet) { 
+    const int *offsets = up ? ch->up_offsets : ch->down_offsets;
+    const int *targets = up ? ch->up_targets : ch->down_targets;
+    const int *arcs = up ? ch->up_arcs : ch->down_arcs;
+    int u, v, i;
+    double d;
+
+    u = spsearch_pop(s);
+    if (other->dist[u] < INFINITY && s->dist[u] + other->dist[u] < *best) { 
+        *best = s->dist[u] + other->dist[u];
+        *meet = u;
+    }
+    for (i = offsets[u]; i < offsets[u + 1]; i++) { 
+        v = targets[i];
+        d = s->dist[u] + ch->arc_weight[arcs[i]];
+        if (d < s->dist[v] && s->pos[v] != -2) { 
+            spsearch_relax(s, v, d, arcs[i], u);
+        }
+    }
 }
 
-int jgrapht_graph_as_weighted(void *g, void *weight_function, int cache_weights, int write_weights_through, void** res) { 
-    return jgrapht_capi_graph_as_weighted(thread, g, weight_function, cache_weights, write_weights_through, res);
+// Run a query, returning the meeting vertex or -1 if the target is unreachable.
+static int ch_query(backend_ch_t *ch, backend_spsearch_t *fwd, backend_spsearch_t *bwd, int source, int target) { 
+    double best = INFINITY, fmin, bmin;
+    int meet = -1;
+
+    spsearch_relax(fwd, source, 0.0, -1, -1);
+    spsearch_relax(bwd, target, 0.0, -1, -1);
+    for (;;) { 
+        fmin = fwd->heap_size > 0 ? fwd->dist[fwd->heap[0]] : INFINITY;
+        bmin = bwd->heap_size > 0 ? bwd->dist[bwd->heap[0]] : INFINITY;
+        if (fmin >= best && bmin >= best) { 
+            break;
+        }
+        if (fmin <= bmin) { 
+            ch_search_step(ch, fwd, bwd, 1, &best, &meet);
+        } else { 
+            ch_search_step(ch, bwd, fwd, 0, &best, &meet);
+        }
+    }
+    return meet;
+}
+
+// Append the original edges of an arc, unpacking shortcuts. Returns the new 
+// length, which may exceed the capacity of the edges array.
+static int ch_unpack(backend_ch_t *ch, int arc, int *stack, int *edges, int capacity, int length, double *weight) { 
+    int top = 0, a;
+    stack[top++] = arc;
+    while (top > 0) { 
+        a = stack[--top];
+        if (ch->arc_skip1[a] < 0) { 
+            if (length < capacity) { 
+                edges[length] = ch->arc_edge[a];
+            }
+            *weight += ch->arc_weight[a];
+            length++;
+        } else { 
+            stack[top++] = ch->arc_skip2[a];
+            stack[top++] = ch->arc_skip1[a];
+        }
+    }
+    return length;
 }
 
-int jgrapht_graph_as_masked_subgraph(void *g, void *vertex_mask_function, void *edge_mask_function, void** res) {
-    return jgrapht_capi_graph_as_masked_subgraph(thread, g, vertex_mask_function, edge_mask_function, res);
+static int ch_check_vertices(backend_ch_t *ch, int source, int target) { 
+    if (source < 0 || source >= ch->n || !ch->present[source] || target < 0 || target >= ch->n || !ch->present[target]) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Vertex not in the graph");
+    }
+    return STATUS_SUCCESS;
 }
 
-int jgrapht_graph_as_subgraph(void *g, void *vertex_set, void *edge_set, void** res) { 
-    return jgrapht_capi_graph_as_subgraph(thread, g, vertex_set, edge_set, res);
+int jgrapht_ch_get_distance(void *c, int source, int target, double* res) { 
+    backend_ch_t *ch = (backend_ch_t *) c;
+    backend_spsearch_t *fwd, *bwd;
+    int meet, status;
+
+    if ((status = ch_check_vertices(ch, source, target)) != STATUS_SUCCESS) { 
+        return status;
+    }
+    fwd = ch_search_acquire(ch);
+    bwd = ch_search_acquire(ch);
+    if (fwd == NULL || bwd == NULL) { 
+        ch_search_release(ch, fwd);
+        ch_search_release(ch, bwd);
+        return backend_error(STATUS_ERROR, "Out of memory");
+    }
+    meet = ch_query(ch, fwd, bwd, source, target);
+    *res = meet >= 0 ? fwd->dist[meet] + bwd->dist[meet] : INFINITY;
+    ch_search_release(ch, fwd);
+    ch_search_release(ch, bwd);
+    return STATUS_SUCCESS;
+}
+
+// Compute a shortest path. The length is -1 if the target is unreachable, 
+// otherwise the number of edges of the path. If it exceeds the size of the 
+// edges array, only a prefix of the path is written and the call should be 
+// repeated with a larger array.
+int jgrapht_ch_get_path(void *c, int source, int target, int *edges, int edges_len, double* weight_res, int* length_res) { 
+    backend_ch_t *ch = (backend_ch_t *) c;
+    backend_spsearch_t *fwd, *bwd;
+    int *arcs = NULL, *stack = NULL;
+    int meet, v, count, i, length, status;
+    double weight = 0.0;
+
+    if ((status = ch_check_vertices(ch, source, target)) != STATUS_SUCCESS) { 
+        return status;
+    }
+    fwd = ch_search_acquire(ch);
+    bwd = ch_search_acquire(ch);
+    if (fwd == NULL || bwd == NULL) { 
+        status = backend_error(STATUS_ERROR, "Out of memory");
+        goto cleanup;
+    }
+    meet = ch_query(ch, fwd, bwd, source, target);
+    if (meet < 0) { 
+        *weight_res = INFINITY;
+        *length_res = -1;
+        goto cleanup;
+    }
+
+    // arcs of the upward path, from the meeting vertex back to the source, 
+    // followed by the arcs of the downward path to the target
+    arcs = malloc(((size_t) ch->n + 1) * sizeof(int));
+    stack = malloc(((size_t) ch->num_arcs + 1) * sizeof(int));
+    if (arcs == NULL || stack == NULL) { 
+        status = backend_error(STATUS_ERROR, "Out of memory");
+        goto cleanup;
+    }
+    count = 0;
+    for (v = meet; v != source; v = fwd->pred_vertex[v]) { 
+        arcs[count++] = fwd->pred_edge[v];
+    }
+    length = 0;
+    for (i = count - 1; i >= 0; i--) { 
+        length = ch_unpack(ch, arcs[i], stack, edges, edges_len, length, &weight);
+    }
+    for (v = meet; v != target; v = bwd->pred_vertex[v]) { 
+        length = ch_unpack(ch, bwd->pred_edge[v], stack, edges, edges_len, length, &weight);
+    }
+    *weight_res = weight;
+    *length_res = length;
+
+cleanup:
+    free(arcs);
+    free(stack);
+    ch_search_release(ch, fwd);
+    ch_search_release(ch, bwd);
+    return status;
 }
 
 int jgrapht_graph_as_graph_union(void *g1, void *g2, void *weight_combiner_function, void** res) { 
@@ -810,6 +3883,18 @@ int jgrapht_handles_destroy(void *handle) {
     return jgrapht_capi_handles_destroy(thread, handle);
 }
 
+int jgrapht_handles_destroy_all(void **handles, int size) { 
+    int i, status, result = STATUS_SUCCESS;
+    for (i = 0; i < size; i++) { 
+        status = jgrapht_capi_handles_destroy(thread, handles[i]);
+        if (status != STATUS_SUCCESS && result == STATUS_SUCCESS) { 
+            // keep going, so that all other handles are released
+            result = status;
+        }
+    }
+    return result;
+}
+
 int jgrapht_handles_get_ccharpointer(void *handle, char** res) { 
     return jgrapht_capi_handles_get_ccharpointer(thread, handle, res);
 }
@@ -1100,6 +4185,72 @@ int jgrapht_it_hasnext(void *it, int* res) {
     return jgrapht_capi_it_hasnext(thread, it, res);
 }
 
+// Bulk iteration. These fill a caller supplied buffer with up to capacity 
+// elements and report how many were actually read. A count smaller than the 
+// capacity means that the iterator is exhausted.
+
+int jgrapht_it_next_int_chunk(void *it, int *buffer, int capacity, int* count) { 
+    int hasnext, status;
+    *count = 0;
+    while (*count < capacity) { 
+        if ((status = jgrapht_capi_it_hasnext(thread, it, &hasnext)) != STATUS_SUCCESS) { 
+            return status;
+        }
+        if (!hasnext) { 
+            break;
+        }
+        if ((status = jgrapht_capi_it_next_int(thread, it, buffer + *count)) != STATUS_SUCCESS) { 
+            return status;
+        }
+        (*count)++;
+    }
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_it_next_double_chunk(void *it, double *buffer, int capacity, int* count) { 
+    int hasnext, status;
+    *count = 0;
+    while (*count < capacity) { 
+        if ((status = jgrapht_capi_it_hasnext(thread, it, &hasnext)) != STATUS_SUCCESS) { 
+            return status;
+        }
+        if (!hasnext) { 
+            break;
+        }
+        if ((status = jgrapht_capi_it_next_double(thread, it, buffer + *count)) != STATUS_SUCCESS) { 
+            return status;
+        }
+        (*count)++;
+    }
+    return STATUS_SUCCESS;
+}
+
+int jgrapht_it_next_edge_triple_chunk(void *it, int *sources, int sources_capacity, int *targets, int targets_capacity, double *weights, int weights_capacity, int* count) { 
+    int hasnext, status;
+    int capacity = sources_capacity;
+    if (targets_capacity < capacity) { 
+        capacity = targets_capacity;
+    }
+    if (weights_capacity < capacity) { 
+        capacity = weights_capacity;
+    }
+    *count = 0;
+    while (*count < capacity) { 
+        if ((status = jgrapht_capi_it_hasnext(thread, it, &hasnext)) != STATUS_SUCCESS) { 
+            return status;
+        }
+        if (!hasnext) { 
+            break;
+        }
+        status = jgrapht_capi_it_next_edge_triple(thread, it, sources + *count, targets + *count, weights + *count);
+        if (status != STATUS_SUCCESS) { 
+            return status;
+        }
+        (*count)++;
+    }
+    return STATUS_SUCCESS;
+}
+
 // list
 
 int jgrapht_list_create(void** res) { 
@@ -1452,6 +4603,141 @@ int jgrapht_sp_singlesource_get_path_to_vertex(void *singlesource, int target, v
     return jgrapht_capi_sp_singlesource_get_path_to_vertex(thread, singlesource, target, res);
 }
 
+// Distances and predecessors of whole shortest path trees, read in bulk 
+// without creating an object per vertex. The capi only exposes the paths of
+// a tree, thus the distance of a vertex is the weight of its path, read 
+// without copying the edges. The capi still builds each path, so reading a 
+// distance takes time linear in the number of edges of the path.
+
+static int singlesource_distance(void *singlesource, int v, double *res) { 
+    void *gp, *eit;
+    int start, end, status;
+    if ((status = jgrapht_capi_sp_singlesource_get_path_to_vertex(thread, singlesource, v, &gp)) != STATUS_SUCCESS) { 
+        return status;
+    }
+    if (gp == NULL) { 
+        *res = INFINITY;
+        return STATUS_SUCCESS;
+    }
+    status = jgrapht_capi_handles_get_graphpath(thread, gp, res, &start, &end, &eit);
+    if (status == STATUS_SUCCESS) { 
+        jgrapht_capi_handles_destroy(thread, eit);
+    }
+    jgrapht_capi_handles_destroy(thread, gp);
+    return status;
+}
+
+int jgrapht_sp_singlesource_get_distance_to_vertex(void *singlesource, int target, double* res) { 
+    return singlesource_distance(singlesource, target, res);
+}
+
+// Distances of all vertices of the graph, indexed by vertex. Identifiers not
+// corresponding to any vertex are assigned NaN. This takes time linear in the 
+// total number of edges of the paths, that is O(n * depth) for a tree of the 
+// given depth and quadratic in the worst case.
+int jgrapht_sp_singlesource_get_distances(void *singlesource, void *g, double *dist, int dist_len) { 
+    void *it;
+    int i, v, hasnext, status;
+
+    for (i = 0; i < dist_len; i++) { 
+        dist[i] = NAN;
+    }
+    if ((status = jgrapht_capi_graph_create_all_vit(thread, g, &it)) != STATUS_SUCCESS) { 
+        return status;
+    }
+    while ((status = jgrapht_capi_it_hasnext(thread, it, &hasnext)) == STATUS_SUCCESS && hasnext) { 
+        if ((status = jgrapht_capi_it_next_int(thread, it, &v)) != STATUS_SUCCESS) { 
+            break;
+        }
+        if (v < 0 || v >= dist_len) { 
+            status = backend_error(STATUS_ILLEGAL_ARGUMENT, "Array does not match the graph");
+            break;
+        }
+        if ((status = singlesource_distance(singlesource, v, &dist[v])) != STATUS_SUCCESS) { 
+            break;
+        }
+    }
+    jgrapht_capi_handles_destroy(thread, it);
+    return status;
+}
+
+typedef struct { 
+    double dist;
+    int v;
+} singlesource_entry_t;
+
+static int singlesource_entry_compare(const void *a, const void *b) { 
+    const singlesource_entry_t *x = (const singlesource_entry_t *) a;
+    const singlesource_entry_t *y = (const singlesource_entry_t *) b;
+    if (x->dist != y->dist) { 
+        return x->dist > y->dist ? -1 : 1;
+    }
+    return (x->v > y->v) - (x->v < y->v);
+}
+
+// Predecessors of all vertices given their distances, indexed by vertex, with
+// -1 for the source, unreachable vertices and identifiers not corresponding 
+// to any vertex. Reading a path assigns the predecessors of all vertices along
+// it, and vertices are visited by decreasing distance, so that most paths 
+// need not be read at all. Still, in the worst case every path is read, as 
+// for the distances.
+int jgrapht_sp_singlesource_get_predecessors(void *singlesource, void *g, int source, double *dist, int dist_len, int *pred, int pred_len) { 
+    singlesource_entry_t *entries;
+    void *gp, *eit;
+    int i, count = 0, u, e, s, t, start, end, hasnext, status = STATUS_SUCCESS;
+    double weight;
+
+    if (pred_len != dist_len) { 
+        return backend_error(STATUS_ILLEGAL_ARGUMENT, "Arrays do not match the graph");
+    }
+    if ((entries = malloc(((size_t) dist_len + 1) * sizeof(singlesource_entry_t))) == NULL) { 
+        return backend_error(STATUS_ERROR, "Out of memory");
+    }
+    for (i = 0; i < dist_len; i++) { 
+        pred[i] = -1;
+        if (i != source && isfinite(dist[i])) { 
+            entries[count].dist = dist[i];
+            entries[count].v = i;
+            count++;
+        }
+    }
+    qsort(entries, (size_t) count, sizeof(singlesource_entry_t), singlesource_entry_compare);
+
+    for (i = 0; i < count && status == STATUS_SUCCESS; i++) { 
+        if (pred[entries[i].v] != -1) { 
+            continue;
+        }
+        if ((status = jgrapht_capi_sp_singlesource_get_path_to_vertex(thread, singlesource, entries[i].v, &gp)) != STATUS_SUCCESS) { 
+            break;
+        }
+        if (gp == NULL) { 
+            continue;
+        }
+        if ((status = jgrapht_capi_handles_get_graphpath(thread, gp, &weight, &start, &end, &eit)) != STATUS_SUCCESS) { 
+            jgrapht_capi_handles_destroy(thread, gp);
+            break;
+        }
+        u = start;
+        while ((status = jgrapht_capi_it_hasnext(thread, eit, &hasnext)) == STATUS_SUCCESS && hasnext) { 
+            if ((status = jgrapht_capi_it_next_int(thread, eit, &e)) != STATUS_SUCCESS
+                || (status = jgrapht_capi_graph_edge_source(thread, g, e, &s)) != STATUS_SUCCESS
+                || (status = jgrapht_capi_graph_edge_target(thread, g, e, &t)) != STATUS_SUCCESS) { 
+                break;
+            }
+            // the next vertex along the path
+            s = s == u ? t : s;
+            if (s >= 0 && s < pred_len) { 
+                pred[s] = u;
+            }
+            u = s;
+        }
+        jgrapht_capi_handles_destroy(thread, eit);
+        jgrapht_capi_handles_destroy(thread, gp);
+    }
+    free(entries);
+    return status;
+}
+
 int jgrapht_sp_allpairs_get_path_between_vertices(void *allpairs, int source, int target, void** res) {
     return jgrapht_capi_sp_allpairs_get_path_between_vertices(thread, allpairs, source, target, res);
 }
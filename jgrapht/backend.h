@@ -10,12 +10,20 @@ extern "C" {
 
 // library init
 
+int jgrapht_isolate_configure(long long max_heap, long long min_heap, long long young_gen, long long reserved_address_space);
+
+int jgrapht_isolate_supports_heap_options();
+
 void jgrapht_isolate_create();
 
 void jgrapht_isolate_destroy();
 
 int jgrapht_isolate_is_attached();
 
+// thread attachment
+
+int jgrapht_thread_attach();
+
 // error
 
 void jgrapht_error_clear_errno();
@@ -266,6 +274,8 @@ int jgrapht_graph_create(int, int, int, int, void**);
 
 int jgrapht_graph_sparse_create(int, int, int, void *, void**);
 
+int jgrapht_graph_sparse_create_from_arrays(int, int, int, int *, int, int *, int, double *, int, void**);
+
 int jgrapht_graph_vertices_count(void *, int*);
 
 int jgrapht_graph_edges_count(void *, int*);
@@ -274,6 +284,10 @@ int jgrapht_graph_add_vertex(void *, int*);
 
 int jgrapht_graph_add_given_vertex(void *, int, int *);
 
+int jgrapht_graph_add_vertices(void *, int *, int);
+
+int jgrapht_graph_add_given_vertices(void *, int *, int);
+
 int jgrapht_graph_remove_vertex(void *, int, int*);
 
 int jgrapht_graph_contains_vertex(void *, int, int*);
@@ -282,6 +296,8 @@ int jgrapht_graph_add_edge(void *, int, int, int*);
 
 int jgrapht_graph_add_given_edge(void *, int, int, int, int*);
 
+int jgrapht_graph_add_edges(void *, int *, int, int *, int, double *, int, int *, int);
+
 int jgrapht_graph_remove_edge(void *, int, int*);
 
 int jgrapht_graph_contains_edge(void *, int, int*);
@@ -294,6 +310,12 @@ int jgrapht_graph_indegree_of(void *, int, int*);
 
 int jgrapht_graph_outdegree_of(void *, int, int*);
 
+int jgrapht_graph_vertices_max(void *, int*);
+
+int jgrapht_graph_degrees(void *, int, int *, int);
+
+int jgrapht_graph_copy_to_sparse(void *, int *, int, int *, int, void**);
+
 int jgrapht_graph_edge_source(void *, int, int*);
 
 int jgrapht_graph_edge_target(void *, int, int*);
@@ -316,6 +338,10 @@ int jgrapht_graph_get_edge_weight(void *, int, double*);
 
 int jgrapht_graph_set_edge_weight(void *, int, double);
 
+int jgrapht_graph_get_edge_weights(void *, int *, int, double *, int);
+
+int jgrapht_graph_set_edge_weights(void *, int *, int, double *, int);
+
 int jgrapht_graph_create_all_vit(void *, void**);
 
 int jgrapht_graph_create_all_eit(void *, void**);
@@ -328,6 +354,10 @@ int jgrapht_graph_vertex_create_out_eit(void *, int, void**);
 
 int jgrapht_graph_vertex_create_in_eit(void *, int, void**);
 
+int jgrapht_graph_csr_offsets(void *, int *, int);
+
+int jgrapht_graph_csr_fill(void *, int *, int, int *, int, int *, int, double *, int);
+
 int jgrapht_graph_as_undirected(void *, void**);
 
 int jgrapht_graph_as_unmodifiable(void *, void**);
@@ -342,6 +372,74 @@ int jgrapht_graph_as_masked_subgraph(void *, void *, void *, void**);
 
 int jgrapht_graph_as_subgraph(void *, void *, void *, void**);
 
+// masks
+
+int jgrapht_mask_create(int*);
+
+int jgrapht_mask_destroy(int);
+
+int jgrapht_mask_get_callbacks(int, long long*, long long*);
+
+int jgrapht_mask_assign(int, int, unsigned char*, int);
+
+int jgrapht_mask_set(int, int, int*, int, int);
+
+int jgrapht_mask_clear(int, int);
+
+int jgrapht_mask_test(int, int, int, int*);
+
+// shortest path graphs
+
+int jgrapht_spgraph_create(void *, void**);
+
+int jgrapht_spgraph_destroy(void *);
+
+int jgrapht_spgraph_get_info(void *, int*, int*, int*);
+
+int jgrapht_spgraph_check(void *, int*, int, int);
+
+int jgrapht_spgraph_distance_matrix(void *, int*, int, int*, int, int, int, double*, int, int*, int);
+
+int jgrapht_spgraph_distance_matrix_float(void *, int*, int, int*, int, int, int, float*, int);
+
+int jgrapht_spgraph_multi_source(void *, int*, int, int*, int, int, double, double, int, int, double*, int);
+
+// heuristics
+
+int jgrapht_heuristic_create(int, double, double*, int, double*, int, int*);
+
+int jgrapht_heuristic_destroy(int);
+
+int jgrapht_heuristic_get_callback(int, long long*);
+
+int jgrapht_heuristic_get_memory(int, long long*);
+
+int jgrapht_heuristic_landmarks_compute(void *, int*, int, int, int, long long, int*);
+
+int jgrapht_heuristic_landmarks_create(int*, int, double*, int, double*, int, int*);
+
+int jgrapht_heuristic_landmarks_get_info(int, int*, int*, int*);
+
+int jgrapht_heuristic_landmarks_get(int, int*, int, double*, int, double*, int);
+
+// contraction hierarchies
+
+int jgrapht_ch_create(void *, void**);
+
+int jgrapht_ch_destroy(void *);
+
+int jgrapht_ch_get_info(void *, int*, int*);
+
+int jgrapht_ch_get_memory(void *, long long*);
+
+int jgrapht_ch_get_arrays(void *, int*, int, int*, int, int*, int, int*, int, int*, int, int*, int, int*, int, double*, int);
+
+int jgrapht_ch_create_from_arrays(void *, int*, int, int*, int, int*, int, int*, int, int*, int, int*, int, int*, int, double*, int, void**);
+
+int jgrapht_ch_get_distance(void *, int, int, double*);
+
+int jgrapht_ch_get_path(void *, int, int, int*, int, double*, int*);
+
 int jgrapht_graph_as_graph_union(void *, void *, void *, void**);
 
 int jgrapht_graph_dag_create(int, int, void**);
@@ -416,6 +514,8 @@ int jgrapht_graph_test_is_k5_subdivision(void *, int*);
 
 int jgrapht_handles_destroy(void *);
 
+int jgrapht_handles_destroy_all(void **, int);
+
 int jgrapht_handles_get_ccharpointer(void *, char**);
 
 int jgrapht_handles_get_edge_pair(void *, int*, int*);
@@ -566,6 +666,12 @@ int jgrapht_it_next_object(void *, void**);
 
 int jgrapht_it_hasnext(void *, int*);
 
+int jgrapht_it_next_int_chunk(void *, int *, int, int*);
+
+int jgrapht_it_next_double_chunk(void *, double *, int, int*);
+
+int jgrapht_it_next_edge_triple_chunk(void *, int *, int, int *, int, double *, int, int*);
+
 // list
 
 int jgrapht_list_create(void**);
@@ -752,6 +858,12 @@ int jgrapht_sp_exec_floydwarshall_get_allpairs(void *, void**);
 
 int jgrapht_sp_singlesource_get_path_to_vertex(void *, int, void**);
 
+int jgrapht_sp_singlesource_get_distance_to_vertex(void *, int, double*);
+
+int jgrapht_sp_singlesource_get_distances(void *, void *, double*, int);
+
+int jgrapht_sp_singlesource_get_predecessors(void *, void *, int, double*, int, int*, int);
+
 int jgrapht_sp_allpairs_get_path_between_vertices(void *, int, int, void**);
 
 int jgrapht_sp_allpairs_get_singlesource_from_vertex(void *, int, void**);
@@ -43,6 +43,85 @@
     }
 }
 
+// Contiguous arrays of ints, floats or doubles, passed as a pointer together with
+// their length in elements. Any object supporting the buffer protocol can be
+// used, such as array.array, memoryview or numpy arrays. The _IN variants
+// only read from the buffer, while the _OUT variants require it to be writable.
+%{
+static int check_array_buffer(PyObject *input, Py_buffer *view, int flags, Py_ssize_t itemsize, const char *typecodes) {
+    const char *format;
+    char code;
+
+    if (PyObject_GetBuffer(input, view, flags | PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+        return 0;
+    }
+    format = view->format != NULL ? view->format : "B";
+    if (format[0] == '@' || format[0] == '=' || format[0] == '<' || format[0] == '>' || format[0] == '!') {
+        format++;
+    }
+    code = format[0];
+    if (view->itemsize != itemsize || code == '\0' || format[1] != '\0' || strchr(typecodes, code) == NULL) {
+        PyErr_Format(PyExc_TypeError, "expected a contiguous buffer with items of type '%s'", typecodes);
+        PyBuffer_Release(view);
+        return 0;
+    }
+    if (view->len / itemsize > INT_MAX) {
+        PyErr_SetString(PyExc_OverflowError, "buffer too large");
+        PyBuffer_Release(view);
+        return 0;
+    }
+    return 1;
+}
+%}
+
+%define %array_buffer_typemap(TYPE, NAME, FLAGS, TYPECODES)
+%typemap(in) (TYPE *NAME, int LENGTH) (Py_buffer view, int has_view = 0) {
+    if (!check_array_buffer($input, &view, FLAGS, sizeof(TYPE), TYPECODES)) {
+        SWIG_fail;
+    }
+    has_view = 1;
+    $1 = (TYPE *) view.buf;
+    $2 = (int) (view.len / sizeof(TYPE));
+}
+%typemap(freearg) (TYPE *NAME, int LENGTH) {
+    if (has_view$argnum) {
+        PyBuffer_Release(&view$argnum);
+    }
+}
+%enddef
+
+%array_buffer_typemap(int, INT_ARRAY_IN, PyBUF_SIMPLE, "il")
+%array_buffer_typemap(int, INT_ARRAY_OUT, PyBUF_WRITABLE, "il")
+%array_buffer_typemap(double, DOUBLE_ARRAY_IN, PyBUF_SIMPLE, "d")
+%array_buffer_typemap(double, DOUBLE_ARRAY_OUT, PyBUF_WRITABLE, "d")
+%array_buffer_typemap(float, FLOAT_ARRAY_OUT, PyBUF_WRITABLE, "f")
+%array_buffer_typemap(unsigned char, BYTE_ARRAY_IN, PyBUF_SIMPLE, "?bB")
+
+// A sequence of handles, passed as an array of pointers together with its length.
+%typemap(in) (void **HANDLES, int LENGTH) (PyObject *seq = NULL) {
+    Py_ssize_t i;
+    seq = PySequence_Fast($input, "expected a sequence of handles");
+    if (seq == NULL) {
+        SWIG_fail;
+    }
+    $2 = (int) PySequence_Fast_GET_SIZE(seq);
+    $1 = (void **) malloc(sizeof(void *) * ($2 > 0 ? $2 : 1));
+    if ($1 == NULL) {
+        PyErr_NoMemory();
+        SWIG_fail;
+    }
+    for (i = 0; i < $2; i++) {
+        if (SWIG_ConvertPtr(PySequence_Fast_GET_ITEM(seq, i), &$1[i], 0, 0) == -1) {
+            SWIG_exception_fail(SWIG_TypeError, "in method '" "$symname" "', expected a sequence of handles");
+        }
+    }
+}
+
+%typemap(freearg) (void **HANDLES, int LENGTH) {
+    free($1);
+    Py_XDECREF(seq$argnum);
+}
+
 enum status_t { 
     STATUS_SUCCESS = 0,
     STATUS_ERROR,
@@ -85,6 +164,10 @@ typedef enum {
 
 // library init
 
+int jgrapht_isolate_configure(long long max_heap, long long min_heap, long long young_gen, long long reserved_address_space);
+
+int jgrapht_isolate_supports_heap_options();
+
 void jgrapht_isolate_create();
 
 void jgrapht_isolate_destroy();
@@ -150,8 +233,72 @@ int raise_exception_on_error(int result) {
 }
 %}
 
+// Each thread calls into the backend using its own isolate thread, which is 
+// attached on its first call. Long running calls, such as algorithms, importers, 
+// exporters and bulk operations, release the GIL while executing, so that they 
+// can run in parallel with calls from other threads. All other calls keep the GIL.
+
+%{
+static const char *backend_gil_releasing_prefixes[] = {
+    "jgrapht_export_",
+    "jgrapht_generate_",
+    "jgrapht_import_",
+    "jgrapht_tour_",
+    "jgrapht_cut_gomoryhu_",
+    "jgrapht_equivalentflowtree_",
+    "jgrapht_graph_sparse_create",
+    "jgrapht_graph_copy_to_sparse",
+    "jgrapht_graph_csr_",
+    "jgrapht_graph_degrees",
+    "jgrapht_graph_vertices_max",
+    "jgrapht_graph_add_edges",
+    "jgrapht_graph_add_vertices",
+    "jgrapht_graph_add_given_vertices",
+    "jgrapht_graph_get_edge_weights",
+    "jgrapht_graph_set_edge_weights",
+    "jgrapht_handles_destroy_all",
+    "jgrapht_spgraph_create",
+    "jgrapht_spgraph_distance_matrix",
+    "jgrapht_spgraph_distance_matrix_float",
+    "jgrapht_spgraph_multi_source",
+    "jgrapht_sp_singlesource_get_distances",
+    "jgrapht_sp_singlesource_get_predecessors",
+    "jgrapht_heuristic_landmarks_",
+    "jgrapht_ch_",
+    NULL
+};
+
+static int backend_releases_gil(const char *name) { 
+    const char **prefix;
+    if (strstr(name, "_exec_") != NULL) { 
+        return 1;
+    }
+    for (prefix = backend_gil_releasing_prefixes; *prefix != NULL; prefix++) { 
+        if (strncmp(name, *prefix, strlen(*prefix)) == 0) { 
+            return 1;
+        }
+    }
+    return 0;
+}
+%}
+
 %exception { 
-    $action
+    static int release_gil = -1;
+    PyThreadState *_save = NULL;
+
+    if (release_gil == -1) { 
+        release_gil = backend_releases_gil("$name");
+    }
+    if (release_gil) { 
+        _save = PyEval_SaveThread();
+    }
+    result = jgrapht_thread_attach();
+    if (result == STATUS_SUCCESS) { 
+        $action
+    }
+    if (_save != NULL) { 
+        PyEval_RestoreThread(_save);
+    }
     if (raise_exception_on_error(result)) { 
         SWIG_fail;
     }
@@ -183,6 +330,9 @@ class GraphEvent(Enum):
     EDGE_ADDED = _backend.GRAPH_EVENT_EDGE_ADDED
     EDGE_REMOVED = _backend.GRAPH_EVENT_EDGE_REMOVED
     EDGE_WEIGHT_UPDATED = _backend.GRAPH_EVENT_EDGE_WEIGHT_UPDATED
+    # Batched events, raised only by the Python side. The element passed to
+    # listeners is the sequence of affected edges.
+    EDGE_WEIGHTS_UPDATED = 31
 %}
 
 // attribute store 
@@ -421,6 +571,8 @@ int jgrapht_graph_create(int, int, int, int, void **OUTPUT);
 
 int jgrapht_graph_sparse_create(int, int, int, void *, void** OUTPUT);
 
+int jgrapht_graph_sparse_create_from_arrays(int, int, int, int *INT_ARRAY_IN, int LENGTH, int *INT_ARRAY_IN, int LENGTH, double *DOUBLE_ARRAY_IN, int LENGTH, void** OUTPUT);
+
 int jgrapht_graph_vertices_count(void *, int* OUTPUT);
 
 int jgrapht_graph_edges_count(void *, int* OUTPUT);
@@ -429,6 +581,10 @@ int jgrapht_graph_add_vertex(void *, int* OUTPUT);
 
 int jgrapht_graph_add_given_vertex(void *, int, int *OUTPUT);
 
+int jgrapht_graph_add_vertices(void *, int *INT_ARRAY_OUT, int LENGTH);
+
+int jgrapht_graph_add_given_vertices(void *, int *INT_ARRAY_IN, int LENGTH);
+
 int jgrapht_graph_remove_vertex(void *, int, int* OUTPUT);
 
 int jgrapht_graph_contains_vertex(void *, int, int* OUTPUT);
@@ -437,6 +593,8 @@ int jgrapht_graph_add_edge(void *, int, int, int* OUTPUT);
 
 int jgrapht_graph_add_given_edge(void *, int, int, int, int* OUTPUT);
 
+int jgrapht_graph_add_edges(void *, int *INT_ARRAY_IN, int LENGTH, int *INT_ARRAY_IN, int LENGTH, double *DOUBLE_ARRAY_IN, int LENGTH, int *INT_ARRAY_OUT, int LENGTH);
+
 int jgrapht_graph_remove_edge(void *, int, int* OUTPUT);
 
 int jgrapht_graph_contains_edge(void *, int, int* OUTPUT);
@@ -449,6 +607,12 @@ int jgrapht_graph_indegree_of(void *, int, int* OUTPUT);
 
 int jgrapht_graph_outdegree_of(void *, int, int* OUTPUT);
 
+int jgrapht_graph_vertices_max(void *, int* OUTPUT);
+
+int jgrapht_graph_degrees(void *, int, int *INT_ARRAY_OUT, int LENGTH);
+
+int jgrapht_graph_copy_to_sparse(void *, int *INT_ARRAY_IN, int LENGTH, int *INT_ARRAY_OUT, int LENGTH, void** OUTPUT);
+
 int jgrapht_graph_edge_source(void *, int, int* OUTPUT);
 
 int jgrapht_graph_edge_target(void *, int, int* OUTPUT);
@@ -471,6 +635,10 @@ int jgrapht_graph_get_edge_weight(void *, int, double* OUTPUT);
 
 int jgrapht_graph_set_edge_weight(void *, int, double);
 
+int jgrapht_graph_get_edge_weights(void *, int *INT_ARRAY_IN, int LENGTH, double *DOUBLE_ARRAY_OUT, int LENGTH);
+
+int jgrapht_graph_set_edge_weights(void *, int *INT_ARRAY_IN, int LENGTH, double *DOUBLE_ARRAY_IN, int LENGTH);
+
 int jgrapht_graph_create_all_vit(void *, void** OUTPUT);
 
 int jgrapht_graph_create_all_eit(void *, void** OUTPUT);
@@ -483,6 +651,10 @@ int jgrapht_graph_vertex_create_out_eit(void *, int, void** OUTPUT);
 
 int jgrapht_graph_vertex_create_in_eit(void *, int, void** OUTPUT);
 
+int jgrapht_graph_csr_offsets(void *, int *INT_ARRAY_OUT, int LENGTH);
+
+int jgrapht_graph_csr_fill(void *, int *INT_ARRAY_IN, int LENGTH, int *INT_ARRAY_OUT, int LENGTH, int *INT_ARRAY_OUT, int LENGTH, double *DOUBLE_ARRAY_OUT, int LENGTH);
+
 int jgrapht_graph_as_undirected(void *, void** OUTPUT);
 
 int jgrapht_graph_as_unmodifiable(void *, void** OUTPUT);
@@ -497,6 +669,74 @@ int jgrapht_graph_as_masked_subgraph(void *, void *LONG_TO_FPTR, void *LONG_TO_F
 
 int jgrapht_graph_as_subgraph(void *, void *, void *, void** OUTPUT);
 
+// masks
+
+int jgrapht_mask_create(int* OUTPUT);
+
+int jgrapht_mask_destroy(int);
+
+int jgrapht_mask_get_callbacks(int, long long* OUTPUT, long long* OUTPUT);
+
+int jgrapht_mask_assign(int, int, unsigned char *BYTE_ARRAY_IN, int LENGTH);
+
+int jgrapht_mask_set(int, int, int *INT_ARRAY_IN, int LENGTH, int);
+
+int jgrapht_mask_clear(int, int);
+
+int jgrapht_mask_test(int, int, int, int* OUTPUT);
+
+// shortest path graphs
+
+int jgrapht_spgraph_create(void *, void** OUTPUT);
+
+int jgrapht_spgraph_destroy(void *);
+
+int jgrapht_spgraph_get_info(void *, int* OUTPUT, int* OUTPUT, int* OUTPUT);
+
+int jgrapht_spgraph_check(void *, int *INT_ARRAY_IN, int LENGTH, int);
+
+int jgrapht_spgraph_distance_matrix(void *, int *INT_ARRAY_IN, int LENGTH, int *INT_ARRAY_IN, int LENGTH, int, int, double *DOUBLE_ARRAY_OUT, int LENGTH, int *INT_ARRAY_OUT, int LENGTH);
+
+int jgrapht_spgraph_distance_matrix_float(void *, int *INT_ARRAY_IN, int LENGTH, int *INT_ARRAY_IN, int LENGTH, int, int, float *FLOAT_ARRAY_OUT, int LENGTH);
+
+int jgrapht_spgraph_multi_source(void *, int *INT_ARRAY_IN, int LENGTH, int *INT_ARRAY_IN, int LENGTH, int, double, double, int, int, double *DOUBLE_ARRAY_OUT, int LENGTH);
+
+// heuristics
+
+int jgrapht_heuristic_create(int, double, double *DOUBLE_ARRAY_IN, int LENGTH, double *DOUBLE_ARRAY_IN, int LENGTH, int* OUTPUT);
+
+int jgrapht_heuristic_destroy(int);
+
+int jgrapht_heuristic_get_callback(int, long long* OUTPUT);
+
+int jgrapht_heuristic_get_memory(int, long long* OUTPUT);
+
+int jgrapht_heuristic_landmarks_compute(void *, int *INT_ARRAY_IN, int LENGTH, int, int, long long, int* OUTPUT);
+
+int jgrapht_heuristic_landmarks_create(int *INT_ARRAY_IN, int LENGTH, double *DOUBLE_ARRAY_IN, int LENGTH, double *DOUBLE_ARRAY_IN, int LENGTH, int* OUTPUT);
+
+int jgrapht_heuristic_landmarks_get_info(int, int* OUTPUT, int* OUTPUT, int* OUTPUT);
+
+int jgrapht_heuristic_landmarks_get(int, int *INT_ARRAY_OUT, int LENGTH, double *DOUBLE_ARRAY_OUT, int LENGTH, double *DOUBLE_ARRAY_OUT, int LENGTH);
+
+// contraction hierarchies
+
+int jgrapht_ch_create(void *, void** OUTPUT);
+
+int jgrapht_ch_destroy(void *);
+
+int jgrapht_ch_get_info(void *, int* OUTPUT, int* OUTPUT);
+
+int jgrapht_ch_get_memory(void *, long long* OUTPUT);
+
+int jgrapht_ch_get_arrays(void *, int *INT_ARRAY_OUT, int LENGTH, int *INT_ARRAY_OUT, int LENGTH, int *INT_ARRAY_OUT, int LENGTH, int *INT_ARRAY_OUT, int LENGTH, int *INT_ARRAY_OUT, int LENGTH, int *INT_ARRAY_OUT, int LENGTH, int *INT_ARRAY_OUT, int LENGTH, double *DOUBLE_ARRAY_OUT, int LENGTH);
+
+int jgrapht_ch_create_from_arrays(void *, int *INT_ARRAY_IN, int LENGTH, int *INT_ARRAY_IN, int LENGTH, int *INT_ARRAY_IN, int LENGTH, int *INT_ARRAY_IN, int LENGTH, int *INT_ARRAY_IN, int LENGTH, int *INT_ARRAY_IN, int LENGTH, int *INT_ARRAY_IN, int LENGTH, double *DOUBLE_ARRAY_IN, int LENGTH, void** OUTPUT);
+
+int jgrapht_ch_get_distance(void *, int, int, double* OUTPUT);
+
+int jgrapht_ch_get_path(void *, int, int, int *INT_ARRAY_OUT, int LENGTH, double* OUTPUT, int* OUTPUT);
+
 int jgrapht_graph_as_graph_union(void *, void *, void *LONG_TO_FPTR, void** OUTPUT);
 
 int jgrapht_graph_dag_create(int, int, void** OUTPUT);
@@ -571,6 +811,8 @@ int jgrapht_graph_test_is_k5_subdivision(void *, int* OUTPUT);
 
 int jgrapht_handles_destroy(void *);
 
+int jgrapht_handles_destroy_all(void **HANDLES, int LENGTH);
+
 int jgrapht_handles_get_ccharpointer(void *, char** OUTPUT);
 
 int jgrapht_handles_get_edge_pair(void *, int* OUTPUT, int* OUTPUT);
@@ -721,6 +963,12 @@ int jgrapht_it_next_object(void *, void** OUTPUT);
 
 int jgrapht_it_hasnext(void *, int* OUTPUT);
 
+int jgrapht_it_next_int_chunk(void *, int *INT_ARRAY_OUT, int LENGTH, int* OUTPUT);
+
+int jgrapht_it_next_double_chunk(void *, double *DOUBLE_ARRAY_OUT, int LENGTH, int* OUTPUT);
+
+int jgrapht_it_next_edge_triple_chunk(void *, int *INT_ARRAY_OUT, int LENGTH, int *INT_ARRAY_OUT, int LENGTH, double *DOUBLE_ARRAY_OUT, int LENGTH, int* OUTPUT);
+
 // list
 
 int jgrapht_list_create(void** OUTPUT);
@@ -907,6 +1155,12 @@ int jgrapht_sp_exec_floydwarshall_get_allpairs(void *, void** OUTPUT);
 
 int jgrapht_sp_singlesource_get_path_to_vertex(void *, int, void** OUTPUT);
 
+int jgrapht_sp_singlesource_get_distance_to_vertex(void *, int, double* OUTPUT);
+
+int jgrapht_sp_singlesource_get_distances(void *, void *, double *DOUBLE_ARRAY_OUT, int LENGTH);
+
+int jgrapht_sp_singlesource_get_predecessors(void *, void *, int, double *DOUBLE_ARRAY_IN, int LENGTH, int *INT_ARRAY_OUT, int LENGTH);
+
 int jgrapht_sp_allpairs_get_path_between_vertices(void *, int, int, void** OUTPUT);
 
 int jgrapht_sp_allpairs_get_singlesource_from_vertex(void *, int, void** OUTPUT);
@@ -0,0 +1,100 @@
+from collections import namedtuple
+import os
+import sys
+
+from ._internals._wrappers import (
+    _enable_accounting,
+    _get_live_handles,
+    _set_allocation_tracing,
+    _get_allocation_sites,
+)
+from ._internals._config import _isolate_params
+
+
+MemoryInfo = namedtuple(
+    "MemoryInfo", ["resident", "max_heap", "min_heap", "young_gen", "backend_started"]
+)
+
+
+def live_handles():
+    """Count the live handles to backend objects, by wrapper type.
+
+    Every graph, iterator, path, set, etc. returned by the library keeps a handle to an
+    object inside the backend, which is released only when the wrapper is closed or
+    garbage collected. Native objects, such as heuristics, masks, ALT indices and
+    contraction hierarchies, are counted as well. Wrappers which are retained by mistake
+    (e.g. in caches) pin the corresponding backend objects, which shows up as a growing
+    count here.
+
+    Handles are only counted once diagnostics are used, either by calling this function
+    or :py:meth:`trace_allocations`, so that the accounting costs nothing otherwise.
+    Handles created before are not counted, thus call this function once at startup in
+    order to count all of them.
+
+    :returns: a dictionary from wrapper type names to number of live handles
+    """
+    _enable_accounting()
+    return _get_live_handles()
+
+
+def trace_allocations(depth=10):
+    """Start or stop recording the allocation site of each live handle.
+
+    Recording allocation sites has a cost for each created wrapper and should only be
+    enabled while diagnosing a leak. Only handles created while tracing are recorded.
+
+    :param depth: number of stack frames to record, or 0 to stop tracing and
+      discard all recorded sites
+    """
+    if depth < 0:
+        raise ValueError("Depth must be non-negative")
+    _set_allocation_tracing(depth)
+
+
+def allocation_sites(limit=None):
+    """Group the live handles by allocation site.
+
+    Requires tracing to be enabled using :py:meth:`trace_allocations`.
+
+    :param limit: if given, only the sites with the most live handles are returned
+    :returns: a list of tuples (count, wrapper type name, stack), sorted by count in
+      decreasing order. The stack is a list of :py:class:`traceback.FrameSummary`, which
+      can be formatted using :py:func:`traceback.format_list`.
+    """
+    sites = _get_allocation_sites()
+    if limit is not None:
+        sites = sites[:limit]
+    return sites
+
+
+def memory_info():
+    """Report the memory usage of the process and the configuration of the backend heap.
+
+    The backend does not expose statistics about its heap, thus the resident memory of
+    the whole process, which includes the backend heap, is reported together with the
+    configured heap limits (see :py:meth:`jgrapht.configure`). A limit of zero means
+    the default of the backend.
+
+    :returns: a named tuple (resident, max_heap, min_heap, young_gen, backend_started)
+      with sizes in bytes. The resident memory is the current one of the process and is
+      None if not available on the platform, e.g. on systems without procfs.
+    """
+    backend = sys.modules.get(__package__ + ".backend")
+    started = backend is not None and bool(backend.jgrapht_isolate_is_attached())
+    return MemoryInfo(
+        resident=_resident_memory(),
+        max_heap=_isolate_params["max_heap"],
+        min_heap=_isolate_params["min_heap"],
+        young_gen=_isolate_params["young_gen"],
+        backend_started=started,
+    )
+
+
+def _resident_memory():
+    # current resident memory, only available through procfs. The peak resident
+    # memory reported by getrusage elsewhere would be misleading here.
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
@@ -1,5 +1,26 @@
-from . import (
-    importers,
-    exporters,
-    edgelist,
+import importlib
+import sys
+
+# Submodules are imported on first access.
+_SUBMODULES = (
+    "importers",
+    "exporters",
+    "edgelist",
 )
+
+if sys.version_info < (3, 7):
+    # no support for module level __getattr__
+    from . import (
+        importers,
+        exporters,
+        edgelist,
+    )
+else:
+
+    def __getattr__(name):
+        if name in _SUBMODULES:
+            return importlib.import_module("." + name, __name__)
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | set(_SUBMODULES))
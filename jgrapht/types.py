@@ -1,3 +1,4 @@
+import math
 from abc import ABC, abstractmethod
 from collections.abc import Mapping
 from .backend import GraphEvent
@@ -252,6 +253,47 @@ class SingleSourcePaths(ABC):
         """
         pass
 
+    def distance_to(self, target_vertex):
+        """Get the distance to a target vertex.
+
+        The default implementation builds the path, which implementations override
+        in order to avoid it.
+
+        :param target_vertex: The target vertex.
+        :returns: the distance or infinity if the target is unreachable.
+        """
+        path = self.get_path(target_vertex)
+        return path.weight if path is not None else math.inf
+
+    def distances(self):
+        """The distances of all vertices from the source.
+
+        For graphs with integer vertices this is an array of C doubles indexed by
+        vertex, which can be wrapped as a NumPy array without copying. For
+        any-hashable graphs it is a dictionary from vertices to distances. The
+        default implementation returns such a dictionary, built from the path to
+        every vertex.
+        """
+        graph = self.get_path(self.source_vertex).graph
+        return {v: self.distance_to(v) for v in graph.vertices}
+
+    def predecessors(self):
+        """The predecessors of all vertices in the shortest path tree.
+
+        For graphs with integer vertices this is an array of C ints indexed by
+        vertex, with -1 for vertices without a predecessor. For any-hashable graphs
+        it is a dictionary from vertices to their previous vertex. The default
+        implementation returns such a dictionary, built from the path to every
+        vertex.
+        """
+        graph = self.get_path(self.source_vertex).graph
+        pred = {}
+        for v in graph.vertices:
+            path = self.get_path(v)
+            if path is not None and v != self.source_vertex:
+                pred[v] = path.vertices[-2]
+        return pred
+
 
 class AllPairsPaths(ABC):
     """Paths between all pair of vertices. Used in all-pair shortest
@@ -300,6 +342,182 @@ class MultiObjectiveSingleSourcePaths(ABC):
         pass
 
 
+class ALTIndex(ABC):
+    """A precomputed index of landmarks and their distances, used as an admissible
+    heuristic for the A* algorithm (ALT heuristic).
+
+    The index is computed once and can then serve any number of point-to-point
+    queries on the same graph, as long as the graph is not modified.
+    """
+
+    @abstractmethod
+    def landmarks(self):
+        """The landmarks of the index."""
+        pass
+
+    @abstractmethod
+    def memory_usage(self):
+        """The number of bytes used by the distance tables of the index."""
+        pass
+
+    @abstractmethod
+    def get_path(self, source_vertex, target_vertex, use_bidirectional=True):
+        """Get a shortest path from a source vertex to a target vertex.
+
+        :param source_vertex: The source vertex
+        :param target_vertex: The target vertex
+        :param use_bidirectional: use a bidirectional search
+        :returns: A path from the source vertex to the target vertex or None if the
+          target is unreachable
+        :rtype: :py:class:`.GraphPath`
+        """
+        pass
+
+    @abstractmethod
+    def save(self, filename):
+        """Save the index to a file.
+
+        :param filename: The filename
+        """
+        pass
+
+    @abstractmethod
+    def close(self):
+        """Release the index. It cannot be used afterwards."""
+        pass
+
+
+class ContractionHierarchy(ABC):
+    """A contraction hierarchy, a precomputed overlay of shortcut edges which answers
+    point-to-point shortest path queries using a bidirectional upward search.
+
+    The hierarchy is computed once and can then serve any number of queries on the
+    same graph, as long as the graph is not modified.
+    """
+
+    @abstractmethod
+    def memory_usage(self):
+        """The number of bytes used by the hierarchy."""
+        pass
+
+    @abstractmethod
+    def get_distance(self, source_vertex, target_vertex):
+        """Get the shortest path distance from a source vertex to a target vertex.
+
+        :param source_vertex: The source vertex
+        :param target_vertex: The target vertex
+        :returns: The distance or infinity if the target is unreachable
+        :rtype: Double
+        """
+        pass
+
+    @abstractmethod
+    def get_path(self, source_vertex, target_vertex):
+        """Get a shortest path from a source vertex to a target vertex.
+
+        The shortcuts of the hierarchy are unpacked, thus the path contains the actual
+        edges of the graph.
+
+        :param source_vertex: The source vertex
+        :param target_vertex: The target vertex
+        :returns: A path from the source vertex to the target vertex or None if the
+          target is unreachable
+        :rtype: :py:class:`.GraphPath`
+        """
+        pass
+
+    @abstractmethod
+    def save(self, filename):
+        """Save the hierarchy to a file.
+
+        :param filename: The filename
+        """
+        pass
+
+    @abstractmethod
+    def close(self):
+        """Release the hierarchy. It cannot be used afterwards."""
+        pass
+
+
+class ShortestPathCache(ABC):
+    """A cache of point-to-point shortest path queries on a listenable graph.
+
+    Paths are kept in least-recently-used order and are discarded automatically
+    when the graph changes in a way which might affect them.
+    """
+
+    @abstractmethod
+    def hits(self):
+        """The number of queries answered from the cache."""
+        pass
+
+    @abstractmethod
+    def misses(self):
+        """The number of queries which had to be computed."""
+        pass
+
+    @abstractmethod
+    def dijkstra(self, source_vertex, target_vertex, use_bidirectional=True):
+        """Get a shortest path using Dijkstra's algorithm, see
+        :py:meth:`jgrapht.algorithms.shortestpaths.dijkstra`.
+
+        :param source_vertex: The source vertex
+        :param target_vertex: The target vertex
+        :param use_bidirectional: Whether to use a bidirectional search on a miss
+        :returns: A path or None if the target is unreachable
+        :rtype: :py:class:`.GraphPath`
+        """
+        pass
+
+    @abstractmethod
+    def a_star(
+        self,
+        source_vertex,
+        target_vertex,
+        heuristic_cb=None,
+        use_bidirectional=False,
+        coordinates=None,
+        metric="euclidean",
+    ):
+        """Get a shortest path using the A* algorithm, see
+        :py:meth:`jgrapht.algorithms.shortestpaths.a_star`.
+
+        Paths are cached per heuristic, compared by identity, and per search
+        direction. Coordinates are converted to a native heuristic once and reused
+        as long as the same coordinates object and metric are passed, thus it should
+        not be modified in the meantime.
+
+        :param source_vertex: The source vertex
+        :param target_vertex: The target vertex
+        :returns: A path or None if the target is unreachable
+        :rtype: :py:class:`.GraphPath`
+        """
+        pass
+
+    @abstractmethod
+    def bfs(self, source_vertex, target_vertex):
+        """Get a path with the minimum number of edges using breadth-first search,
+        see :py:meth:`jgrapht.algorithms.shortestpaths.bfs`.
+
+        :param source_vertex: The source vertex
+        :param target_vertex: The target vertex
+        :returns: A path or None if the target is unreachable
+        :rtype: :py:class:`.GraphPath`
+        """
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """Remove all paths from the cache. The counters are not reset."""
+        pass
+
+    @abstractmethod
+    def close(self):
+        """Clear the cache and stop listening to the graph."""
+        pass
+
+
 class Graph(ABC):
     """A graph."""
 
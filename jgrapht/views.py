@@ -9,6 +9,7 @@ from ._internals._views import (
     _WeightedView,
     _GraphUnion,
     _ListenableView,
+    _edge_weights_to_arrays,
 )
 
 from ._internals._anyhashableg import (
@@ -74,7 +75,9 @@ def as_edge_reversed(graph):
         return _EdgeReversedGraphView(graph)
 
 
-def as_masked_subgraph(graph, vertex_mask_cb, edge_mask_cb=None):
+def as_masked_subgraph(
+    graph, vertex_mask_cb=None, edge_mask_cb=None, vertex_mask=None, edge_mask=None
+):
     """Create a masked subgraph view. 
 
     This is an unmodifiable subgraph induced by the vertex/edge masking callbacks. The subgraph
@@ -86,20 +89,48 @@ def as_masked_subgraph(graph, vertex_mask_cb, edge_mask_cb=None):
     .. note :: Callback functions accept the vertex or edge as a parameter and they must return 
       true or false indicating whether the vertex or edge should be masked.
 
+    Instead of callbacks, the masks can be given as data using parameters `vertex_mask` and
+    `edge_mask`. A mask is either a set of vertices (edges) to mask, or, for graphs with 
+    integer vertices, an array of flags indexed by the vertices (edges) where true means masked,
+    such as a NumPy boolean array. Such masks are stored as bitmasks and tested natively,
+    without calling into Python, which is much faster than using callbacks. Moreover, they can
+    be updated in place between runs of algorithms, using the methods `set_vertex_mask`, 
+    `set_edge_mask`, `mask_vertices` and `mask_edges` of the returned view::
+
+        sub = as_masked_subgraph(g, vertex_mask=flags)
+        for flags in many_flags:
+            sub.set_vertex_mask(flags)
+            run_algorithm(sub)
+
+    Each view with a mask given as data occupies one of a limited number of slots of the
+    backend, thus views with masks should not be kept around longer than needed. Only masks
+    given as data can be updated, pass an empty set to start with nothing masked. If neither
+    a callback nor a mask is given, nothing is masked.
+
     :param graph: the original graph
     :param vertex_mask_cb: a vertex mask callback
     :param edge_mask_cb: an edge mask callback
+    :param vertex_mask: a set of vertices to mask or an array of flags
+    :param edge_mask: a set of edges to mask or an array of flags
     :returns: a masked subgraph 
     """
     if _is_anyhashable_graph(graph):
         return _as_masked_subgraph_anyhashable_graph(
-            graph, vertex_mask_cb, edge_mask_cb
+            graph, vertex_mask_cb, edge_mask_cb, vertex_mask, edge_mask
         )
     else:
-        return _MaskedSubgraphView(graph, vertex_mask_cb, edge_mask_cb)
+        return _MaskedSubgraphView(
+            graph, vertex_mask_cb, edge_mask_cb, vertex_mask, edge_mask
+        )
 
 
-def as_weighted(graph, edge_weight_cb, cache_weights=True, write_weights_through=False):
+def as_weighted(
+    graph,
+    edge_weight_cb=None,
+    cache_weights=True,
+    write_weights_through=False,
+    weights=None,
+):
     """Create a weighted view of a graph.
 
     This function can be used to make an unweighted graph weighted, to override the weights
@@ -110,6 +141,15 @@ def as_weighted(graph, edge_weight_cb, cache_weights=True, write_weights_through
     edge weight callback is None, then a default function which always returns 1.0 is 
     used. 
 
+    Alternatively, the weights can be given explicitly using parameter weights. This is
+    either a mapping from edges to weights, or (for graphs with integer edges) an array
+    indexed by the edge identifiers, such as an :py:class:`array.array` or a NumPy array.
+    The weights are copied into the backend once, when the view is created, and are
+    afterwards looked up by the backend without calling back into Python. This is much
+    faster than using a callback when running algorithms on the view. Edges without an
+    explicit weight fall back to the edge weight callback. Explicit weights require
+    caching of weights and cannot be written through.
+
     If parameter cache_weights is True, then the edge weight function is only called once
     to initialize the weight. Other calls will return the cached weight without calling the 
     provided function. Moreover, the returned value can be adjusted. Note that calling 
@@ -124,15 +164,26 @@ def as_weighted(graph, edge_weight_cb, cache_weights=True, write_weights_through
     :param cache_weights: if true weights are cached once computed by the weight function
     :param write_weights_through: if true, any weight adjustment by method 
       :py:meth:`~jgrapht.types.Graph.set_edge_weight` will be propagated to the backing graph
+    :param weights: mapping from edges to weights, or array of weights indexed by the
+      edge identifiers
     :returns: a weighted view
     """
+    if weights is not None:
+        if not cache_weights:
+            raise ValueError("Explicit weights require caching of weights")
+        if write_weights_through:
+            raise ValueError("Explicit weights cannot be written through")
+
     if _is_anyhashable_graph(graph):
         return _as_weighted_anyhashable_graph(
-            graph, edge_weight_cb, cache_weights, write_weights_through
+            graph, edge_weight_cb, cache_weights, write_weights_through, weights
         )
     else:
+        edges = None
+        if weights is not None:
+            edges, weights = _edge_weights_to_arrays(graph, weights)
         return _WeightedView(
-            graph, edge_weight_cb, cache_weights, write_weights_through
+            graph, edge_weight_cb, cache_weights, write_weights_through, edges, weights
         )
 
 
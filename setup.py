@@ -103,7 +103,14 @@ class CustomBuildExt(build_ext):
         self.run_command('build_capi')
         super().run()
 
+# Passing heap options to the isolate requires a GraalVM whose graal_isolate.h
+# provides the argc/argv isolate parameters. Enable with JGRAPHT_ISOLATE_ARGS=1.
+define_macros = []
+if os.environ.get('JGRAPHT_ISOLATE_ARGS') == '1':
+    define_macros.append(('JGRAPHT_ISOLATE_ARGS', None))
+
 _backend_extension = Extension('jgrapht._backend', ['jgrapht/backend.i','jgrapht/backend.c'],
+                               define_macros=define_macros,
                                include_dirs=['jgrapht/', 'vendor/build/jgrapht-capi/', 'vendor/build/jgrapht-capi/src/main/native'],
                                library_dirs=['vendor/build/jgrapht-capi/'],
                                libraries=['jgrapht_capi'],
@@ -460,6 +460,91 @@ def test_listenable_property_graph():
     assert vertices == ["v0", "v1", "v2", "v3", "v4"]
 
 
+def test_anyhashable_graph_bulk_add():
+
+    g = create_graph(
+        directed=True,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=True,
+        any_hashable=True,
+        vertex_supplier=create_vertex_supplier(),
+        edge_supplier=create_edge_supplier(),
+    )
+
+    events = []
+
+    def listener(element, event):
+        events.append((element, event))
+
+    g.add_listener(listener)
+
+    assert g.add_vertices_from(["a", "b", "a", None, "c"]) == ["a", "b", "a", "v0", "c"]
+    assert g.vertices == {"a", "b", "c", "v0"}
+
+    edges = g.add_edges_from([("a", "b"), ("b", "c", 3.0, "bc"), ("b", "c", 5.0, "bc")])
+    assert edges == ["e0", "bc", "bc"]
+    assert g.edge_tuple("e0") == ("a", "b", 1.0)
+    assert g.edge_tuple("bc") == ("b", "c", 3.0)
+
+    assert events == [
+        ("a", GraphEvent.VERTEX_ADDED),
+        ("b", GraphEvent.VERTEX_ADDED),
+        ("v0", GraphEvent.VERTEX_ADDED),
+        ("c", GraphEvent.VERTEX_ADDED),
+        ("e0", GraphEvent.EDGE_ADDED),
+        ("bc", GraphEvent.EDGE_ADDED),
+        ("bc", GraphEvent.EDGE_WEIGHT_UPDATED),
+    ]
+
+    # as when adding one by one, the edges before an invalid one are added
+    del events[:]
+    with pytest.raises(ValueError):
+        g.add_edges_from([("a", "c"), ("a", "d"), ("b", "a")])
+    assert len(g.edges) == 3
+    assert g.contains_edge("e1")
+    assert events == [("e1", GraphEvent.EDGE_ADDED)]
+
+
+def test_anyhashable_graph_degrees():
+
+    g = create_graph(directed=True, any_hashable=True)
+
+    g.add_vertices_from(["a", "b", "c"])
+    g.add_edges_from([("a", "b"), ("a", "c"), ("b", "c")])
+
+    assert g.degrees(kind="out") == {"a": 2, "b": 1, "c": 0}
+    assert g.degrees(kind="in") == {"a": 0, "b": 1, "c": 2}
+    assert list(g.degrees(vertices=["c", "a"])) == [2, 2]
+
+    with pytest.raises(ValueError):
+        g.degrees(vertices=["d"])
+
+
+def test_anyhashable_graph_bulk_weights():
+
+    g = create_graph(directed=True, any_hashable=True)
+
+    g.add_vertices_from(["a", "b", "c"])
+    g.add_edges_from([("a", "b", 1.0, "ab"), ("b", "c", 2.0, "bc")])
+
+    events = []
+
+    def listener(element, event):
+        events.append((element, event))
+
+    g.add_listener(listener)
+
+    g.set_edge_weights(["bc", "ab"], [5.0, 6.0])
+
+    assert list(g.get_edge_weights()) == [6.0, 5.0]
+    assert list(g.get_edge_weights(["bc"])) == [5.0]
+    assert events == [(["bc", "ab"], GraphEvent.EDGE_WEIGHTS_UPDATED)]
+
+    with pytest.raises(ValueError):
+        g.set_edge_weights(["cd"], [1.0])
+
+
 def test_anyhashable_graph_sparse_weighted():
 
     edgelist = [
@@ -626,4 +711,54 @@ def test_graph_copy_to_sparse_with_attrs():
     assert gs.vertex_attrs['10']['color'] == 'unknown'
 
     gs.graph_attrs['type'] == 'directed'
-    
\ No newline at end of file
+    
+
+
+def test_graph_copy_to_sparse_isolated_vertices():
+
+    g = create_graph(directed=True, any_hashable=True)
+
+    g.add_vertices_from(["a", "b", "c", "isolated"])
+    g.add_edges_from([("a", "b", 2.0, "ab"), ("c", "a", 3.0, "ca")])
+    g.vertex_attrs["isolated"]["color"] = "red"
+    g.edge_attrs["ca"]["color"] = "blue"
+
+    gs = copy_to_sparse_graph(g)
+
+    assert gs.vertices == {"a", "b", "c", "isolated"}
+    assert gs.edges == {"ab", "ca"}
+    assert gs.edge_tuple("ab") == ("a", "b", 2.0)
+    assert gs.edge_tuple("ca") == ("c", "a", 3.0)
+    assert gs.vertex_attrs["isolated"]["color"] == "red"
+    assert gs.edge_attrs["ca"]["color"] == "blue"
+
+
+def test_as_weighted_with_weights_mapping():
+    from jgrapht.views import as_weighted
+    import jgrapht.algorithms.shortestpaths as sp
+
+    g = create_graph(
+        directed=True,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=False,
+        any_hashable=True,
+    )
+
+    g.add_vertices_from(["a", "b", "c"])
+    g.add_edge("a", "b", edge="ab")
+    g.add_edge("b", "c", edge="bc")
+    g.add_edge("a", "c", edge="ac")
+
+    wg = as_weighted(g, weights={"ab": 1.0, "bc": 2.0, "ac": 5.0})
+
+    assert wg.get_edge_weight("ac") == 5.0
+    path = sp.dijkstra(wg, "a", "c", use_bidirectional=False)
+    assert path.weight == 3.0
+    assert path.edges == ["ab", "bc"]
+
+    with pytest.raises(TypeError):
+        as_weighted(g, weights=[1.0, 2.0, 5.0])
+
+    with pytest.raises(ValueError):
+        as_weighted(g, weights={"missing": 1.0})
@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import jgrapht
+from jgrapht._internals._config import _parse_size
+
+
+def test_parse_size():
+    assert _parse_size(None, "max_heap") == 0
+    assert _parse_size(1024, "max_heap") == 1024
+    assert _parse_size("1024", "max_heap") == 1024
+    assert _parse_size("512k", "max_heap") == 512 * 1024
+    assert _parse_size("512m", "max_heap") == 512 * 1024 ** 2
+    assert _parse_size("4G", "max_heap") == 4 * 1024 ** 3
+    assert _parse_size("4gb", "max_heap") == 4 * 1024 ** 3
+
+    with pytest.raises(ValueError):
+        _parse_size("lots", "max_heap")
+    with pytest.raises(ValueError):
+        _parse_size(-1, "max_heap")
+    with pytest.raises(TypeError):
+        _parse_size(1.5, "max_heap")
+
+
+def test_configure_after_first_use():
+    g = jgrapht.create_graph()
+    g.add_vertex(0)
+
+    with pytest.raises(RuntimeError):
+        jgrapht.configure(max_heap="1g")
+
+
+def _run_python(code, **environ):
+    env = dict(os.environ)
+    env.update(environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(jgrapht.__file__)))
+    env["PYTHONPATH"] = os.pathsep.join([root, env.get("PYTHONPATH", "")])
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+def test_invalid_environment_is_ignored():
+    res = _run_python(
+        "import jgrapht",
+        JGRAPHT_MAX_HEAP="lots",
+    )
+    assert res.returncode == 0
+    assert "JGRAPHT_MAX_HEAP" in res.stderr
+
+
+def test_max_heap_takes_effect():
+    from jgrapht import backend
+
+    if not backend.jgrapht_isolate_supports_heap_options():
+        pytest.skip("backend built without heap options")
+
+    code = "import jgrapht; g = jgrapht.create_graph(); g.add_vertices_from(range(4000000))"
+    assert _run_python(code, JGRAPHT_MAX_HEAP="2g").returncode == 0
+    assert _run_python(code, JGRAPHT_MAX_HEAP="32m").returncode != 0
@@ -1,5 +1,7 @@
 import pytest
 
+from array import array
+
 from jgrapht import (
     create_graph,
     create_sparse_graph,
@@ -388,6 +390,64 @@ def test_graph_sparse():
         g.add_edge(0, 5)
 
 
+def test_graph_bulk_add():
+
+    g = create_graph(
+        directed=True,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=True,
+    )
+
+    assert g.add_vertices_from(range(0, 5)) == [0, 1, 2, 3, 4]
+    assert list(g.add_new_vertices(2)) == [5, 6]
+    assert g.vertices == set(range(0, 7))
+
+    # None asks for a new vertex
+    added = g.add_vertices_from([7, None, 8])
+    assert added[0] == 7 and added[2] == 8
+    assert added[1] in g.vertices
+    assert len(g.vertices) == 10
+
+    assert g.add_edges_from([(0, 1), (1, 2, 5.0), (2, 3, None, 10)]) == [0, 1, 10]
+    assert g.edge_tuple(1) == (1, 2, 5.0)
+
+    edges = g.add_edges_from_arrays(array("i", [3, 4]), [4, 5], array("d", [2.5, 3.5]))
+    assert isinstance(edges, array)
+    assert [g.edge_tuple(e) for e in edges] == [(3, 4, 2.5), (4, 5, 3.5)]
+
+    edges = g.add_edges_from_arrays([5], [6])
+    assert g.get_edge_weight(edges[0]) == 1.0
+
+    # NaN keeps the default weight
+    edges = g.add_edges_from_arrays([6, 0], [0, 2], [float("nan"), 4.5])
+    assert [g.edge_tuple(e) for e in edges] == [(6, 0, 1.0), (0, 2, 4.5)]
+
+    with pytest.raises(ValueError):
+        g.add_edges_from_arrays([0, 1], [2])
+
+
+def test_graph_degrees():
+
+    g = create_graph(
+        directed=True,
+        allowing_self_loops=True,
+        allowing_multiple_edges=True,
+        weighted=False,
+    )
+    assert len(g.degrees()) == 0
+
+    g.add_vertices_from([0, 1, 2, 4])
+    g.add_edges_from([(0, 1), (0, 2), (1, 2), (2, 2), (4, 0)])
+
+    assert list(g.degrees(kind="out")) == [2, 1, 1, 0, 1]
+    assert list(g.degrees(kind="in")) == [1, 1, 3, 0, 0]
+    assert list(g.degrees()) == [g.degree_of(v) if v in g.vertices else 0 for v in range(5)]
+
+    with pytest.raises(ValueError):
+        g.degrees(kind="both")
+
+
 def test_graph_sparse_no_vertex_count():
 
     edgelist = [(0, 1), (0, 2), (0, 3), (1, 3), (2, 3), (2, 4), (2, 5), (0, 4), (2, 6)]
@@ -439,6 +499,73 @@ def test_graph_sparse_weighted():
         g.add_edge(0, 5)
 
 
+def test_graph_sparse_from_arrays():
+
+    sources = array("i", [0, 0, 0, 1, 2, 2, 2, 0, 2])
+    targets = array("i", [1, 2, 3, 3, 3, 4, 5, 4, 6])
+    weights = array("d", [5, 2, 3, 1, 7.7, 3.3, 13.0, 9.999, 3.0])
+    g = create_sparse_graph(sources=sources, targets=targets, weights=weights)
+
+    assert g.type.directed
+    assert g.type.weighted
+
+    assert g.vertices == set([0, 1, 2, 3, 4, 5, 6])
+
+    edgelist = [g.edge_tuple(e) for e in g.edges]
+    assert edgelist == list(zip(sources, targets, weights))
+
+    # missing weights default to 1.0, other integer types are converted
+    g = create_sparse_graph(sources=[0, 1], targets=range(1, 3), num_of_vertices=5)
+    assert g.vertices == set([0, 1, 2, 3, 4])
+    assert [g.edge_tuple(e) for e in g.edges] == [(0, 1, 1.0), (1, 2, 1.0)]
+
+    g = create_sparse_graph(
+        sources=array("q", [0, 1]), targets=array("q", [1, 2]), weighted=False
+    )
+    assert not g.type.weighted
+    assert g.edges == set([0, 1])
+
+    with pytest.raises(ValueError):
+        create_sparse_graph(sources=array("i", [0, 1]), targets=array("i", [1]))
+
+    with pytest.raises(ValueError):
+        create_sparse_graph(
+            sources=array("i", [0]), targets=array("i", [1]), weights=array("d", [])
+        )
+
+    with pytest.raises(ValueError):
+        create_sparse_graph(sources=[0, -1], targets=[1, 2])
+
+    with pytest.raises(ValueError):
+        create_sparse_graph(sources=[0, 1], targets=[1, 2], num_of_vertices=2)
+
+    with pytest.raises(ValueError):
+        create_sparse_graph([(0, 1)], sources=[0], targets=[1])
+
+    with pytest.raises(ValueError):
+        create_sparse_graph(sources=[0], targets=[1], any_hashable=True)
+
+
+def test_graph_sparse_as_csr():
+
+    edgelist = [(0, 1, 1.5), (0, 2, 2.5), (2, 1, 3.5), (3, 3, 4.5)]
+    g = create_sparse_graph(edgelist, 5)
+
+    offsets, indices, edges, weights = g.as_csr()
+    assert list(offsets) == [0, 2, 2, 3, 4, 4]
+    assert list(indices) == [1, 2, 1, 3]
+    for pos, e in enumerate(edges):
+        u, v, w = g.edge_tuple(e)
+        assert indices[pos] == v
+        assert weights[pos] == w
+
+    g = create_sparse_graph([(0, 1), (1, 2)], directed=False, weighted=False)
+    csr = g.as_csr()
+    assert list(csr.offsets) == [0, 1, 3, 4]
+    assert sorted(csr.indices[1:3]) == [0, 2]
+    assert list(csr.weights) == [1.0, 1.0, 1.0, 1.0]
+
+
 def test_graph_copy_to_sparse():
 
     g = create_graph(
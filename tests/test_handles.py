@@ -0,0 +1,194 @@
+import pytest
+
+import jgrapht
+from jgrapht import create_graph
+import jgrapht.backend as backend
+import jgrapht.algorithms.shortestpaths as sp
+
+
+def build_graph():
+    g = create_graph(
+        directed=True,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=True,
+    )
+    g.add_vertices_from(range(0, 10))
+    for i in range(0, 9):
+        g.add_edge(i, i + 1)
+    return g
+
+
+def test_handle_scope():
+    g = build_graph()
+
+    destroyed = []
+    original = backend.jgrapht_handles_destroy_all
+
+    def destroy_all(handles):
+        destroyed.append(len(handles))
+        original(handles)
+
+    backend.jgrapht_handles_destroy_all = destroy_all
+    try:
+        with jgrapht.handle_scope():
+            paths = [sp.dijkstra(g, 0, v) for v in range(1, 10)]
+            assert paths[-1].weight == 9.0
+
+            # garbage collected inside the scope, released on exit
+            for v in range(1, 10):
+                sp.dijkstra(g, v, 9)
+    finally:
+        backend.jgrapht_handles_destroy_all = original
+
+    assert len(destroyed) == 1
+    assert destroyed[0] >= 18
+
+    # wrappers are closed after the scope
+    for p in paths:
+        assert p.handle is None
+
+    # the graph created outside the scope is still usable
+    assert sp.dijkstra(g, 0, 9).weight == 9.0
+
+
+def test_nested_handle_scope():
+    g = build_graph()
+
+    with jgrapht.handle_scope():
+        outer = sp.dijkstra(g, 0, 5)
+        with jgrapht.handle_scope():
+            inner = sp.dijkstra(g, 0, 9)
+        assert inner.handle is None
+        assert outer.handle is not None
+        assert outer.weight == 5.0
+    assert outer.handle is None
+
+
+def test_close():
+    g = build_graph()
+
+    path = sp.dijkstra(g, 0, 9)
+    assert path.weight == 9.0
+    path.close()
+    assert path.handle is None
+
+    # closing twice is a no-op
+    path.close()
+
+    with jgrapht.handle_scope():
+        path = sp.dijkstra(g, 0, 9)
+        path.close()
+    assert path.handle is None
+
+
+def test_live_handles():
+    from jgrapht import diagnostics
+
+    g = build_graph()
+
+    before = diagnostics.live_handles().get("_JGraphTGraphPath", 0)
+    paths = [sp.dijkstra(g, 0, v) for v in range(1, 10)]
+    assert diagnostics.live_handles()["_JGraphTGraphPath"] == before + 9
+
+    paths[0].close()
+    assert diagnostics.live_handles()["_JGraphTGraphPath"] == before + 8
+
+    del paths
+    assert diagnostics.live_handles().get("_JGraphTGraphPath", 0) == before
+
+
+def test_native_objects():
+    from jgrapht import diagnostics
+    from jgrapht.views import as_masked_subgraph
+
+    g = build_graph()
+    coordinates = {v: (float(v), 0.0) for v in g.vertices}
+
+    def count(name):
+        return diagnostics.live_handles().get(name, 0)
+
+    before = count("_JGraphTCoordinateHeuristic")
+
+    # temporary heuristics are released right away
+    assert sp.a_star(g, 0, 9, coordinates=coordinates).weight == 9.0
+    assert count("_JGraphTCoordinateHeuristic") == before
+
+    snapshots = count("_JGraphTShortestPathGraph")
+
+    with jgrapht.handle_scope():
+        h = sp.coordinate_heuristic(g, coordinates)
+        index = sp.alt_index(g, landmarks=[0, 9])
+        ch = sp.contraction_hierarchy(g)
+        masked = as_masked_subgraph(g, vertex_mask={5})
+
+        assert count("_JGraphTCoordinateHeuristic") == before + 1
+        assert count("_JGraphTALTIndex") >= 1
+        assert count("_JGraphTMask") >= 1
+        assert count("_JGraphTContractionHierarchy") >= 1
+        # the snapshots used to compute the index and hierarchy are already released
+        assert count("_JGraphTShortestPathGraph") == snapshots
+        assert sp.a_star(g, 0, 9, heuristic_cb=h).weight == 9.0
+        assert masked.vertices == set(g.vertices) - {5}
+        assert ch.get_distance(0, 9) == 9.0
+
+    assert count("_JGraphTCoordinateHeuristic") == before
+    assert h.closed and index.closed
+    assert ch.handle is None
+    with pytest.raises(ValueError):
+        sp.a_star(g, 0, 9, heuristic_cb=index)
+
+    # closing a masked subgraph also releases its mask
+    masks = count("_JGraphTMask")
+    masked = as_masked_subgraph(g, vertex_mask={5})
+    assert count("_JGraphTMask") == masks + 1
+    masked.close()
+    assert count("_JGraphTMask") == masks
+
+
+def test_finalizer_does_not_block():
+    from jgrapht import diagnostics
+    from jgrapht._internals import _wrappers
+
+    g = build_graph()
+
+    before = diagnostics.live_handles().get("_JGraphTGraphPath", 0)
+    path = sp.dijkstra(g, 0, 9)
+
+    # a finalizer may run while the accounting lock is held by the same thread
+    with _wrappers._live_handles_lock:
+        del path
+
+    assert diagnostics.live_handles().get("_JGraphTGraphPath", 0) == before
+
+
+def test_allocation_sites():
+    from jgrapht import diagnostics
+
+    g = build_graph()
+
+    diagnostics.trace_allocations(depth=5)
+    try:
+        paths = [sp.dijkstra(g, 0, v) for v in range(1, 10)]
+
+        sites = diagnostics.allocation_sites()
+        count, name, stack = sites[0]
+        assert count == 9
+        assert name == "_JGraphTGraphPath"
+        assert stack[-1].filename == __file__
+        assert len(stack) <= 5
+    finally:
+        diagnostics.trace_allocations(depth=0)
+
+    assert diagnostics.allocation_sites() == []
+
+
+def test_memory_info():
+    from jgrapht import diagnostics
+
+    build_graph()
+
+    info = diagnostics.memory_info()
+    assert info.backend_started
+    assert info.resident is None or info.resident > 0
+    assert info.max_heap >= 0
@@ -0,0 +1,57 @@
+import pytest
+import subprocess
+import sys
+
+# Lazy submodules (module __getattr__) require Python 3.7
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (3, 7), reason="requires Python 3.7 or higher"
+)
+
+
+def _run(code):
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+
+def _modules_after(code):
+    result = _run(
+        code + "; import sys; "
+        "print(sorted(m for m in sys.modules if m.startswith('jgrapht')))"
+    )
+    return eval(result.stdout)
+
+
+def test_import_is_lazy():
+    modules = _modules_after("import jgrapht")
+
+    assert "jgrapht" in modules
+    assert "jgrapht.backend" not in modules
+    assert "jgrapht._backend" not in modules
+    assert "jgrapht.algorithms" not in modules
+    assert "jgrapht.io" not in modules
+    assert "jgrapht._internals._graphs" not in modules
+
+
+def test_packages_on_access():
+    modules = _modules_after("import jgrapht; jgrapht.algorithms; jgrapht.io")
+
+    assert "jgrapht.algorithms" in modules
+    assert "jgrapht.io" in modules
+    # their own submodules are still loaded lazily
+    assert "jgrapht.algorithms.shortestpaths" not in modules
+    assert "jgrapht.io.importers" not in modules
+    assert "jgrapht.backend" not in modules
+
+
+def test_submodules_on_access():
+    result = _run(
+        "import sys, jgrapht; "
+        "jgrapht.utils.IntegerSupplier(); "
+        "print('jgrapht.utils' in sys.modules, 'jgrapht.backend' in sys.modules)"
+    )
+    assert result.stdout.split() == ["True", "False"]
@@ -0,0 +1,69 @@
+import pytest
+
+from array import array
+
+from jgrapht import create_graph
+import jgrapht.traversal as traversal
+
+
+def build_graph(n=1000, any_hashable=False):
+    g = create_graph(
+        directed=True,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=True,
+        any_hashable=any_hashable,
+    )
+
+    for i in range(0, n):
+        g.add_vertex(i)
+
+    for i in range(0, n - 1):
+        g.add_edge(i, i + 1)
+
+    return g
+
+
+def test_iterator_to_array():
+    g = build_graph()
+
+    vertices = iter(g.vertices).to_array()
+    assert isinstance(vertices, array)
+    assert vertices.typecode == "i"
+    assert sorted(vertices) == list(range(0, 1000))
+
+    assert sorted(iter(g.edges).tolist()) == sorted(g.edges)
+
+
+def test_iterator_mixed_next_and_to_array():
+    g = build_graph()
+
+    expected = list(traversal.bfs_traversal(g, start_vertex=0))
+
+    it = traversal.bfs_traversal(g, start_vertex=0)
+    first = [next(it) for _ in range(0, 100)]
+    rest = it.tolist()
+
+    assert first + rest == expected
+    assert it.tolist() == []
+    with pytest.raises(StopIteration):
+        next(it)
+
+
+def test_iterator_empty():
+    g = build_graph(n=0)
+
+    assert iter(g.vertices).tolist() == []
+    assert len(iter(g.vertices).to_array()) == 0
+    assert list(g.vertices) == []
+
+
+def test_anyhashable_iterator_tolist():
+    g = build_graph(n=200, any_hashable=True)
+
+    it = iter(g.vertices)
+    assert next(it) is not None
+    assert len(it.tolist()) == 199
+
+    with pytest.raises(TypeError):
+        iter(g.vertices).to_array()
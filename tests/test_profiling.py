@@ -0,0 +1,74 @@
+import pytest
+
+import jgrapht
+from jgrapht import create_graph
+import jgrapht.backend as backend
+import jgrapht.algorithms.shortestpaths as sp
+
+
+def build_graph():
+    g = create_graph(
+        directed=True,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=True,
+    )
+    g.add_vertices_from(range(0, 10))
+    for i in range(0, 9):
+        g.add_edge(i, i + 1)
+    return g
+
+
+def test_profile():
+    g = build_graph()
+
+    original = backend.jgrapht_graph_add_vertex
+
+    with jgrapht.profile() as p:
+        for _ in range(0, 5):
+            g.add_vertex()
+        sp.dijkstra(g, 0, 9, use_bidirectional=False)
+
+    # the backend is restored after profiling
+    assert backend.jgrapht_graph_add_vertex is original
+
+    stats = {name: (calls, elapsed) for name, calls, elapsed in p.stats()}
+    assert stats["jgrapht_graph_add_vertex"][0] == 5
+    assert "jgrapht_sp_exec_dijkstra_get_path_between_vertices" in stats
+    assert p.calls >= 6
+    assert p.total_time >= 0.0
+
+    # sorted by cumulative time
+    times = [elapsed for _, _, elapsed in p.stats()]
+    assert times == sorted(times, reverse=True)
+
+    report = p.report(limit=2)
+    assert report.splitlines()[0].startswith("function")
+    assert len(report.splitlines()) == 3
+
+    # nothing is recorded after the context exits
+    g.add_vertex()
+    stats = {name: (calls, elapsed) for name, calls, elapsed in p.stats()}
+    assert stats["jgrapht_graph_add_vertex"][0] == 5
+
+
+def test_profile_hook():
+    g = build_graph()
+
+    timings = []
+
+    def hook(name, elapsed):
+        timings.append((name, elapsed))
+
+    jgrapht.add_profile_hook(hook)
+    try:
+        g.add_vertex()
+    finally:
+        jgrapht.remove_profile_hook(hook)
+
+    g.add_vertex()
+
+    assert [name for name, _ in timings] == ["jgrapht_graph_add_vertex"]
+
+    with pytest.raises(ValueError):
+        jgrapht.remove_profile_hook(hook)
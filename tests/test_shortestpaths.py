@@ -2,7 +2,9 @@ import pytest
 
 from jgrapht import create_graph
 import jgrapht.algorithms.shortestpaths as sp
+from jgrapht.views import as_listenable
 import math
+from array import array
 
 
 def get_graph():
@@ -191,6 +193,77 @@ def test_bfs():
     assert list(single_path.edges) == [7]
 
 
+@pytest.mark.parametrize("algorithm", ["dijkstra", "bfs", "bellman_ford"])
+def test_singlesource_distances(algorithm):
+    g = build_random_graph(True)
+    g.remove_vertex(50)
+
+    tree = getattr(sp, algorithm)(g, 0)
+    dist = tree.distances()
+    pred = tree.predecessors()
+    assert len(dist) == 200
+    assert len(pred) == 200
+    assert math.isnan(dist[50])
+    assert pred[50] == -1
+    assert pred[0] == -1
+
+    for v in g.vertices:
+        path = tree.get_path(v)
+        if path is None:
+            assert dist[v] == float("inf")
+            assert tree.distance_to(v) == float("inf")
+            assert pred[v] == -1
+            continue
+        assert dist[v] == path.weight
+        assert tree.distance_to(v) == path.weight
+        if v != 0:
+            assert pred[v] == path.vertices[-2]
+
+
+def test_anyhashableg_singlesource_distances():
+    g = build_grid_graph(any_hashable=True)
+    g.add_vertex("x")
+
+    tree = sp.dijkstra(g, 4)
+    assert tree.distance_to(8) == 2.0
+    assert tree.distance_to("x") == float("inf")
+
+    dist = tree.distances()
+    assert dist[4] == 0.0
+    assert dist[0] == 2.0
+    assert dist["x"] == float("inf")
+
+    pred = tree.predecessors()
+    assert set(pred) == {0, 1, 2, 3, 5, 6, 7, 8}
+    assert pred[1] == 4
+    assert pred[6] == 3
+
+
+def test_singlesource_paths_defaults():
+    from jgrapht.types import SingleSourcePaths
+
+    class Paths(SingleSourcePaths):
+        def __init__(self, tree):
+            self._tree = tree
+
+        @property
+        def source_vertex(self):
+            return self._tree.source_vertex
+
+        def get_path(self, target_vertex):
+            return self._tree.get_path(target_vertex)
+
+    g = build_grid_graph(any_hashable=True)
+    g.add_vertex("x")
+    tree = sp.dijkstra(g, 4)
+    paths = Paths(tree)
+
+    assert paths.distance_to(8) == 2.0
+    assert paths.distance_to("x") == float("inf")
+    assert paths.distances() == tree.distances()
+    assert paths.predecessors() == tree.predecessors()
+
+
 def test_anyhashableg_bfs():
     g = get_anyhashableg_graph()
 
@@ -457,6 +530,137 @@ def test_anyhashableg_a_star():
     assert path1.end_vertex == "8"
 
 
+def build_grid_graph(any_hashable=False):
+    g = create_graph(
+        directed=False,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=True,
+        any_hashable=any_hashable,
+    )
+
+    g.add_vertices_from([0, 1, 2, 3, 4, 5, 6, 7, 8])
+
+    g.add_edge(0, 1)
+    g.add_edge(0, 3)
+    g.add_edge(1, 2)
+    g.add_edge(1, 4)
+    g.add_edge(2, 5)
+    g.add_edge(3, 4)
+    g.add_edge(3, 6)
+    g.add_edge(4, 5)
+    g.add_edge(4, 7)
+    g.add_edge(5, 8)
+
+    return g
+
+
+grid_coordinates = {
+    0: (2, 0),
+    1: (2, 1),
+    2: (2, 2),
+    3: (1, 0),
+    4: (1, 1),
+    5: (1, 2),
+    6: (0, 0),
+    7: (0, 1),
+    8: (0, 2),
+}
+
+
+def test_a_star_with_coordinates():
+    g = build_grid_graph()
+
+    expected = sp.dijkstra(g, 0, 8)
+
+    for metric in ["euclidean", "manhattan"]:
+        path = sp.a_star(g, 0, 8, coordinates=grid_coordinates, metric=metric)
+        assert path.weight == expected.weight
+        assert path.start_vertex == 0
+        assert path.end_vertex == 8
+
+        path1 = sp.a_star(
+            g, 0, 8, coordinates=grid_coordinates, metric=metric, use_bidirectional=True
+        )
+        assert path1.weight == expected.weight
+
+    # a pair of arrays indexed by the vertices
+    xs = [grid_coordinates[v][0] for v in range(0, 9)]
+    ys = [grid_coordinates[v][1] for v in range(0, 9)]
+    path = sp.a_star(g, 0, 8, coordinates=(xs, ys))
+    assert path.weight == expected.weight
+
+    # missing coordinates estimate zero
+    path = sp.a_star(g, 0, 8, coordinates={0: (2, 0), 8: (0, 2)})
+    assert path.weight == expected.weight
+
+    with pytest.raises(ValueError):
+        sp.a_star(g, 0, 8, coordinates=grid_coordinates, metric="chebyshev")
+
+    with pytest.raises(ValueError):
+        sp.a_star(g, 0, 8)
+
+    with pytest.raises(ValueError):
+        sp.a_star(g, 0, 8, heuristic_cb=lambda s, t: 0.0, coordinates=grid_coordinates)
+
+    with pytest.raises(ValueError):
+        sp.a_star(g, 0, 8, coordinates=([0.0, 1.0], [0.0]))
+
+
+def test_coordinate_heuristic():
+    g = create_graph(
+        directed=True,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=True,
+    )
+
+    # london, paris and berlin as (longitude, latitude)
+    coordinates = {0: (-0.1278, 51.5074), 1: (2.3522, 48.8566), 2: (13.4050, 52.5200)}
+    g.add_vertices_from([0, 1, 2])
+    g.add_edge(0, 1, weight=350.0)
+    g.add_edge(1, 2, weight=900.0)
+    g.add_edge(0, 2, weight=1500.0)
+
+    h = sp.coordinate_heuristic(g, coordinates, metric="haversine", scale=0.001)
+    assert h.metric == "haversine"
+
+    path = sp.a_star(g, 0, 2, heuristic_cb=h)
+    assert path.vertices == [0, 1, 2]
+    assert path.weight == 1250.0
+
+    # heuristics can be reused
+    path = sp.a_star(g, 0, 1, heuristic_cb=h, use_bidirectional=True)
+    assert path.vertices == [0, 1]
+
+    with pytest.raises(ValueError):
+        sp.coordinate_heuristic(g, coordinates, scale=-1.0)
+
+
+def test_anyhashableg_a_star_with_coordinates():
+    g = build_grid_graph(any_hashable=True)
+
+    path = sp.a_star(g, 0, 8, coordinates=grid_coordinates)
+    assert path.weight == 4.0
+    assert path.start_vertex == 0
+    assert path.end_vertex == 8
+
+    h = sp.coordinate_heuristic(g, grid_coordinates, metric="manhattan")
+    path = sp.a_star(g, 0, 8, heuristic_cb=h, use_bidirectional=True)
+    assert path.weight == 4.0
+
+    with pytest.raises(TypeError):
+        sp.coordinate_heuristic(g, ([0.0], [0.0]))
+
+    with pytest.raises(ValueError):
+        sp.coordinate_heuristic(g, {0: (0.0, 0.0), "unknown": (1.0, 1.0)})
+
+    # closed heuristics cannot be used
+    h.close()
+    with pytest.raises(ValueError):
+        sp.a_star(g, 0, 8, heuristic_cb=h)
+
+
 
 def test_a_star_with_alt_heuristic():
 
@@ -533,6 +737,597 @@ def test_anyhashableg_a_star_with_alt_heuristic():
     assert path1.end_vertex == 8
 
 
+def build_random_graph(directed):
+    from jgrapht.generators import gnp_random_graph
+
+    g = create_graph(
+        directed=directed,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=True,
+    )
+    gnp_random_graph(g, 200, 0.03, seed=17)
+    for i, e in enumerate(g.edges):
+        g.set_edge_weight(e, 1.0 + (i * 7) % 13)
+    return g
+
+
+@pytest.mark.parametrize("directed", [True, False])
+@pytest.mark.parametrize("selection", ["farthest", "random"])
+def test_alt_index(directed, selection):
+    g = build_random_graph(directed)
+
+    index = sp.alt_index(g, num_landmarks=8, selection=selection, seed=7)
+
+    assert len(index.landmarks) == 8
+    assert len(set(index.landmarks)) == 8
+    rows = 16 if directed else 8
+    assert index.memory_usage == rows * 200 * 8 + 8 * 4
+
+    for source in range(0, 200, 37):
+        tree = sp.dijkstra(g, source)
+        for target in range(0, 200, 11):
+            expected = tree.get_path(target)
+            for use_bidirectional in [True, False]:
+                path = index.get_path(source, target, use_bidirectional=use_bidirectional)
+                if expected is None:
+                    assert path is None
+                else:
+                    assert path.weight == expected.weight
+                    assert path.start_vertex == source
+                    assert path.end_vertex == target
+
+
+def test_alt_index_with_landmarks(tmpdir):
+    g = build_random_graph(True)
+
+    index = sp.alt_index(g, landmarks=[3, 17, 42])
+    assert index.landmarks == [3, 17, 42]
+
+    expected = sp.dijkstra(g, 0, 100)
+
+    path = sp.a_star(g, 0, 100, heuristic_cb=index, use_bidirectional=True)
+    assert path.weight == expected.weight
+
+    path = sp.a_star_with_alt_heuristic(g, 0, 100, landmarks=index)
+    assert path.weight == expected.weight
+
+    tmpfile = tmpdir.join("alt.index")
+    filename = str(tmpfile)
+    index.save(filename)
+
+    loaded = sp.load_alt_index(g, filename)
+    assert loaded.landmarks == [3, 17, 42]
+    assert loaded.memory_usage == index.memory_usage
+    assert loaded.get_path(0, 100).weight == expected.weight
+
+    other = create_graph(directed=True)
+    other.add_vertices_from([0, 1, 2])
+    with pytest.raises(ValueError):
+        sp.load_alt_index(other, filename)
+
+    # same vertices, but undirected
+    with pytest.raises(ValueError):
+        sp.load_alt_index(build_random_graph(False), filename)
+
+    # an index can only be used with its own graph
+    with pytest.raises(ValueError):
+        sp.a_star(build_random_graph(True), 0, 100, heuristic_cb=index)
+
+    # invalid headers are rejected before reading the tables
+    with open(filename, "r+b") as f:
+        f.seek(8)
+        f.write(array("i", [0]).tobytes())
+    with pytest.raises(ValueError):
+        sp.load_alt_index(g, filename)
+
+    with pytest.raises(ValueError):
+        sp.alt_index(g, selection="closest")
+
+    with pytest.raises(ValueError):
+        sp.alt_index(g, landmarks=[])
+
+
+def test_anyhashableg_alt_index():
+    g = create_graph(
+        directed=False,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=True,
+        any_hashable=True,
+    )
+
+    g.add_vertices_from([0, 1, 2, "3", 4, 5, 6, 7, 8])
+
+    g.add_edge(0, 1, edge=0)
+    g.add_edge(0, "3", edge=1)
+    g.add_edge(1, 2, edge=2)
+    g.add_edge(1, 4, edge=3)
+    g.add_edge(2, 5, edge=4)
+    g.add_edge("3", 4, edge=5)
+    g.add_edge("3", 6, edge=6)
+    g.add_edge(4, 5, edge=7)
+    g.add_edge(4, 7, edge=8)
+    g.add_edge(5, 8, edge=9)
+
+    index = sp.alt_index(g, landmarks=["3", 6])
+    assert index.landmarks == ["3", 6]
+
+    path = index.get_path(0, 8)
+    assert path.weight == 4.0
+    assert path.start_vertex == 0
+    assert path.end_vertex == 8
+
+    index = sp.alt_index(g, num_landmarks=20)
+    assert len(index.landmarks) == 9
+
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_contraction_hierarchy(directed, tmpdir):
+    g = build_random_graph(directed)
+
+    ch = sp.contraction_hierarchy(g)
+    assert ch.memory_usage > 0
+
+    tmpfile = tmpdir.join("ch.bin")
+    filename = str(tmpfile)
+    ch.save(filename)
+    loaded = sp.load_contraction_hierarchy(g, filename)
+
+    for source in range(0, 200, 37):
+        tree = sp.dijkstra(g, source)
+        for target in range(0, 200, 11):
+            expected = tree.get_path(target)
+            for hierarchy in [ch, loaded]:
+                path = hierarchy.get_path(source, target)
+                if expected is None:
+                    assert path is None
+                    assert hierarchy.get_distance(source, target) == float("inf")
+                    continue
+                assert path.weight == expected.weight
+                assert hierarchy.get_distance(source, target) == expected.weight
+                assert path.start_vertex == source
+                assert path.end_vertex == target
+                assert sum(g.get_edge_weight(e) for e in path) == expected.weight
+                vertices = path.vertices
+                assert vertices[0] == source
+                assert vertices[-1] == target
+
+    path = ch.get_path(5, 5)
+    assert path.edges == []
+    assert path.weight == 0.0
+
+    other = create_graph(directed=True)
+    other.add_vertices_from([0, 1, 2])
+    with pytest.raises(ValueError):
+        sp.load_contraction_hierarchy(other, filename)
+
+    # same vertices, but different edges or directedness
+    other = build_random_graph(not directed)
+    with pytest.raises(ValueError):
+        sp.load_contraction_hierarchy(other, filename)
+    other = build_random_graph(directed)
+    other.remove_edge(next(iter(other.edges)))
+    with pytest.raises(ValueError):
+        sp.load_contraction_hierarchy(other, filename)
+
+
+def test_contraction_hierarchy_long_path():
+    g = create_graph(
+        directed=False,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=True,
+    )
+    g.add_vertices_from(range(200))
+    for v in range(199):
+        g.add_edge(v, v + 1)
+
+    ch = sp.contraction_hierarchy(g)
+
+    path = ch.get_path(0, 199)
+    assert path.weight == 199.0
+    assert path.edges == list(range(199))
+
+    path = ch.get_path(150, 20)
+    assert path.weight == 130.0
+    assert path.vertices == list(range(150, 19, -1))
+
+    g.add_vertex(200)
+    ch = sp.contraction_hierarchy(g)
+    assert ch.get_path(0, 200) is None
+
+    with pytest.raises(ValueError):
+        ch.get_path(0, 201)
+
+
+def test_anyhashableg_contraction_hierarchy():
+    g = build_grid_graph(any_hashable=True)
+    g.add_vertex("x")
+    g.add_edge(8, "x", edge="e")
+    g.set_edge_weight("e", 2.5)
+
+    ch = sp.contraction_hierarchy(g)
+
+    path = ch.get_path(0, "x")
+    assert path.weight == 6.5
+    assert path.start_vertex == 0
+    assert path.end_vertex == "x"
+    assert path.edges[-1] == "e"
+    assert path.vertices[-2:] == [8, "x"]
+    assert ch.get_distance("x", 6) == 6.5
+
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_distance_matrix(directed):
+    g = build_random_graph(directed)
+
+    sources = list(range(0, 200, 13))
+    targets = list(range(3, 200, 7))
+    dist = sp.distance_matrix(g, sources, targets, parallelism=3)
+    assert dist.shape == (len(sources), len(targets))
+
+    for i, source in enumerate(sources):
+        tree = sp.dijkstra(g, source)
+        for j, target in enumerate(targets):
+            path = tree.get_path(target)
+            expected = path.weight if path is not None else float("inf")
+            assert dist[i, j] == expected
+
+    dist, pred = sp.distance_matrix(g, sources, targets, predecessors=True)
+    assert pred.shape == (len(sources), 200)
+    for i, source in enumerate(sources):
+        assert pred[i, source] == -1
+        for j, target in enumerate(targets):
+            if target == source or dist[i, j] == float("inf"):
+                continue
+            weight, v = 0.0, target
+            while v != source:
+                u = pred[i, v]
+                weight += min(
+                    g.get_edge_weight(e)
+                    for e in g.outedges_of(u)
+                    if g.opposite(e, u) == v
+                )
+                v = u
+            assert weight == dist[i, j]
+
+    hops = sp.distance_matrix(g, sources, targets, algorithm="bfs")
+    for i, source in enumerate(sources):
+        tree = sp.bfs(g, source)
+        for j, target in enumerate(targets):
+            path = tree.get_path(target)
+            expected = len(path.edges) if path is not None else float("inf")
+            assert hops[i, j] == expected
+
+    with pytest.raises(ValueError):
+        sp.distance_matrix(g, sources, targets, algorithm="astar")
+
+    with pytest.raises(ValueError):
+        sp.distance_matrix(g, [], targets)
+
+    with pytest.raises(ValueError):
+        sp.distance_matrix(g, [0, 300], targets)
+
+
+@pytest.mark.parametrize("algorithm", ["dijkstra", "delta", "bfs"])
+def test_multi_source(algorithm):
+    g = build_random_graph(True)
+    g.remove_vertex(50)
+
+    sources = [v for v in range(0, 200, 9) if v != 50]
+    targets = list(range(1, 200, 5))
+    expected = {}
+    for source in sources:
+        tree = sp.bfs(g, source) if algorithm == "bfs" else sp.dijkstra(g, source)
+        expected[source] = tree
+
+    def distance(source, v):
+        path = expected[source].get_path(v)
+        if path is None:
+            return float("inf")
+        return len(path.edges) if algorithm == "bfs" else path.weight
+
+    count = 0
+    for source, dist in sp.multi_source(
+        g, sources, algorithm=algorithm, parallelism=2, batch_size=3
+    ):
+        assert source == sources[count]
+        count += 1
+        assert len(dist) == 200
+        assert math.isnan(dist[50])
+        for v in range(0, 200, 17):
+            if v != 50:
+                assert dist[v] == distance(source, v)
+    assert count == len(sources)
+
+    radius = 3.0 if algorithm == "bfs" else 20.0
+    sums = sp.multi_source(g, sources, algorithm=algorithm, reduce="sum")
+    mins = sp.multi_source(
+        g, sources, algorithm=algorithm, reduce="min", targets=targets
+    )
+    counts = sp.multi_source(
+        g, sources, algorithm=algorithm, reduce="count", radius=radius
+    )
+    for i, source in enumerate(sources):
+        dists = [distance(source, v) for v in g.vertices if v != source]
+        assert sums[i] == pytest.approx(sum(d for d in dists if d != float("inf")))
+        assert counts[i] == len([d for d in dists if d <= radius])
+        assert mins[i] == min(
+            distance(source, v) for v in targets if v != source and v != 50
+        )
+
+    with pytest.raises(ValueError):
+        sp.multi_source(g, sources, reduce="max")
+
+    with pytest.raises(ValueError):
+        sp.multi_source(g, [0, 50])
+
+
+def test_anyhashableg_multi_source():
+    g = build_grid_graph(any_hashable=True)
+    g.add_vertex("x")
+
+    results = dict(sp.multi_source(g, [0, "x"], radius=2.0))
+    assert results[0][4] == 2.0
+    assert results[0][8] == float("inf")
+    assert results["x"]["x"] == 0.0
+    assert results["x"][0] == float("inf")
+
+    counts = sp.multi_source(g, [4, "x"], reduce="count", targets=[0, 2, 6, 8, "x"])
+    assert list(counts) == [4.0, 0.0]
+
+
+def test_anyhashableg_distance_matrix():
+    g = build_grid_graph(any_hashable=True)
+    g.add_vertex("x")
+
+    dist = sp.distance_matrix(g, [0, "x"], [8, 0, "x"])
+    assert dist.tolist() == [[4.0, 0.0, float("inf")], [float("inf"), float("inf"), 0.0]]
+
+    dist, pred = sp.distance_matrix(g, [4], predecessors=True, parallelism=1)
+    assert len(dist.tolist()[0]) == 10
+    assert pred[0][1] == 4
+    assert pred[0][0] in (1, 3)
+    assert 4 not in pred[0]
+    assert "x" not in pred[0]
+
+
+@pytest.mark.parametrize("dtype,typecode", [("float64", "d"), ("float32", "f")])
+def test_allpairs_distances(dtype, typecode, tmpdir):
+    g = build_random_graph(True)
+    g.remove_vertex(50)
+
+    vertices = list(g.vertices)
+    n = len(vertices)
+    expected = sp.distance_matrix(g).tolist()
+
+    tmpfile = tmpdir.join("allpairs.bin")
+    filename = str(tmpfile)
+
+    # fill the matrix in two separate row ranges, as two processes would
+    assert sp.allpairs_distances(g, filename, dtype=dtype, rows=(0, 70)) == vertices
+    sp.allpairs_distances(
+        g, filename, dtype=dtype, rows=(70, n), block_size=7, parallelism=2
+    )
+
+    matrix = array(typecode)
+    with open(filename, "rb") as f:
+        f.seek(32)
+        matrix.frombytes(f.read())
+    assert len(matrix) == n * n
+    for i in range(0, n, 11):
+        for j in range(n):
+            assert matrix[i * n + j] == pytest.approx(expected[i][j], rel=1e-6)
+
+    out = array(typecode, [-1.0]) * (n * n)
+    sp.allpairs_distances(g, out, dtype=dtype, rows=(10, 20), algorithm="delta")
+    assert out[9 * n] == -1.0
+    assert out[20 * n] == -1.0
+    for i in range(10, 20):
+        for j in range(n):
+            assert out[i * n + j] == pytest.approx(expected[i][j], rel=1e-6)
+
+    with pytest.raises(ValueError):
+        sp.allpairs_distances(g, array(typecode, [0.0]), dtype=dtype)
+
+    with pytest.raises(ValueError):
+        sp.allpairs_distances(g, out, dtype=dtype, rows=(0, n + 1))
+
+    # existing files must match the matrix and are left untouched otherwise
+    other = "float32" if dtype == "float64" else "float64"
+    with pytest.raises(ValueError):
+        sp.allpairs_distances(g, filename, dtype=other, rows=(0, 1))
+    g.add_vertex()
+    with pytest.raises(ValueError):
+        sp.allpairs_distances(g, filename, dtype=dtype, rows=(0, 1))
+    assert tmpfile.size() == 32 + n * n * array(typecode).itemsize
+
+    tmpfile.write_binary(b"not a matrix")
+    with pytest.raises(ValueError):
+        sp.allpairs_distances(g, filename, dtype=dtype, rows=(0, 1))
+    assert tmpfile.read_binary() == b"not a matrix"
+
+
+def test_anyhashableg_allpairs_distances():
+    g = build_grid_graph(any_hashable=True)
+    g.add_vertex("x")
+
+    out = array("d", [0.0]) * 100
+    vertices = sp.allpairs_distances(g, out, algorithm="bfs")
+    assert len(vertices) == 10
+
+    matrix = memoryview(out).cast("B").cast("d", (10, 10))
+    i = vertices.index(0)
+    assert matrix[i, vertices.index(8)] == 4.0
+    assert matrix[i, vertices.index("x")] == float("inf")
+    assert matrix[vertices.index("x"), vertices.index("x")] == 0.0
+
+
+def test_query_cache():
+    g = as_listenable(build_grid_graph())
+    cache = sp.query_cache(g, max_entries=2)
+
+    path = cache.dijkstra(0, 8)
+    assert path.weight == 4.0
+    assert cache.dijkstra(0, 8) is path
+    assert cache.a_star(0, 8, coordinates=grid_coordinates).weight == 4.0
+    assert len(cache.bfs(0, 8).edges) == 4
+    assert cache.hits == 1
+    assert cache.misses == 3
+
+    # least recently used is evicted
+    assert len(cache) == 2
+    assert cache.dijkstra(0, 8) is not path
+    assert cache.misses == 4
+
+    # weights only matter for the weighted queries
+    g.set_edge_weight(0, 10.0)
+    assert len(cache) == 1
+    assert cache.dijkstra(0, 2).weight == 4.0
+    assert cache.bfs(0, 8) is not None
+    assert cache.hits == 2
+
+    g.remove_edge(7)
+    assert len(cache) == 0
+    assert cache.dijkstra(0, 8).weight == 6.0
+
+    cache.close()
+    g.remove_edge(8)
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        sp.query_cache(build_grid_graph())
+
+
+def test_query_cache_keys():
+    g = as_listenable(build_grid_graph())
+    cache = sp.query_cache(g)
+
+    path = cache.a_star(0, 8, coordinates=grid_coordinates)
+    heuristic = cache._coordinate_heuristic[2]
+    assert cache.a_star(0, 8, coordinates=grid_coordinates) is path
+    assert cache._coordinate_heuristic[2] is heuristic
+    assert cache.hits == 1
+
+    # the metric, the direction and the heuristic are part of the key
+    cache.a_star(0, 8, coordinates=grid_coordinates, metric="manhattan")
+    assert heuristic.closed
+    cache.a_star(0, 8, coordinates=grid_coordinates, use_bidirectional=True)
+    cache.a_star(0, 8, heuristic_cb=lambda s, t: 0.0)
+    cache.dijkstra(0, 8)
+    cache.dijkstra(0, 8, use_bidirectional=False)
+    assert cache.hits == 1
+    assert cache.misses == 6
+
+    with pytest.raises(ValueError):
+        cache.a_star(0, 8)
+
+    g.remove_edge(7)
+    assert cache._coordinate_heuristic is None
+    cache.a_star(0, 8, coordinates=grid_coordinates)
+    heuristic = cache._coordinate_heuristic[2]
+    cache.close()
+    assert heuristic.closed
+
+
+def test_anyhashableg_query_cache():
+    g = build_grid_graph(any_hashable=True)
+    cache = sp.query_cache(g, max_entries=10, max_total_length=5)
+
+    assert cache.dijkstra(0, 8).weight == 4.0
+    assert cache.dijkstra(6, 2).weight == 4.0
+    assert cache.total_length == 4
+    assert len(cache) == 1
+
+    g.add_vertex("x")
+    assert cache.dijkstra(0, "x") is None
+    assert cache.dijkstra(0, "x") is None
+    assert cache.hits == 1
+    assert len(cache) == 2
+
+    g.add_edge(8, "x")
+    assert len(cache) == 0
+    assert cache.dijkstra(0, "x").weight == 5.0
+
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_dynamic_dijkstra(directed):
+    g = as_listenable(build_random_graph(directed))
+    tree = sp.dynamic_dijkstra(g, 0)
+
+    def check():
+        expected = sp.dijkstra(g, 0).distances()
+        dist = tree.distances()
+        assert len(dist) == len(expected)
+        for d, e in zip(dist, expected):
+            assert d == e or (math.isnan(d) and math.isnan(e))
+        pred = tree.predecessors()
+        for v in g.vertices:
+            assert tree.distance_to(v) == dist[v]
+            path = tree.get_path(v)
+            if path is None:
+                assert math.isinf(dist[v])
+                assert pred[v] == -1
+            else:
+                assert path.weight == dist[v]
+                assert sum(g.get_edge_weight(e) for e in path.edges) == dist[v]
+                assert path.end_vertex == v
+
+    check()
+
+    paths = [tree.get_path(v) for v in range(1, 200, 9)]
+    tree_edges = [p.edges[-1] for p in paths if p is not None]
+    g.set_edge_weight(tree_edges[0], 1000.0)
+    check()
+    g.set_edge_weights(tree_edges[1:4], [500.0, 0.0, 2.0])
+    check()
+    g.remove_edge(tree_edges[4])
+    check()
+    v = g.add_vertex()
+    g.add_edge(0, v, 0.5)
+    g.add_edge(v, 150, 0.5)
+    assert tree.distance_to(150) == 1.0
+    check()
+    g.remove_vertex(60)
+    check()
+
+    with pytest.raises(ValueError):
+        tree.distance_to(60)
+
+    # no longer follows the graph
+    tree.close()
+    before = tree.distance_to(199)
+    g.add_edge(v, 199, 0.0)
+    assert tree.distance_to(199) == before
+    assert sp.dijkstra(g, 0, 199).weight == 0.5
+
+    with pytest.raises(ValueError):
+        sp.dynamic_dijkstra(build_random_graph(directed), 0)
+
+
+def test_anyhashableg_dynamic_dijkstra():
+    g = build_grid_graph(any_hashable=True)
+    tree = sp.dynamic_dijkstra(g, 0)
+
+    assert tree.distance_to(8) == 4.0
+    assert tree.predecessors()[8] == 5
+
+    g.remove_edge(tree.get_path(8).edges[-1])
+    assert tree.distance_to(8) == float("inf")
+    assert tree.get_path(8) is None
+    assert 8 not in tree.predecessors()
+
+    g.add_vertex("x")
+    g.add_edge(7, "x", 1.0)
+    e = g.add_edge("x", 8, 1.0)
+    assert tree.distance_to(8) == 5.0
+    assert tree.get_path(8).edges[-1] == e
+    assert tree.distances()["x"] == 4.0
+
+    g.set_edge_weight(tree.get_path(1).edges[0], 0.5)
+    assert tree.distance_to(2) == 1.5
+
 def test_yen_k():
 
     g = get_graph()
@@ -0,0 +1,111 @@
+import pytest
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from jgrapht import create_graph
+from jgrapht.generators import gnp_random_graph
+import jgrapht.algorithms.scoring as scoring
+import jgrapht.algorithms.shortestpaths as sp
+
+
+def build_graph():
+    g = create_graph(
+        directed=False,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=True,
+    )
+    gnp_random_graph(g, 300, 0.05, seed=17)
+    return g
+
+
+def test_concurrent_algorithms():
+    g = build_graph()
+
+    expected = scoring.betweenness_centrality(g)
+
+    results = []
+    errors = []
+
+    def worker():
+        try:
+            results.append(scoring.betweenness_centrality(g))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+
+    # the main thread keeps using the backend while the workers run
+    for v in range(0, 300):
+        assert g.degree_of(v) == len(list(g.edges_of(v)))
+
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(results) == 4
+    for r in results:
+        assert dict(r) == dict(expected)
+
+
+def test_concurrent_callbacks():
+    g = build_graph()
+
+    heuristic_calls = []
+
+    def heuristic(source, target):
+        heuristic_calls.append(source)
+        # call back into the backend from within a callback
+        g.degree_of(source)
+        return 0.0
+
+    def worker():
+        sp.a_star(g, 0, 299, heuristic_cb=heuristic)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    for v in range(0, 300):
+        g.contains_vertex(v)
+    t.join()
+
+    assert len(heuristic_calls) > 0
+
+
+def test_parallel_queries_on_shared_graph():
+    g = build_graph()
+
+    expected = {v: sp.dijkstra(g, v).get_path(299) for v in range(0, 16)}
+
+    def query(v):
+        path = sp.dijkstra(g, v).get_path(299)
+        return v, path, g.degree_of(v)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(query, range(0, 16)))
+
+    assert len(results) == 16
+    for v, path, degree in results:
+        exp = expected[v]
+        if exp is None:
+            assert path is None
+        else:
+            assert path.weight == exp.weight
+            assert path.vertices == exp.vertices
+        assert degree == g.degree_of(v)
+
+
+def test_handles_released_from_other_threads():
+    def create():
+        return build_graph()
+
+    # graphs created in worker threads, which have exited, can still be used
+    # and destroyed from the main thread
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        graphs = list(executor.map(lambda _: create(), range(0, 4)))
+
+    for g in graphs:
+        assert len(g.vertices) == 300
+    del graphs
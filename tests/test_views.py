@@ -1,5 +1,7 @@
 import pytest
 
+from array import array
+
 from jgrapht import create_graph
 from jgrapht.utils import create_vertex_supplier, create_edge_supplier
 
@@ -203,6 +205,110 @@ def test_as_masked_subgraph():
         masked_graph.add_vertex(6)
 
 
+def test_as_masked_subgraph_with_masks():
+    g = create_graph(
+        directed=False,
+        allowing_self_loops=True,
+        allowing_multiple_edges=False,
+        weighted=True,
+    )
+
+    g.add_vertices_from(range(0, 5))
+
+    g.add_edge(0, 1)
+    g.add_edge(0, 2)
+    g.add_edge(0, 3)
+    g.add_edge(2, 3)
+    g.add_edge(1, 3)
+    g.add_edge(2, 4)
+
+    masked_graph = as_masked_subgraph(
+        g,
+        vertex_mask=[False, False, False, True, False],
+        edge_mask={5},
+    )
+
+    assert masked_graph.vertices == {0, 1, 2, 4}
+    assert masked_graph.edges == {0, 1}
+    assert not masked_graph.contains_vertex(3)
+    assert not masked_graph.type.modifiable
+
+    # update the masks in place
+    masked_graph.set_vertex_mask(array("B", [0, 0, 0, 0, 1]))
+    assert masked_graph.vertices == {0, 1, 2, 3}
+    assert masked_graph.edges == {0, 1, 2, 3, 4}
+
+    masked_graph.mask_edges([0, 1])
+    assert masked_graph.edges == {2, 3, 4}
+    masked_graph.mask_edges([0], masked=False)
+    assert masked_graph.edges == {0, 2, 3, 4}
+
+    masked_graph.set_edge_mask(set())
+    masked_graph.mask_vertices([0])
+    assert masked_graph.vertices == {1, 2, 3}
+    assert masked_graph.edges == {3, 4}
+
+    # vertices added later are not masked
+    g.add_vertex(5)
+    assert 5 in masked_graph.vertices
+
+    # nothing masked, without allocating a mask
+    unmasked = as_masked_subgraph(g)
+    assert unmasked.vertices == g.vertices
+    assert unmasked.edges == g.edges
+    with pytest.raises(ValueError):
+        unmasked.mask_vertices([0])
+
+    # only the vertices masked, the edges can still be updated
+    vertex_masked = as_masked_subgraph(g, vertex_mask={3}, edge_mask=set())
+    assert vertex_masked.vertices == {0, 1, 2, 4, 5}
+    vertex_masked.mask_edges([0])
+    assert vertex_masked.edges == {1, 5}
+
+    # callbacks cannot be updated
+    def vertex_mask(v):
+        return v == 3
+
+    cb_masked = as_masked_subgraph(g, vertex_mask_cb=vertex_mask, edge_mask={0})
+    assert cb_masked.edges == {1, 5}
+    with pytest.raises(ValueError):
+        cb_masked.mask_vertices([0])
+
+    with pytest.raises(ValueError):
+        as_masked_subgraph(g, vertex_mask_cb=vertex_mask, vertex_mask={3})
+
+
+def test_anyhashableg_as_masked_subgraph_with_masks():
+    g = create_graph(
+        directed=False,
+        allowing_self_loops=True,
+        allowing_multiple_edges=False,
+        weighted=True,
+        any_hashable=True,
+    )
+
+    g.add_vertices_from(["v0", "v1", "v2", "v3"])
+    g.add_edge("v0", "v1", edge="e1")
+    g.add_edge("v1", "v2", edge="e2")
+    g.add_edge("v2", "v3", edge="e3")
+
+    masked_graph = as_masked_subgraph(g, vertex_mask={"v3"}, edge_mask={"e1"})
+
+    assert masked_graph.vertices == {"v0", "v1", "v2"}
+    assert masked_graph.edges == {"e2"}
+    assert not masked_graph.contains_vertex("v3")
+    assert not masked_graph.contains_edge("e1")
+    assert masked_graph.contains_edge("e2")
+
+    masked_graph.set_vertex_mask(["v0"])
+    masked_graph.mask_edges(["e1"], masked=False)
+    assert masked_graph.vertices == {"v1", "v2", "v3"}
+    assert masked_graph.edges == {"e2", "e3"}
+
+    with pytest.raises(ValueError):
+        masked_graph.mask_vertices(["missing"])
+
+
 def test_anyhashableg_as_masked_subgraph():
     g = create_graph(
         directed=False,
@@ -444,6 +550,67 @@ def test_as_weighted_with_caching_and_write_throught():
     assert g.get_edge_weight(0) == 5.0
 
 
+def test_as_weighted_with_weights_array():
+    g = create_graph(
+        directed=True,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=False,
+    )
+
+    g.add_vertices_from(range(0, 4))
+    g.add_edge(0, 1)
+    g.add_edge(1, 2)
+    g.add_edge(2, 3)
+    g.add_edge(0, 3)
+
+    def edge_weight(e):
+        raise AssertionError("callback should not be called")
+
+    wg = as_weighted(g, edge_weight, weights=array("d", [1.0, 2.0, 3.0, 10.0]))
+
+    assert wg.type.weighted
+    assert list(wg.get_edge_weights([0, 1, 2, 3])) == [1.0, 2.0, 3.0, 10.0]
+    assert g.get_edge_weight(3) == 1.0
+
+    import jgrapht.algorithms.shortestpaths as sp
+
+    path = sp.dijkstra(wg, 0, 3, use_bidirectional=False)
+    assert path.weight == 6.0
+    assert path.edges == [0, 1, 2]
+
+    # cached weights can still be adjusted
+    wg.set_edge_weight(3, 4.0)
+    assert sp.dijkstra(wg, 0, 3, use_bidirectional=False).edges == [3]
+
+    with pytest.raises(ValueError):
+        as_weighted(g, None, weights=[1.0])
+
+    with pytest.raises(ValueError):
+        as_weighted(g, None, cache_weights=False, weights=[1.0, 2.0, 3.0, 4.0])
+
+    with pytest.raises(ValueError):
+        as_weighted(g, None, write_weights_through=True, weights=[1.0, 2.0, 3.0, 4.0])
+
+
+def test_as_weighted_with_weights_mapping():
+    g = create_graph(
+        directed=True,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=True,
+    )
+
+    g.add_vertices_from(range(0, 3))
+    g.add_edge(0, 1)
+    g.add_edge(1, 2)
+
+    wg = as_weighted(g, lambda e: 7.0, weights={1: 3.5})
+
+    assert wg.get_edge_weight(1) == 3.5
+    assert wg.get_edge_weight(0) == 7.0
+
+
 def test_as_weighted_with_no_caching_and_write_through():
     g = create_graph(
         directed=False,
@@ -528,6 +695,63 @@ def test_listenable():
     assert listener2_results == listener2_expected.splitlines()
 
 
+def test_listenable_bulk_weights():
+
+    g = create_graph(
+        directed=True,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=True,
+    )
+    g.add_vertices_from(range(0, 4))
+    g.add_edges_from([(0, 1), (1, 2), (2, 3)])
+
+    lg = as_listenable(g)
+
+    events = []
+
+    def listener(element, event):
+        events.append((list(element), event))
+
+    lg.add_listener(listener)
+
+    lg.set_edge_weights([0, 2], [2.5, 3.5])
+
+    assert list(lg.get_edge_weights()) == [2.5, 1.0, 3.5]
+    assert list(g.get_edge_weights([2, 0])) == [3.5, 2.5]
+    assert events == [([0, 2], GraphEvent.EDGE_WEIGHTS_UPDATED)]
+
+    # listeners are not notified when the update fails
+    with pytest.raises(ValueError):
+        lg.set_edge_weights([0, 1], [1.0])
+    assert events == [([0, 2], GraphEvent.EDGE_WEIGHTS_UPDATED)]
+
+
+def test_listenable_add_edges_from_partial_weights():
+    g = create_graph(
+        directed=True,
+        allowing_self_loops=False,
+        allowing_multiple_edges=False,
+        weighted=True,
+    )
+    g.add_vertices_from(range(0, 4))
+
+    lg = as_listenable(g)
+
+    events = []
+
+    def listener(element, event):
+        events.append((element, event))
+
+    lg.add_listener(listener)
+
+    # only the edges with a weight set it
+    assert lg.add_edges_from([(0, 1), (1, 2, 2.5), (2, 3)]) == [0, 1, 2]
+    assert list(lg.get_edge_weights()) == [1.0, 2.5, 1.0]
+    assert [e for e, ev in events if ev == GraphEvent.EDGE_WEIGHT_UPDATED] == [1]
+    assert [e for e, ev in events if ev == GraphEvent.EDGE_ADDED] == [0, 1, 2]
+
+
 def test_union():
 
     g1 = create_graph(